@@ -34,11 +34,19 @@ def chat():
         if not message:
             return jsonify({"error": "Message is required"}), 400
         
+        # Optional {"lat": .., "lon": ..} lets weather questions use the nearest city
+        location = None
+        if isinstance(data.get('location'), dict):
+            try:
+                location = (float(data['location']['lat']), float(data['location']['lon']))
+            except (KeyError, TypeError, ValueError):
+                return jsonify({"error": "location needs numeric lat and lon"}), 400
+        
         # Process message with AI bot if available, otherwise use rule-based bot
         if use_ai and AI_BOT_AVAILABLE:
             response = ai_climate_bot.process_message(message, user_id, use_ai=True)
         else:
-            response = climate_bot.process_message(message, user_id)
+            response = climate_bot.process_message(message, user_id, location=location)
         
         return jsonify({
             "status": "success",
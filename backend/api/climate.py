@@ -1,24 +1,48 @@
 """
 Climate data API routes (FastAPI version)
 """
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.responses import StreamingResponse
 from typing import Optional
+from functools import lru_cache
+import asyncio
+import json
 import structlog
 from datetime import datetime, timedelta
 
 from services.data_integrator import ClimateDataIntegrator
+from services.climate_alerts import climate_alert_engine
+from services.live_weather import LiveWeatherHub
 from api.auth import get_current_active_user
 from database.models import User
+from core.config import settings
 
 logger = structlog.get_logger()
 router = APIRouter()
 data_integrator = ClimateDataIntegrator()
+live_weather_hub = LiveWeatherHub(data_integrator, refresh_interval=settings.LIVE_WEATHER_REFRESH_SECONDS)
+
+# Idle SSE connections get a comment line this often so proxies keep them open
+SSE_HEARTBEAT_SECONDS = 15
+
+@lru_cache(maxsize=None)
+def _indian_weather():
+    """The Indian weather service module, imported on first use so the gateway starts
+    without pandas; None when its data stack is not installed"""
+    try:
+        from services import indian_weather_service
+    except ImportError as e:
+        logger.warning("Indian weather data unavailable", error=str(e))
+        return None
+    return indian_weather_service
 
 @router.get("/data")
 async def get_climate_data(
     lat: float = Query(..., ge=-90, le=90, description="Latitude"),
     lon: float = Query(..., ge=-180, le=180, description="Longitude"),
     days: int = Query(7, ge=1, le=30, description="Number of days of historical data"),
+    nearby_stations: int = Query(3, ge=0, le=10, description="Nearest Indian dataset cities to attach (0 = none)"),
+    interpolate: bool = Query(False, description="Inverse-distance estimates from the nearby stations"),
     current_user: Optional[User] = Depends(get_current_active_user)
 ):
     """Get comprehensive climate data for a location"""
@@ -40,6 +64,18 @@ async def get_climate_data(
         # Process and combine data
         processed_data = data_integrator.process_and_normalize_data(nasa_data)
         
+        # Historical context from the nearest Indian dataset cities (never waits for the dataset to load)
+        station_context = None
+        indian_weather = _indian_weather() if nearby_stations else None
+        if indian_weather is not None:
+            service = indian_weather.indian_weather_service
+            if service.is_ready:
+                station_context = service.get_location_context(
+                    lat, lon, k=nearby_stations, interpolate=interpolate
+                )
+            else:
+                service.start_background_initialize()
+        
         logger.info("Climate data fetched successfully", 
                    lat=lat, lon=lon, days=days,
                    user_id=current_user.id if current_user else None)
@@ -53,7 +89,8 @@ async def get_climate_data(
                 "historical_climate": nasa_data,
                 "air_quality": air_quality,
                 "weather_forecast": weather_forecast,
-                "processed_summary": processed_data.to_dict() if not processed_data.empty else {}
+                "processed_summary": processed_data.to_dict() if not processed_data.empty else {},
+                "indian_station_context": station_context
             },
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -150,6 +187,51 @@ async def get_current_weather(
             detail=f"Failed to fetch current weather: {str(e)}"
         )
 
+@router.get("/stream")
+async def stream_live_conditions(
+    request: Request,
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude"),
+    current_user: Optional[User] = Depends(get_current_active_user)
+):
+    """Server-sent events stream of live weather and air quality for the grid cell around a location.
+
+    The first event is a full `snapshot`; later `update` events carry only the fields that changed.
+    All viewers of a cell share one upstream refresh per interval.
+    """
+    cell, queue = await live_weather_hub.subscribe(lat, lon)
+    
+    logger.info("Live conditions stream opened", 
+               lat=lat, lon=lon, cell=cell,
+               user_id=current_user.id if current_user else None)
+    
+    async def event_stream():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            live_weather_hub.unsubscribe(cell, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/stream/stats")
+async def get_stream_stats(current_user: Optional[User] = Depends(get_current_active_user)):
+    """Active live-weather cells, subscriber counts and upstream fetches"""
+    return {
+        "status": "success",
+        "stream": live_weather_hub.get_stats(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
 @router.get("/bengaluru")
 async def get_bengaluru_weather(current_user: Optional[User] = Depends(get_current_active_user)):
     """Get current weather for Bengaluru (Bangalore), India"""
@@ -311,31 +393,16 @@ async def get_climate_alerts(
         air_quality = await data_integrator.get_air_quality_data(lat, lon)
         weather_forecast = await data_integrator.get_weather_forecast(lat, lon)
         
-        alerts = []
-        
-        # Air quality alerts
-        if air_quality and 'aqi' in air_quality:
-            aqi = air_quality['aqi']
-            if aqi > 150:
-                alerts.append({
-                    "type": "air_quality",
-                    "severity": "high" if aqi > 200 else "moderate",
-                    "title": "Poor Air Quality Alert",
-                    "message": f"AQI is {aqi}. Consider limiting outdoor activities.",
-                    "timestamp": datetime.utcnow().isoformat()
-                })
+        alerts = climate_alert_engine.get_alerts(lat, lon, weather_forecast, air_quality)
         
-        # Weather alerts (simplified example)
-        if weather_forecast and 'current' in weather_forecast:
-            temp = weather_forecast['current'].get('temp', 0)
-            if temp > 35:  # 35°C = ~95°F
-                alerts.append({
-                    "type": "extreme_heat",
-                    "severity": "high",
-                    "title": "Extreme Heat Warning",
-                    "message": f"Temperature is {temp}°C. Stay hydrated and avoid prolonged sun exposure.",
-                    "timestamp": datetime.utcnow().isoformat()
-                })
+        # Recent anomalies at the nearest Indian dataset city, read from the precomputed table
+        indian_weather = _indian_weather()
+        if indian_weather is not None and indian_weather.indian_weather_service.is_ready:
+            service = indian_weather.indian_weather_service
+            station = service.station_index.nearest(lat, lon, k=1, max_km=indian_weather.STATION_MAX_KM)
+            if station:
+                anomalies = service.get_recent_anomalies(station[0]["name"])
+                alerts = alerts + climate_alert_engine.anomaly_alerts(anomalies)
         
         return {
             "status": "success",
@@ -9,6 +9,8 @@ from pathlib import Path
 from datetime import datetime
 import uuid
 
+from services.product_catalogue import ProductCatalogue
+
 router = APIRouter()
 
 # Load products from JSON file
@@ -27,6 +29,8 @@ def load_products_from_json():
 
 # Initialize products
 PRODUCTS = load_products_from_json()
+# Search indexes over PRODUCTS, built once at load time
+CATALOGUE = ProductCatalogue(PRODUCTS)
 CARTS = {}
 
 @router.get("/products")
@@ -40,74 +44,32 @@ async def get_products(
     inStock: Optional[bool] = None,
     sortBy: Optional[str] = "relevance",
     page: int = 1,
-    limit: int = 12
+    limit: int = 12,
+    facets: bool = True
 ):
     """Get products with search and filters"""
     try:
-        filtered_products = PRODUCTS.copy()
-        
-        # Filter by category
-        if category:
-            filtered_products = [p for p in filtered_products if p.get("category") == category]
-        
-        # Filter by price range
-        if minPrice is not None or maxPrice is not None:
-            min_p = minPrice or 0
-            max_p = maxPrice or float('inf')
-            filtered_products = [p for p in filtered_products if min_p <= p.get("price", 0) <= max_p]
-        
-        # Filter by eco features
-        if ecoFeatures:
-            features = ecoFeatures.split(',')
-            filtered_products = [
-                p for p in filtered_products 
-                if any(ef.get("type") in features for ef in p.get("ecoFeatures", []))
-            ]
-        
-        # Filter by rating
-        if minRating:
-            filtered_products = [p for p in filtered_products if p.get("rating", 0) >= minRating]
-        
-        # Filter by stock
-        if inStock:
-            filtered_products = [p for p in filtered_products if p.get("inStock", False)]
-        
-        # Search by query
-        if q:
-            query_lower = q.lower()
-            filtered_products = [
-                p for p in filtered_products
-                if query_lower in p.get("name", "").lower() or 
-                   query_lower in p.get("description", "").lower() or
-                   query_lower in p.get("brand", "").lower() or
-                   any(query_lower in tag for tag in p.get("tags", []))
-            ]
-        
-        # Sort products
-        if sortBy == "price-low":
-            filtered_products.sort(key=lambda x: x.get("price", 0))
-        elif sortBy == "price-high":
-            filtered_products.sort(key=lambda x: x.get("price", 0), reverse=True)
-        elif sortBy == "rating":
-            filtered_products.sort(key=lambda x: x.get("rating", 0), reverse=True)
-        elif sortBy == "eco-score":
-            filtered_products.sort(key=lambda x: x.get("ecoScore", 0), reverse=True)
-        
-        # Pagination
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paginated_products = filtered_products[start_idx:end_idx]
+        # q matches products where every word is a prefix of a word in the
+        # name, brand, tags or description; "relevance" ranks them by BM25.
+        # facets counts categories, eco features, price ranges and ratings
+        # for the same filters, each ignoring its own selection
+        result = CATALOGUE.search(
+            query=q or "",
+            category=category,
+            min_price=minPrice or None,
+            max_price=maxPrice or None,
+            eco_features=ecoFeatures.split(',') if ecoFeatures else None,
+            min_rating=minRating,
+            in_stock=bool(inStock),
+            sort_by=sortBy,
+            page=page,
+            limit=limit,
+            facets=facets
+        )
         
         return {
             "success": True,
-            "data": {
-                "products": paginated_products,
-                "totalCount": len(filtered_products),
-                "page": page,
-                "limit": limit,
-                "hasNext": end_idx < len(filtered_products),
-                "hasPrev": page > 1
-            }
+            "data": result
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -115,7 +77,7 @@ async def get_products(
 @router.get("/products/{product_id}")
 async def get_product(product_id: str):
     """Get single product details"""
-    product = next((p for p in PRODUCTS if p.get("id") == product_id), None)
+    product = CATALOGUE.get(product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     
@@ -127,27 +89,9 @@ async def get_product(product_id: str):
 @router.get("/categories")
 async def get_categories():
     """Get product categories with counts"""
-    categories = {}
-    for product in PRODUCTS:
-        category = product.get('category')
-        if category and category not in categories:
-            categories[category] = {
-                'name': category,
-                'count': 0,
-                'subcategories': set()
-            }
-        if category:
-            categories[category]['count'] += 1
-            if product.get('subCategory'):
-                categories[category]['subcategories'].add(product['subCategory'])
-    
-    # Convert sets to lists
-    for category in categories.values():
-        category['subcategories'] = list(category['subcategories'])
-    
     return {
         "success": True,
-        "data": list(categories.values())
+        "data": CATALOGUE.category_summary()
     }
 
 @router.get("/recommendations")
@@ -204,7 +148,7 @@ async def add_to_cart(
     if not product_id:
         raise HTTPException(status_code=400, detail="Product ID is required")
     
-    product = next((p for p in PRODUCTS if p.get("id") == product_id), None)
+    product = CATALOGUE.get(product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     
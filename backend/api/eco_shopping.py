@@ -10,6 +10,8 @@ import numpy as np
 import os
 from pathlib import Path
 
+from services.product_catalogue import ProductCatalogue
+
 eco_shopping_bp = Blueprint('eco_shopping', __name__)
 
 # Load products from JSON file
@@ -415,6 +417,7 @@ class EcoShoppingService:
         # Use JSON products if available, otherwise fallback to sample
         self.products = json_products if json_products else SAMPLE_PRODUCTS.copy()
         print(f"[EcoMarket] Loaded {len(self.products)} products from database")
+        self.catalogue = ProductCatalogue(self.products)
         self.eco_facts = SAMPLE_ECO_FACTS.copy()
         self.eco_tips = SAMPLE_ECO_TIPS.copy()
         self.challenges = SAMPLE_CHALLENGES.copy()
@@ -422,72 +425,29 @@ class EcoShoppingService:
         self.orders = {}
         self.wishlists = {}
 
-    def search_products(self, query="", category=None, filters=None, sort_by="relevance", page=1, limit=12):
-        """Search and filter products"""
-        filtered_products = self.products.copy()
+    def search_products(self, query="", category=None, filters=None, sort_by="relevance", page=1, limit=12,
+                        facets=False):
+        """Search and filter products, optionally with facet counts for the same filters"""
+        filters = filters or {}
+        price_range = filters.get("priceRange") or {}
         
-        # Filter by category
-        if category:
-            filtered_products = [p for p in filtered_products if p["category"] == category]
-        
-        # Apply filters
-        if filters:
-            if filters.get("priceRange"):
-                min_price = filters["priceRange"].get("min", 0)
-                max_price = filters["priceRange"].get("max", float('inf'))
-                filtered_products = [p for p in filtered_products if min_price <= p["price"] <= max_price]
-            
-            if filters.get("ecoFeatures"):
-                eco_features = filters["ecoFeatures"]
-                filtered_products = [
-                    p for p in filtered_products 
-                    if any(ef["type"] in eco_features for ef in p["ecoFeatures"])
-                ]
-            
-            if filters.get("rating"):
-                min_rating = filters["rating"]
-                filtered_products = [p for p in filtered_products if p["rating"] >= min_rating]
-            
-            if filters.get("inStock"):
-                filtered_products = [p for p in filtered_products if p["inStock"]]
-        
-        # Search by query
-        if query:
-            query_lower = query.lower()
-            filtered_products = [
-                p for p in filtered_products
-                if query_lower in p["name"].lower() or 
-                   query_lower in p["description"].lower() or
-                   any(query_lower in tag for tag in p["tags"])
-            ]
-        
-        # Sort products
-        if sort_by == "price-low":
-            filtered_products.sort(key=lambda x: x["price"])
-        elif sort_by == "price-high":
-            filtered_products.sort(key=lambda x: x["price"], reverse=True)
-        elif sort_by == "rating":
-            filtered_products.sort(key=lambda x: x["rating"], reverse=True)
-        elif sort_by == "eco-score":
-            filtered_products.sort(key=lambda x: x["ecoScore"], reverse=True)
-        
-        # Pagination
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paginated_products = filtered_products[start_idx:end_idx]
-        
-        return {
-            "products": paginated_products,
-            "totalCount": len(filtered_products),
-            "page": page,
-            "limit": limit,
-            "hasNext": end_idx < len(filtered_products),
-            "hasPrev": page > 1
-        }
+        return self.catalogue.search(
+            query=query,
+            category=category,
+            min_price=price_range.get("min"),
+            max_price=price_range.get("max"),
+            eco_features=filters.get("ecoFeatures"),
+            min_rating=filters.get("rating"),
+            in_stock=bool(filters.get("inStock")),
+            sort_by=sort_by,
+            page=page,
+            limit=limit,
+            facets=facets
+        )
     
     def get_product_by_id(self, product_id):
         """Get product details by ID"""
-        return next((p for p in self.products if p["id"] == product_id), None)
+        return self.catalogue.get(product_id)
     
     def add_to_cart(self, user_id, product_id, quantity=1):
         """Add product to cart"""
@@ -554,6 +514,7 @@ def get_products():
         page = int(request.args.get('page', 1))
         limit = int(request.args.get('limit', 12))
         sort_by = request.args.get('sortBy', 'relevance')
+        facets = request.args.get('facets', 'true').lower() != 'false'
         
         # Parse filters
         filters = {}
@@ -578,7 +539,8 @@ def get_products():
             filters=filters,
             sort_by=sort_by,
             page=page,
-            limit=limit
+            limit=limit,
+            facets=facets
         )
         
         return jsonify({
@@ -618,26 +580,9 @@ def get_product(product_id):
 def get_categories():
     """Get product categories with counts"""
     try:
-        categories = {}
-        for product in eco_service.products:
-            category = product['category']
-            if category not in categories:
-                categories[category] = {
-                    'name': category,
-                    'count': 0,
-                    'subcategories': set()
-                }
-            categories[category]['count'] += 1
-            if product.get('subCategory'):
-                categories[category]['subcategories'].add(product['subCategory'])
-        
-        # Convert sets to lists
-        for category in categories.values():
-            category['subcategories'] = list(category['subcategories'])
-        
         return jsonify({
             'success': True,
-            'data': list(categories.values())
+            'data': eco_service.catalogue.category_summary()
         })
         
     except Exception as e:
@@ -1,6 +1,11 @@
 from flask import Blueprint, request, jsonify
+import pandas as pd
+from core.config import settings
 from services.indian_weather_service import indian_weather_service
+from services.weather_anomalies import ANOMALY_TYPES, SEVERITIES
+from services.weather_query import weather_query_engine
 from datetime import datetime
+from functools import wraps
 import traceback
 import logging
 
@@ -8,16 +13,40 @@ logger = logging.getLogger(__name__)
 
 indian_climate_bp = Blueprint('indian_climate', __name__)
 
+# Seconds clients are asked to wait while the dataset is still loading
+RETRY_AFTER_SECONDS = 5
+
+# Most anomalies returned by one /india/anomalies request
+MAX_ANOMALIES = 1000
+
+@indian_climate_bp.record_once
+def start_weather_initialization(state):
+    """Load the dataset in the background as soon as the blueprint is registered"""
+    indian_weather_service.start_background_initialize()
+
+def requires_weather_data(view):
+    """Answer 503 with Retry-After until the background load has finished"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not indian_weather_service.is_ready:
+            # Restarts the loader if a previous attempt failed; no-op while one runs
+            indian_weather_service.start_background_initialize()
+            response = jsonify({
+                "error": "Indian weather data is still loading",
+                "initialization": indian_weather_service.get_init_status(),
+                "retry_after": RETRY_AFTER_SECONDS
+            })
+            response.status_code = 503
+            response.headers['Retry-After'] = str(RETRY_AFTER_SECONDS)
+            return response
+        return view(*args, **kwargs)
+    return wrapper
+
 @indian_climate_bp.route('/india/overview', methods=['GET'])
+@requires_weather_data
 def get_india_overview():
     """Get overview of Indian climate data"""
     try:
-        # Initialize service if not already done
-        if not indian_weather_service.processed_data:
-            success = indian_weather_service.initialize()
-            if not success:
-                return jsonify({"error": "Failed to initialize weather service"}), 500
-        
         weather_data = indian_weather_service.get_weather_data()
         
         return jsonify({
@@ -33,15 +62,10 @@ def get_india_overview():
         return jsonify({"error": f"Failed to fetch India overview: {str(e)}"}), 500
 
 @indian_climate_bp.route('/india/cities', methods=['GET'])
+@requires_weather_data
 def get_indian_cities():
     """Get climate data for all Indian cities"""
     try:
-        # Initialize service if not already done
-        if not indian_weather_service.processed_data:
-            success = indian_weather_service.initialize()
-            if not success:
-                return jsonify({"error": "Failed to initialize weather service"}), 500
-        
         weather_data = indian_weather_service.get_weather_data()
         cities_data = weather_data.get('cities_overview', [])
         
@@ -57,15 +81,10 @@ def get_indian_cities():
         return jsonify({"error": f"Failed to fetch Indian cities data: {str(e)}"}), 500
 
 @indian_climate_bp.route('/india/city/<city_name>', methods=['GET'])
+@requires_weather_data
 def get_city_climate(city_name):
     """Get detailed climate data for a specific Indian city"""
     try:
-        # Initialize service if not already done
-        if not indian_weather_service.processed_data:
-            success = indian_weather_service.initialize()
-            if not success:
-                return jsonify({"error": "Failed to initialize weather service"}), 500
-        
         city_data = indian_weather_service.get_city_weather(city_name)
         
         if not city_data:
@@ -82,15 +101,10 @@ def get_city_climate(city_name):
         return jsonify({"error": f"Failed to fetch city climate data: {str(e)}"}), 500
 
 @indian_climate_bp.route('/india/regions', methods=['GET'])
+@requires_weather_data
 def get_regional_data():
     """Get climate data aggregated by Indian states/regions"""
     try:
-        # Initialize service if not already done
-        if not indian_weather_service.processed_data:
-            success = indian_weather_service.initialize()
-            if not success:
-                return jsonify({"error": "Failed to initialize weather service"}), 500
-        
         weather_data = indian_weather_service.get_weather_data()
         regional_data = weather_data.get('regional_summary', {})
         
@@ -105,15 +119,10 @@ def get_regional_data():
         return jsonify({"error": f"Failed to fetch regional data: {str(e)}"}), 500
 
 @indian_climate_bp.route('/india/trends', methods=['GET'])
+@requires_weather_data
 def get_monthly_trends():
     """Get monthly climate trends for India"""
     try:
-        # Initialize service if not already done
-        if not indian_weather_service.processed_data:
-            success = indian_weather_service.initialize()
-            if not success:
-                return jsonify({"error": "Failed to initialize weather service"}), 500
-        
         weather_data = indian_weather_service.get_weather_data()
         trends_data = weather_data.get('monthly_trends', {})
         
@@ -128,15 +137,10 @@ def get_monthly_trends():
         return jsonify({"error": f"Failed to fetch trends data: {str(e)}"}), 500
 
 @indian_climate_bp.route('/india/current', methods=['GET'])
+@requires_weather_data
 def get_current_conditions():
     """Get current weather conditions summary for India"""
     try:
-        # Initialize service if not already done
-        if not indian_weather_service.processed_data:
-            success = indian_weather_service.initialize()
-            if not success:
-                return jsonify({"error": "Failed to initialize weather service"}), 500
-        
         weather_data = indian_weather_service.get_weather_data()
         current_data = weather_data.get('current_conditions', {})
         
@@ -150,6 +154,117 @@ def get_current_conditions():
         logger.error(f"Error in get_current_conditions: {e}")
         return jsonify({"error": f"Failed to fetch current conditions: {str(e)}"}), 500
 
+@indian_climate_bp.route('/india/query', methods=['GET', 'POST'])
+@requires_weather_data
+def query_weather():
+    """Resampled metrics for a set of cities/states over a date range.
+
+    Accepts a JSON body (POST) or query parameters (GET): cities, states,
+    start, end, metrics, granularity (day|week|month|season), aggregation
+    (mean|min|max|sum) and group_by (city|state|none).
+    """
+    try:
+        if request.method == 'POST':
+            spec = request.get_json(silent=True) or {}
+        else:
+            spec = request.args.to_dict()
+        
+        result = weather_query_engine.query(spec)
+        
+        return jsonify({
+            "status": "success",
+            **result,
+            "timestamp": datetime.now().isoformat()
+        })
+    
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in query_weather: {e}")
+        return jsonify({"error": f"Failed to run weather query: {str(e)}"}), 500
+
+@indian_climate_bp.route('/india/anomalies', methods=['GET'])
+@requires_weather_data
+def get_weather_anomalies():
+    """Heatwaves, temperature extremes and rainfall deficits against each city's seasonal baseline.
+
+    Query parameters: city, type (comma-separated), start, end, severity
+    (high), limit, and recent=<days> for anomalies near each city's latest reading.
+    """
+    try:
+        city = request.args.get('city')
+        types = [t.strip() for t in request.args.get('type', '').split(',') if t.strip()]
+        unknown = sorted(set(types) - set(ANOMALY_TYPES))
+        if unknown:
+            return jsonify({"error": f"Unknown anomaly types {unknown}; choose from {ANOMALY_TYPES}"}), 400
+        severity = request.args.get('severity')
+        if severity is not None and severity not in SEVERITIES:
+            return jsonify({"error": f"severity must be one of {SEVERITIES}"}), 400
+        filters = {
+            "types": types or None,
+            "severity": severity,
+            "limit": min(request.args.get('limit', 100, type=int), MAX_ANOMALIES)
+        }
+        recent = request.args.get('recent', type=int)
+
+        if recent is not None:
+            if not city:
+                return jsonify({"error": "recent requires a city"}), 400
+            anomalies = indian_weather_service.get_recent_anomalies(city, days=recent, **filters)
+        else:
+            anomalies = indian_weather_service.get_anomalies(
+                city, start=request.args.get('start'), end=request.args.get('end'), **filters
+            )
+
+        table = indian_weather_service.anomalies
+        return jsonify({
+            "status": "success",
+            "anomalies": anomalies,
+            "count": len(anomalies),
+            "totals": table.counts() if table is not None else {},
+            "timestamp": datetime.now().isoformat()
+        })
+
+    except ValueError as e:
+        return jsonify({"error": f"Invalid anomaly query: {str(e)}"}), 400
+    except Exception as e:
+        logger.error(f"Error in get_weather_anomalies: {e}")
+        return jsonify({"error": f"Failed to fetch weather anomalies: {str(e)}"}), 500
+
+@indian_climate_bp.route('/india/observations', methods=['POST'])
+@requires_weather_data
+def append_observations():
+    """Append new readings (a JSON list of rows with Date and City) to the loaded dataset"""
+    try:
+        token = settings.WEATHER_INGEST_TOKEN
+        if not token or request.headers.get('X-Ingest-Token') != token:
+            return jsonify({"error": "Not authorized to add observations"}), 403
+        
+        rows = request.get_json(silent=True)
+        if isinstance(rows, dict):
+            rows = rows.get('observations')
+        if not isinstance(rows, list) or not rows:
+            return jsonify({"error": "Expected a non-empty list of observations"}), 400
+        
+        observations = pd.DataFrame(rows)
+        missing = {'Date', 'City'} - set(observations.columns)
+        if missing:
+            return jsonify({"error": f"Observations are missing fields: {sorted(missing)}"}), 400
+        
+        added = indian_weather_service.append_observations(observations)
+        
+        return jsonify({
+            "status": "success",
+            "added": added,
+            "timestamp": datetime.now().isoformat()
+        })
+    
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": f"Invalid observations: {str(e)}"}), 400
+    except Exception as e:
+        logger.error(f"Error in append_observations: {e}")
+        return jsonify({"error": f"Failed to add observations: {str(e)}"}), 500
+
 @indian_climate_bp.route('/india/download-status', methods=['GET'])
 def get_download_status():
     """Check if the Kaggle dataset has been downloaded successfully"""
@@ -162,6 +277,7 @@ def get_download_status():
             "dataset_downloaded": has_real_data,
             "dataset_path": dataset_path,
             "using_mock_data": not has_real_data,
+            "initialization": indian_weather_service.get_init_status(),
             "timestamp": datetime.now().isoformat()
         })
     
@@ -171,16 +287,17 @@ def get_download_status():
 
 @indian_climate_bp.route('/india/initialize', methods=['POST'])
 def initialize_service():
-    """Manually initialize/reinitialize the Indian weather service"""
+    """Start re-downloading and reprocessing the dataset in the background"""
     try:
-        success = indian_weather_service.initialize()
+        started = indian_weather_service.start_background_initialize(refresh=True)
         
         return jsonify({
-            "status": "success" if success else "partial",
-            "initialized": success,
-            "message": "Service initialized successfully" if success else "Service initialized with mock data",
+            "status": "accepted",
+            "started": started,
+            "message": "Reinitialization started" if started else "Initialization already in progress",
+            "initialization": indian_weather_service.get_init_status(),
             "timestamp": datetime.now().isoformat()
-        })
+        }), 202
     
     except Exception as e:
         logger.error(f"Error in initialize_service: {e}")
@@ -192,6 +309,7 @@ def health_check():
     return jsonify({
         "status": "healthy",
         "service": "indian-climate-api",
+        "data_ready": indian_weather_service.is_ready,
         "timestamp": datetime.now().isoformat(),
         "version": "1.0.0"
     })
\ No newline at end of file
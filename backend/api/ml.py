@@ -1,19 +1,21 @@
 """
 Machine Learning API routes - Forecasting and Image Analysis
 """
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Header
+from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 import structlog
 from datetime import datetime, timedelta
 import numpy as np
-import cv2
-import io
-from PIL import Image
+
+from sqlalchemy.orm import Session
 
 from api.auth import get_current_active_user
+from database.connection import get_db
 from database.models import User
 from services.ml_service import MLService
+from services.model_registry import ModelRegistryError
+from services.image_analysis import ImageAnalysisBusy
 from core.config import settings
 
 logger = structlog.get_logger()
@@ -29,6 +31,21 @@ class ForecastRequest(BaseModel):
     days: int = 7
     features: List[str] = ["temperature", "aqi", "humidity"]
 
+class ForecastLocation(BaseModel):
+    """A single point in a batch forecast"""
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+
+class BatchForecastRequest(BaseModel):
+    """Forecast request for many locations at once"""
+    locations: List[ForecastLocation] = Field(..., min_length=1, max_length=100)
+    days: int = Field(7, ge=1, le=30)
+    features: List[str] = ["temperature", "aqi", "humidity"]
+
+class ActivateModelRequest(BaseModel):
+    """Switch the climate forecaster to a published version"""
+    version: str
+
 class ImageAnalysisResponse(BaseModel):
     """Image analysis response"""
     status: str
@@ -105,6 +122,64 @@ async def get_ml_forecast(
             detail=f"Failed to generate forecast: {str(e)}"
         )
 
+@router.post("/forecast/batch")
+async def get_ml_batch_forecast(
+    request: BatchForecastRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get ML-based climate forecasts for many locations in one model pass"""
+    try:
+        locations = [(loc.latitude, loc.longitude) for loc in request.locations]
+        
+        if not ml_service:
+            return {
+                "status": "success",
+                "forecasts": [
+                    {
+                        "location": {"lat": lat, "lon": lon},
+                        "predictions": [
+                            {
+                                "date": (datetime.utcnow().date() + timedelta(days=i)).isoformat(),
+                                "temperature": 20 + np.random.normal(0, 5),
+                                "aqi": max(50, 100 + np.random.normal(0, 30)),
+                                "humidity": max(30, min(90, 60 + np.random.normal(0, 15)))
+                            }
+                            for i in range(1, request.days + 1)
+                        ]
+                    }
+                    for lat, lon in locations
+                ],
+                "features": request.features,
+                "timestamp": datetime.utcnow().isoformat(),
+                "note": "Mock forecast data (enable ML features for real predictions)"
+            }
+        
+        batch = await ml_service.predict_climate_batch(
+            locations=locations,
+            days=request.days,
+            features=request.features
+        )
+        
+        logger.info("ML batch forecast generated",
+                   user_id=current_user.id,
+                   locations=len(locations),
+                   days=request.days)
+        
+        return {
+            "status": "success",
+            "forecasts": batch["forecasts"],
+            "model_info": batch["model_info"],
+            "features": request.features,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error("ML batch forecast failed", error=str(e), user_id=current_user.id)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate batch forecast: {str(e)}"
+        )
+
 @router.post("/analyze-image", response_model=ImageAnalysisResponse)
 async def analyze_image(
     file: UploadFile = File(...),
@@ -158,7 +233,14 @@ async def analyze_image(
             )
         
         # Real ML image analysis
-        analysis_result = await ml_service.analyze_environmental_image(image_data)
+        try:
+            analysis_result = await ml_service.analyze_environmental_image(image_data)
+        except ImageAnalysisBusy as e:
+            raise HTTPException(
+                status_code=429,
+                detail="Image analysis is busy, please retry shortly",
+                headers={"Retry-After": str(e.retry_after)}
+            )
         
         logger.info("Image analysis completed", 
                    user_id=current_user.id,
@@ -182,9 +264,28 @@ async def analyze_image(
             detail=f"Failed to analyze image: {str(e)}"
         )
 
+def require_ml_admin(x_admin_token: Optional[str] = Header(default=None)):
+    """Model management and worker metrics are disabled unless ML_ADMIN_TOKEN is configured"""
+    if not settings.ML_ADMIN_TOKEN or x_admin_token != settings.ML_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Model administration not permitted")
+
+@router.get("/image-analysis/metrics", dependencies=[Depends(require_ml_admin)])
+async def get_image_analysis_metrics():
+    """Throughput and queue depth of the image analysis worker pool, and duplicate-upload hits"""
+    if not ml_service:
+        return {"status": "disabled", "metrics": {}}
+    
+    return {
+        "status": "success",
+        "metrics": ml_service.image_pool.get_metrics(),
+        "dedup_index": ml_service.image_index.get_stats(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
 @router.get("/recommendations")
 async def get_personalized_recommendations(
     current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
     location: Optional[str] = None,
     category: Optional[str] = None
 ):
@@ -239,7 +340,8 @@ async def get_personalized_recommendations(
         recommendations = await ml_service.get_personalized_recommendations(
             user_id=current_user.id,
             location=location,
-            category=category
+            category=category,
+            db=db
         )
         
         logger.info("Personalized recommendations generated", 
@@ -286,3 +388,39 @@ async def get_model_status(current_user: User = Depends(get_current_active_user)
             status_code=500,
             detail=f"Failed to get model status: {str(e)}"
         )
+
+@router.get("/models/versions", dependencies=[Depends(require_ml_admin)])
+async def list_model_versions():
+    """List published climate forecast versions and the active one"""
+    if not ml_service:
+        raise HTTPException(status_code=503, detail="ML features are disabled")
+    
+    return {
+        "status": "success",
+        **ml_service.list_model_versions(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+@router.post("/models/activate", dependencies=[Depends(require_ml_admin)])
+async def activate_model_version(request: ActivateModelRequest):
+    """Hot-swap the climate forecaster to another published version"""
+    if not ml_service:
+        raise HTTPException(status_code=503, detail="ML features are disabled")
+    
+    try:
+        metadata = await ml_service.activate_model_version(request.version)
+    except ModelRegistryError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error("Model activation failed", version=request.version, error=str(e))
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to activate model: {str(e)}"
+        )
+    
+    return {
+        "status": "success",
+        "active_version": metadata["version"],
+        "metadata": metadata,
+        "timestamp": datetime.utcnow().isoformat()
+    }
@@ -6,14 +6,15 @@ from fastapi.responses import JSONResponse
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api
-from PIL import Image
-import io
+from starlette.concurrency import run_in_threadpool
 import structlog
 from typing import Optional
 
 from api.auth import get_current_active_user
 from database.models import User
 from core.config import settings
+from services.image_analysis import prepare_upload, decode_image, encode_jpeg, ImageAnalysisBusy, UPLOAD_MAX_SIZE
+from api.ml import ml_service
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -40,28 +41,9 @@ def validate_image(file: UploadFile) -> bool:
     return True
 
 def process_image(image_data: bytes) -> bytes:
-    """Process and optimize image"""
+    """Process and optimize image (max 1920x1920 JPEG)"""
     try:
-        # Open image with PIL
-        image = Image.open(io.BytesIO(image_data))
-        
-        # Convert to RGB if necessary
-        if image.mode in ('RGBA', 'LA', 'P'):
-            background = Image.new('RGB', image.size, (255, 255, 255))
-            if image.mode == 'P':
-                image = image.convert('RGBA')
-            background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
-            image = background
-        
-        # Resize if too large (max 1920x1920)
-        max_size = 1920
-        if image.width > max_size or image.height > max_size:
-            image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
-        
-        # Save optimized image
-        output = io.BytesIO()
-        image.save(output, format='JPEG', quality=85, optimize=True)
-        return output.getvalue()
+        return encode_jpeg(decode_image(image_data, UPLOAD_MAX_SIZE), quality=85)
         
     except Exception as e:
         logger.error("Image processing failed", error=str(e))
@@ -82,9 +64,21 @@ async def upload_image(
                 detail="Invalid image file. Must be an image under 10MB."
             )
         
-        # Read and process image
+        # Read the image and decode it once for the upload and thumbnail
         image_data = await file.read()
-        processed_image = process_image(image_data)
+        prepared = await run_in_threadpool(prepare_upload, image_data)
+        
+        # Analysis shares the bounded image pool and dedup index with /ml/analyze-image
+        analysis = None
+        if ml_service:
+            try:
+                analysis = await ml_service.analyze_environmental_image(image_data, image_hash=prepared["dhash"])
+            except ImageAnalysisBusy as e:
+                raise HTTPException(
+                    status_code=429,
+                    detail="Image analysis is busy, please retry shortly",
+                    headers={"Retry-After": str(e.retry_after)}
+                )
         
         # Upload to Cloudinary
         if not settings.CLOUDINARY_CLOUD_NAME:
@@ -93,12 +87,14 @@ async def upload_image(
                 "status": "success",
                 "url": f"https://via.placeholder.com/800x600/4CAF50/white?text=Uploaded+Image",
                 "public_id": f"mock_image_{current_user.id}",
+                "thumbnail": prepared["thumbnail"],
+                "analysis": analysis,
                 "message": "Mock upload (configure Cloudinary for real uploads)"
             })
         
         # Real Cloudinary upload
         upload_result = cloudinary.uploader.upload(
-            processed_image,
+            prepared["image"],
             folder=f"climate_tracker/{folder}",
             public_id=f"{current_user.id}_{file.filename.split('.')[0]}",
             overwrite=True,
@@ -120,7 +116,9 @@ async def upload_image(
             "width": upload_result.get('width'),
             "height": upload_result.get('height'),
             "format": upload_result.get('format'),
-            "bytes": upload_result.get('bytes')
+            "bytes": upload_result.get('bytes'),
+            "thumbnail": prepared["thumbnail"],
+            "analysis": analysis
         })
         
     except HTTPException:
@@ -187,7 +185,7 @@ async def upload_profile_image(
         
         # Read and process image
         image_data = await file.read()
-        processed_image = process_image(image_data)
+        processed_image = await run_in_threadpool(process_image, image_data)
         
         # Upload to Cloudinary with profile-specific transformations
         if not settings.CLOUDINARY_CLOUD_NAME:
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Offline load test of ClimateDataIntegrator against upstream_simulator.py.
+
+Starts the simulator in-process, points the integrator at it and replays the
+/climate/data fan-out (NASA POWER + air pollution + forecast + current weather)
+for many concurrent callers spread over a set of locations. Reports latency
+percentiles, throughput, upstream requests per call and fallback rates.
+
+Usage:
+    python benchmark_climate_upstream.py [--calls 500] [--concurrency 50]
+        [--locations 20] [--latency lognormal:80,0.5] [--error-rate 0.02]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from aiohttp import web
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from services.data_integrator import ClimateDataIntegrator
+from upstream_simulator import UpstreamSimulator, load_fixtures, FIXTURE_DIR
+
+
+async def climate_data_call(integrator: ClimateDataIntegrator, lat: float, lon: float, days: int):
+    """Same upstream sequence as GET /api/v1/climate/data"""
+    end = datetime.now()
+    start = end - timedelta(days=days)
+    nasa = await integrator.get_nasa_satellite_data(lat, lon, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
+    await integrator.get_air_quality_data(lat, lon)
+    await integrator.get_weather_forecast(lat, lon)
+    await integrator.get_current_weather(lat, lon)
+    integrator.process_and_normalize_data(nasa)
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run(args):
+    simulator = UpstreamSimulator(
+        load_fixtures(FIXTURE_DIR),
+        latency=args.latency,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        seed=args.seed
+    )
+    runner = web.AppRunner(simulator.build_app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", args.port)
+    await site.start()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    os.environ.setdefault("OPENWEATHER_API_KEY", "simulator")
+    integrator = ClimateDataIntegrator(nasa_base_url=base_url, openweather_base_url=base_url)
+
+    rng = random.Random(args.seed)
+    locations = [(rng.uniform(8, 30), rng.uniform(70, 88)) for _ in range(args.locations)]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def one_call(i):
+        lat, lon = locations[i % len(locations)]
+        async with semaphore:
+            started = time.perf_counter()
+            await climate_data_call(integrator, lat, lon, args.days)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_call(i) for i in range(args.calls)))
+    elapsed = time.perf_counter() - started
+    await runner.cleanup()
+
+    latencies.sort()
+    stats = integrator.get_upstream_stats()
+    upstream_requests = sum(s["requests"] for s in stats.values())
+
+    print(f"calls={args.calls} concurrency={args.concurrency} locations={args.locations} "
+          f"latency={args.latency} error_rate={args.error_rate} timeout_rate={args.timeout_rate}")
+    print(f"throughput: {args.calls / elapsed:.1f} calls/s over {elapsed:.2f}s")
+    print("call latency ms: " + ", ".join(
+        f"p{p}={percentile(latencies, p) * 1000:.1f}" for p in (50, 95, 99)
+    ))
+    print(f"upstream requests per call: {upstream_requests / args.calls:.2f}")
+    for source, counts in stats.items():
+        fallback_rate = counts["fallbacks"] / max(1, args.calls)
+        print(f"  {source:<16} requests={counts['requests']:<6} errors={counts['errors']:<5} "
+              f"fallback_rate={fallback_rate:.1%}")
+    print(f"simulator: {dict(sorted(simulator.stats.items()))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test ClimateDataIntegrator offline")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--locations", type=int, default=20)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--latency", default="lognormal:80,0.5")
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--port", type=int, default=8091)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialization and compression of large API payloads.
+
+Compares FastAPI's default JSONResponse against FastJSONResponse (orjson) and
+reports bytes on the wire uncompressed, gzip and Brotli for:
+  - a /climate/data response (30 days of NASA POWER + 40-step forecast)
+  - an EcoMarket product page (every product in data/eco_products.json)
+  - a social feed page (data/social_feed.json)
+
+Usage: python benchmark_responses.py [--repeat 200]
+"""
+import argparse
+import copy
+import gzip
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from fastapi.responses import JSONResponse
+
+from core.compression import brotli_available
+from core.responses import FastJSONResponse, orjson_available
+from services.data_integrator import ClimateDataIntegrator
+
+if brotli_available:
+    import brotli
+
+
+def build_climate_payload():
+    """A /climate/data response with a full 30-day series and 40-step forecast"""
+    integrator = ClimateDataIntegrator()
+    end = datetime(2025, 8, 19)
+
+    nasa = integrator.get_mock_nasa_data()
+    for param, values in nasa["properties"]["parameter"].items():
+        base = list(values.values())
+        values.clear()
+        for i in range(30):
+            day = (end - timedelta(days=29 - i)).strftime("%Y%m%d")
+            values[day] = round(base[i % len(base)] + (i % 7) * 0.13, 2)
+
+    forecast = integrator.get_mock_weather_data()
+    entry = forecast["list"][0]
+    forecast["list"] = []
+    for i in range(40):
+        step = copy.deepcopy(entry)
+        step["dt"] = entry["dt"] + i * 3 * 3600
+        step["main"]["temp"] = round(entry["main"]["temp"] + (i % 8) * 0.7, 2)
+        step["dt_txt"] = datetime.utcfromtimestamp(step["dt"]).strftime("%Y-%m-%d %H:%M:%S")
+        forecast["list"].append(step)
+
+    return {
+        "status": "success",
+        "location": {"lat": 12.9716, "lon": 77.5946},
+        "date_range": {"start": "2025-07-21", "end": "2025-08-19"},
+        "data": {
+            "current_weather": integrator.get_mock_current_weather(),
+            "historical_climate": nasa,
+            "air_quality": integrator.get_mock_air_quality_data(),
+            "weather_forecast": forecast,
+            "processed_summary": integrator.process_and_normalize_data(nasa).to_dict()
+        },
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+def load_json_payload(name, key):
+    path = backend_dir / "data" / name
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {"success": True, "data": {key: data.get(key, data)}}
+
+
+def time_render(response_class, content, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = response_class(content).body
+    elapsed = (time.perf_counter() - start) / repeat
+    return elapsed * 1e6, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    payloads = {
+        "climate/data": build_climate_payload(),
+        "eco-shopping/products": load_json_payload("eco_products.json", "products"),
+        "social/feed": load_json_payload("social_feed.json", "posts"),
+    }
+
+    print(f"orjson: {'yes' if orjson_available else 'no (stdlib fallback)'}, "
+          f"brotli: {'yes' if brotli_available else 'no (gzip only)'}")
+    print()
+    header = f"{'payload':<24}{'encoder':<12}{'render us':>11}{'identity':>10}{'gzip':>9}{'br':>9}"
+    print(header)
+    print("-" * len(header))
+
+    for name, content in payloads.items():
+        for label, response_class in (("json", JSONResponse), ("orjson", FastJSONResponse)):
+            micros, body = time_render(response_class, content, args.repeat)
+            gz = len(gzip.compress(body, compresslevel=6))
+            br = len(brotli.compress(body, quality=4)) if brotli_available else None
+            print(f"{name:<24}{label:<12}{micros:>11.1f}{len(body):>10}{gz:>9}{br if br is not None else '-':>9}")
+
+
+if __name__ == "__main__":
+    main()
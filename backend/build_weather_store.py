@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Convert the Indian weather dataset into the columnar store that
+IndianWeatherService memory-maps at startup (INDIAN_WEATHER_STORE_PATH).
+
+The service also converts the Kaggle CSV on its first load; run this during
+deployment so that no worker ever parses the CSV, or to import another CSV.
+--synthetic-years builds a seeded synthetic dataset instead (benchmarks, CI).
+
+Usage:
+    python build_weather_store.py [--csv data.csv | --synthetic-years 10 [--seed 42]]
+        [--store-path data/indian_weather_store]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from core.config import settings
+from services.synthetic_weather import DEFAULT_SEED, generate_weather
+from services.weather_store import WeatherStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the memory-mapped Indian weather store")
+    parser.add_argument("--csv", help="Weather CSV to convert (default: the Kaggle dataset)")
+    parser.add_argument("--synthetic-years", type=float, help="Generate this many years of synthetic data")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--store-path", default=settings.INDIAN_WEATHER_STORE_PATH)
+    args = parser.parse_args()
+
+    if args.synthetic_years:
+        from services.indian_weather_service import IndianWeatherService
+
+        started = time.perf_counter()
+        frame = generate_weather(IndianWeatherService().indian_cities, years=args.synthetic_years, seed=args.seed)
+        print(f"Generated {len(frame)} synthetic rows in {time.perf_counter() - started:.2f}s")
+        source = {"dataset_path": None, "synthetic": True, "seed": args.seed, "years": args.synthetic_years}
+        store = WeatherStore.build(frame, args.store_path, source)
+    elif args.csv:
+        import pandas as pd
+
+        stat = os.stat(args.csv)
+        source = {"dataset_path": None, "csv": args.csv, "size": stat.st_size, "mtime": stat.st_mtime}
+        store = WeatherStore.build(pd.read_csv(args.csv), args.store_path, source)
+    else:
+        from services.indian_weather_service import IndianWeatherService
+
+        service = IndianWeatherService()
+        service.store_path = Path(args.store_path)
+        if not service.download_dataset():
+            sys.exit("Kaggle download failed; pass --csv to convert a local file")
+        service.load_and_process_data()
+        if service.store is None:
+            sys.exit("Dataset has no CSV to convert")
+        store = service.store
+
+    started = time.perf_counter()
+    WeatherStore.open(args.store_path).to_frame()
+    print(f"Store at {args.store_path}: {store.n_rows} rows, "
+          f"{len(store.meta['columns'])} columns, opens in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 """
 Application configuration using Pydantic Settings (v2)
 """
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -50,6 +50,9 @@ class Settings(BaseSettings):
     ]
     ALLOWED_HOSTS: List[str] = ["*"]
 
+    # Response compression (bytes; smaller bodies are sent uncompressed)
+    COMPRESSION_MIN_SIZE: int = 1024
+
     # Database Configuration
     # For smooth local dev, default to SQLite by leaving POSTGRES_HOST empty
     POSTGRES_HOST: str = ""
@@ -81,6 +84,9 @@ class Settings(BaseSettings):
     NOAA_API_KEY: str = ""
     AIRVISUAL_API_KEY: str = ""
 
+    # Live weather stream (SSE)
+    LIVE_WEATHER_REFRESH_SECONDS: int = 60
+
     # File Storage
     CLOUDINARY_CLOUD_NAME: str = ""
     CLOUDINARY_API_KEY: str = ""
@@ -95,6 +101,16 @@ class Settings(BaseSettings):
     # ML Model Configuration
     MODEL_PATH: str = "models/"
     ENABLE_ML_FEATURES: bool = True
+    ML_BACKGROUND_LOAD: bool = True  # False: load models on first ML request instead of after startup
+    ML_ADMIN_TOKEN: Optional[str] = None  # required in X-Admin-Token to list/activate model versions and read pool metrics
+    IMAGE_ANALYSIS_WORKERS: int = 2
+    IMAGE_ANALYSIS_MAX_PENDING: int = 8  # analyses in flight (running + queued) before 429
+    IMAGE_INDEX_MAX_ENTRIES: int = 5000  # remembered analyses for duplicate uploads
+
+    # Indian weather dataset: columnar copy memory-mapped at startup (rebuilt from the Kaggle CSV)
+    INDIAN_WEATHER_STORE_PATH: str = "data/indian_weather_store"
+    INDIAN_WEATHER_ANOMALY_PATH: str = "data/indian_weather_anomalies"
+    WEATHER_INGEST_TOKEN: Optional[str] = None  # required in X-Ingest-Token for POST /india/observations
 
     # Logging
     LOG_LEVEL: str = "INFO"
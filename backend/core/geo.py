@@ -0,0 +1,26 @@
+"""
+Geographic helpers shared by the climate services
+"""
+import math
+from typing import Tuple
+
+# Default cell size in degrees (~11 km at the equator), coarse enough that
+# nearby callers share upstream data and cached results
+DEFAULT_CELL_SIZE = 0.1
+
+
+def grid_cell(lat: float, lon: float, cell_size: float = DEFAULT_CELL_SIZE) -> Tuple[int, int]:
+    """Integer grid cell containing a coordinate"""
+    # Round before flooring so 12.9 / 0.1 (= 128.999...) lands in cell 129
+    return (
+        math.floor(round(lat / cell_size, 9)),
+        math.floor(round(lon / cell_size, 9))
+    )
+
+
+def cell_center(cell: Tuple[int, int], cell_size: float = DEFAULT_CELL_SIZE) -> Tuple[float, float]:
+    """Coordinate at the center of a grid cell"""
+    return (
+        round((cell[0] + 0.5) * cell_size, 6),
+        round((cell[1] + 0.5) * cell_size, 6)
+    )
@@ -0,0 +1,46 @@
+"""
+Fast JSON response class for the API gateway
+"""
+import json
+from datetime import date, datetime, time
+from typing import Any
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+# orjson is optional; without it responses fall back to the stdlib encoder
+try:
+    import orjson
+    orjson_available = True
+except ImportError:
+    orjson_available = False
+
+
+def _json_default(value: Any) -> Any:
+    """Encode what orjson (OPT_SERIALIZE_NUMPY) encodes natively, so the payload does not
+    depend on whether orjson is installed"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (numpy arrays and non-str keys supported)"""
+
+    def render(self, content: Any) -> bytes:
+        if orjson_available:
+            return orjson.dumps(
+                content,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            )
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+            default=_json_default
+        ).encode("utf-8")
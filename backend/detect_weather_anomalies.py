@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Recompute the Indian weather anomaly table (INDIAN_WEATHER_ANOMALY_PATH).
+
+Builds each city's day-of-year baseline from the weather store and writes the
+detected heatwaves, temperature extremes and rainfall deficits next to it.
+IndianWeatherService does this itself when the table is missing or was built
+from different data; run this after build_weather_store.py during deployment
+so that no worker has to.
+
+Usage:
+    python detect_weather_anomalies.py [--store-path data/indian_weather_store]
+        [--anomaly-path data/indian_weather_anomalies]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from core.config import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect anomalies in the Indian weather store")
+    parser.add_argument("--store-path", default=settings.INDIAN_WEATHER_STORE_PATH)
+    parser.add_argument("--anomaly-path", default=settings.INDIAN_WEATHER_ANOMALY_PATH)
+    args = parser.parse_args()
+
+    from services.indian_weather_service import IndianWeatherService, WeatherSnapshot
+
+    service = IndianWeatherService()
+    service.store_path = Path(args.store_path)
+    service.anomaly_path = Path(args.anomaly_path)
+    store = service._open_store()
+    if store is None:
+        sys.exit(f"No weather store at {args.store_path}; run build_weather_store.py first")
+
+    started = time.perf_counter()
+    table = service._detect_anomalies(WeatherSnapshot(weather_data=store.to_frame(), store=store), recompute=True)
+    if table is None:
+        sys.exit("Anomaly detection failed")
+    print(f"Detected {len(table)} anomalies in {time.perf_counter() - started:.2f}s -> {args.anomaly_path}")
+    for anomaly_type, count in table.counts().items():
+        print(f"  {anomaly_type:18s} {count}")
+
+
+if __name__ == "__main__":
+    main()
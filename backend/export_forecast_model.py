@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Convert a published sklearn forecast model version into the flat_forest
+format (services/flat_forest.py) and publish it as a new registry version.
+
+Flat versions are served without importing sklearn and predict faster; the
+script checks that both formats give the same predictions before publishing.
+
+Usage:
+    python export_forecast_model.py [--version v3] [--no-activate]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from core.config import settings
+from services.flat_forest import export_forecast_bundle, is_flat_bundle, FLAT_FOREST_FORMAT
+from services.ml_service import FORECAST_MODEL_NAME
+from services.model_registry import ModelRegistry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a forecast model version to flat_forest")
+    parser.add_argument("--version", help="Version to export (default: current)")
+    parser.add_argument("--model-path", default=settings.MODEL_PATH)
+    parser.add_argument("--no-activate", action="store_true", help="Publish without making it the current version")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(Path(args.model_path) / "registry")
+    bundle, metadata = registry.load(FORECAST_MODEL_NAME, args.version, mmap=False)
+    if is_flat_bundle(bundle):
+        sys.exit(f"{metadata['version']} is already in {FLAT_FOREST_FORMAT} format")
+
+    exported = export_forecast_bundle(bundle)
+
+    # Sanity check on random inputs spanning the scaled feature space
+    n_features = len(bundle["scaler"].mean_)
+    X = np.random.default_rng(0).normal(size=(2000, n_features)) * bundle["scaler"].scale_ + bundle["scaler"].mean_
+    X_sklearn, X_flat = bundle["scaler"].transform(X), exported["scaler"].transform(X)
+    for target, model in bundle["models"].items():
+        difference = np.abs(model.predict(X_sklearn) - exported["models"][target].predict(X_flat)).max()
+        print(f"{target}: max prediction difference {difference:.2e}")
+        if difference > 1e-6:
+            sys.exit(f"Export of {target} does not reproduce the sklearn predictions")
+
+    record = registry.publish(FORECAST_MODEL_NAME, exported, {
+        **{k: v for k, v in metadata.items() if k not in ("name", "version", "sequence", "published_at", "sha256", "size_bytes")},
+        "format": FLAT_FOREST_FORMAT,
+        "exported_from": metadata["version"],
+    }, activate=not args.no_activate)
+    print(f"Published {FORECAST_MODEL_NAME} {record['version']} from {metadata['version']} "
+          f"({record['size_bytes'] / 1e6:.1f} MB){'' if args.no_activate else ' and activated'}")
+
+
+if __name__ == "__main__":
+    main()
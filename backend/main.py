@@ -18,7 +18,7 @@ from api.carbon import router as carbon_router
 from api.auth import router as auth_router
 # from api.social import router as social_router  # Database version
 from api.social_json import router as social_router  # JSON version (no DB required)
-# from api.ml import router as ml_router  # Temporarily disabled - sklearn import issues
+from api.ml import router as ml_router, ml_service  # sklearn/cv2 are imported lazily by MLService
 # from api.upload import router as upload_router  # Temporarily disabled - requires cloudinary
 # from api.advocacy import router as advocacy_router  # Database version
 from api.advocacy_json import router as advocacy_router  # JSON version (no DB required)
@@ -29,6 +29,8 @@ from api.firebase_api import router as firebase_router
 # Import database
 from database.connection import init_db, close_db
 from core.config import settings
+from core.responses import FastJSONResponse
+from core.compression import CompressionMiddleware
 
 # Configure structured logging
 structlog.configure(
@@ -57,9 +59,15 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Climate Tracker API")
     await init_db()
+    if ml_service and settings.ML_BACKGROUND_LOAD:
+        # Load/train models off the event loop; /api/v1/ml/models/status reports progress
+        ml_service.start_background_load()
     yield
     # Shutdown
     logger.info("Shutting down Climate Tracker API")
+    if ml_service:
+        ml_service.image_pool.shutdown()
+        ml_service.image_index.save()
     await close_db()
 
 # Create FastAPI app with API Gateway pattern
@@ -69,9 +77,16 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
+# Compress large JSON payloads (climate data, feeds, product lists)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE
+)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -113,11 +128,11 @@ app.include_router(
     tags=["Social Features"]
 )
 
-# app.include_router(
-#     ml_router,
-#     prefix="/api/v1/ml",
-#     tags=["Machine Learning"]
-# )
+app.include_router(
+    ml_router,
+    prefix="/api/v1/ml",
+    tags=["Machine Learning"]
+)
 
 # app.include_router(
 #     upload_router,
@@ -0,0 +1,273 @@
+"""
+Activity Recommender - ranks carbon-saving suggestions from a user's own activity log
+
+Each user is summarised as a small vector: the share of their last 30 days of
+emissions per category, and how fast each category is rising (last week vs
+the three weeks before). Suggestions from CarbonActivityService are embedded
+in the same space once at startup, so ranking is one matrix-vector product.
+
+Per-user state is a set of daily per-category emission bins (kg, rows) built
+from CarbonActivity rows. Requests fetch only rows created after the stored
+watermark and fold them into the bins, so a request costs an indexed delta
+query at most once per refresh interval, never a full history scan. Edits and
+deletes don't move the watermark, so every reconcile interval (or after
+invalidate()) the bins are replaced by the database's own per-day,
+per-category totals over the retention window.
+
+Suggestion impacts are quoted per day, trip, meal, month, item or year; they
+are converted to kg per month before they weight the ranking.
+"""
+import re
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import structlog
+
+from services.carbon_activity_service import CarbonActivityService
+
+logger = structlog.get_logger()
+
+CATEGORIES = ["transport", "food", "energy", "shopping"]
+
+# Older API callers use these names for the same categories
+CATEGORY_ALIASES = {"transportation": "transport", "diet": "food", "consumption": "shopping"}
+
+SHARE_WINDOW_DAYS = 30
+RECENT_DAYS = 7
+BIN_RETENTION_DAYS = 45
+TREND_WEIGHT = 0.5
+WATERMARK_OVERLAP = timedelta(seconds=60)
+RECONCILE_SECONDS = 300
+
+# How often each impact period happens in a month; trips, meals and items
+# assume a typical rate of two shared trips a week, one swapped meal a week
+# and one purchase a month
+IMPACT_PER_MONTH = {
+    "day": 30.0,
+    "week": 52 / 12,
+    "month": 1.0,
+    "year": 1 / 12,
+    "trip": 104 / 12,
+    "meal": 52 / 12,
+    "item": 1.0,
+}
+
+
+def _impact_kg(impact: str) -> float:
+    """kg CO2 per month for an impact string such as 'Save 2-5 kg CO2 per day' (midpoint of the range)"""
+    numbers = [float(n) for n in re.findall(r"\d+(?:\.\d+)?", impact.split("kg")[0])]
+    period = re.search(r"per (\w+)", impact)
+    per_month = IMPACT_PER_MONTH.get(period.group(1).lower(), 1.0) if period else 1.0
+    return (sum(numbers) / len(numbers) if numbers else 1.0) * per_month
+
+
+def _as_date(value) -> date:
+    """func.date() results: a date on PostgreSQL, an ISO string on SQLite"""
+    if isinstance(value, datetime):
+        return value.date()
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+class ActivityRecommender:
+    """Suggestion ranking with per-user incremental activity aggregates"""
+
+    def __init__(self, activity_service: Optional[CarbonActivityService] = None,
+                 refresh_seconds: int = 60, reconcile_seconds: int = RECONCILE_SECONDS, max_users: int = 10000):
+        self.activity_service = activity_service or CarbonActivityService()
+        self.refresh_seconds = refresh_seconds
+        self.reconcile_seconds = reconcile_seconds
+        self.max_users = max_users
+        self._users: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.stats = {"requests": 0, "delta_queries": 0, "rows_folded": 0, "reconciles": 0}
+        self._build_index()
+
+    def _build_index(self):
+        """Embed every catalogue suggestion as [category one-hot, trend one-hot] with an impact prior"""
+        self.catalogue: List[Dict[str, Any]] = []
+        for category in CATEGORIES:
+            self.catalogue.extend(self.activity_service.get_personalized_suggestions("catalogue", category))
+
+        n = len(CATEGORIES)
+        self.item_vectors = np.zeros((len(self.catalogue), 2 * n))
+        categories = np.array([CATEGORIES.index(item["category"]) for item in self.catalogue])
+        self.item_vectors[np.arange(len(self.catalogue)), categories] = 1.0
+        self.item_vectors[np.arange(len(self.catalogue)), n + categories] = TREND_WEIGHT
+        self.item_categories = categories
+
+        impact = np.log1p([_impact_kg(item["impact"]) for item in self.catalogue])
+        self.item_prior = 1.0 + 0.25 * impact / impact.max()
+        self.item_easy = np.array([item["difficulty"] == "Easy" for item in self.catalogue])
+
+    def _state(self, user_id: str) -> Dict[str, Any]:
+        state = self._users.get(user_id)
+        if state is None:
+            state = {"bins": {}, "watermark": None, "recent_ids": {},
+                     "checked_at": 0.0, "reconciled_at": None, "vector": None}
+            self._users[user_id] = state
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        self._users.move_to_end(user_id)
+        return state
+
+    def invalidate(self, user_id: str):
+        """Forget a user's aggregates; call after editing or deleting their activities"""
+        self._users.pop(user_id, None)
+
+    @staticmethod
+    def _window_start(today: date) -> datetime:
+        return datetime.combine(today - timedelta(days=BIN_RETENTION_DAYS), datetime.min.time())
+
+    def _refresh(self, user_id: str, state: Dict[str, Any], db) -> bool:
+        """Bring the bins up to date: a watermark delta, or a full reconcile when it is due"""
+        due = (state["reconciled_at"] is None
+               or time.monotonic() - state["reconciled_at"] >= self.reconcile_seconds)
+        if due:
+            return self._reconcile(user_id, state, db)
+        return self._fold_new_rows(user_id, state, db) > 0
+
+    def _reconcile(self, user_id: str, state: Dict[str, Any], db) -> bool:
+        """Replace the bins with the database's per-day, per-category totals over the retention window"""
+        from sqlalchemy import func
+        from database.models import CarbonActivity
+
+        mine = CarbonActivity.user_id == user_id
+        # Watermark first: rows committed meanwhile are re-read by the next delta or reconcile
+        watermark = db.query(func.max(CarbonActivity.created_at)).filter(mine).scalar()
+        recent_ids = {}
+        if watermark is not None:
+            recent_ids = dict(db.query(CarbonActivity.id, CarbonActivity.created_at).filter(
+                mine, CarbonActivity.created_at >= watermark - WATERMARK_OVERLAP).all())
+
+        day = func.date(CarbonActivity.date)
+        totals = db.query(
+            day, CarbonActivity.category,
+            func.sum(CarbonActivity.emissions_kg_co2), func.count(CarbonActivity.id)
+        ).filter(mine, CarbonActivity.date >= self._window_start(datetime.utcnow().date())).group_by(
+            day, CarbonActivity.category).all()
+        bins = {(_as_date(d), category): (float(kg or 0.0), int(count)) for d, category, kg, count in totals}
+
+        self.stats["reconciles"] += 1
+        changed = bins != state["bins"]
+        state.update(bins=bins, watermark=watermark, recent_ids=recent_ids, reconciled_at=time.monotonic())
+        return changed
+
+    def _fold_new_rows(self, user_id: str, state: Dict[str, Any], db) -> int:
+        """Fold CarbonActivity rows created since the watermark into the daily bins"""
+        from database.models import CarbonActivity
+
+        query = db.query(
+            CarbonActivity.id, CarbonActivity.date, CarbonActivity.category,
+            CarbonActivity.emissions_kg_co2, CarbonActivity.created_at
+        ).filter(CarbonActivity.user_id == user_id)
+        if state["watermark"] is None:
+            # No rows at the last reconcile: anything in the window is new
+            query = query.filter(CarbonActivity.date >= self._window_start(datetime.utcnow().date()))
+        else:
+            # created_at is the inserting transaction's start time, so rows can commit
+            # slightly "in the past"; re-read an overlap and skip rows already folded
+            query = query.filter(CarbonActivity.created_at >= state["watermark"] - WATERMARK_OVERLAP)
+
+        self.stats["delta_queries"] += 1
+        folded = 0
+        for row in query.all():
+            if row.id in state["recent_ids"]:
+                continue
+            key = (row.date.date(), row.category)
+            kg, count = state["bins"].get(key, (0.0, 0))
+            state["bins"][key] = (kg + float(row.emissions_kg_co2 or 0.0), count + 1)
+            folded += 1
+
+            if row.created_at is not None:
+                state["recent_ids"][row.id] = row.created_at
+                if state["watermark"] is None or row.created_at > state["watermark"]:
+                    state["watermark"] = row.created_at
+
+        if state["watermark"] is not None:
+            horizon = state["watermark"] - WATERMARK_OVERLAP
+            state["recent_ids"] = {k: v for k, v in state["recent_ids"].items() if v >= horizon}
+        self.stats["rows_folded"] += folded
+        return folded
+
+    def _user_vector(self, state: Dict[str, Any], today: date) -> np.ndarray:
+        """[30-day emission share per category, normalised rise per category]"""
+        share_start = today - timedelta(days=SHARE_WINDOW_DAYS)
+        recent_start = today - timedelta(days=RECENT_DAYS)
+
+        # Drop bins that no window reaches any more
+        retention_start = today - timedelta(days=BIN_RETENTION_DAYS)
+        state["bins"] = {k: v for k, v in state["bins"].items() if k[0] >= retention_start}
+
+        n = len(CATEGORIES)
+        totals, recent, older = np.zeros(n), np.zeros(n), np.zeros(n)
+        for (day, category), (emissions, _) in state["bins"].items():
+            if day < share_start or category not in CATEGORIES:
+                continue
+            index = CATEGORIES.index(category)
+            totals[index] += emissions
+            if day >= recent_start:
+                recent[index] += emissions
+            else:
+                older[index] += emissions
+
+        vector = np.zeros(2 * n)
+        if totals.sum() > 0:
+            vector[:n] = totals / totals.sum()
+            # Daily rate last week vs the weeks before; only rises push a category up
+            rise = recent / RECENT_DAYS - older / (SHARE_WINDOW_DAYS - RECENT_DAYS)
+            scale = np.abs(rise).max()
+            if scale > 0:
+                vector[n:] = np.clip(rise / scale, 0, None)
+        return vector
+
+    def recommend(self, user_id: str, db=None, category: Optional[str] = None, limit: int = 3) -> Dict[str, Any]:
+        """Top suggestions for a user, refreshing their aggregates if the interval has passed"""
+        self.stats["requests"] += 1
+        state = self._state(user_id)
+        today = datetime.utcnow().date()
+
+        changed = False
+        if db is not None and time.monotonic() - state["checked_at"] >= self.refresh_seconds:
+            try:
+                changed = self._refresh(user_id, state, db)
+            except Exception as e:
+                logger.warning("Activity refresh failed, using cached aggregates", user_id=user_id, error=str(e))
+            state["checked_at"] = time.monotonic()
+        if changed or state["vector"] is None or state.get("vector_day") != today:
+            state["vector"] = self._user_vector(state, today)
+            state["vector_day"] = today
+
+        vector = state["vector"]
+        personalized = bool(vector.any())
+        if personalized:
+            scores = self.item_vectors @ vector * self.item_prior
+        else:
+            # No history yet: favour easy, high-impact starters
+            scores = self.item_prior + 0.1 * self.item_easy
+
+        candidates = np.arange(len(self.catalogue))
+        category = CATEGORY_ALIASES.get(category, category)
+        if category in CATEGORIES:
+            candidates = candidates[self.item_categories == CATEGORIES.index(category)]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")][:limit]
+
+        n = len(CATEGORIES)
+        top_category = CATEGORIES[int(vector[:n].argmax())] if personalized else None
+        rising = [CATEGORIES[i] for i in np.flatnonzero(vector[n:] > 0.5)]
+        return {
+            "suggestions": [
+                {**self.catalogue[i], "score": round(float(scores[i]), 3)} for i in ranked
+            ],
+            "profile": {
+                "personalized": personalized,
+                "category_shares": {c: round(float(v), 3) for c, v in zip(CATEGORIES, vector[:n])},
+                "rising_categories": rising,
+                "top_category": top_category,
+                "activities_seen": sum(count for _, count in state["bins"].values())
+            }
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "cached_users": len(self._users), "catalogue_size": len(self.catalogue)}
@@ -0,0 +1,275 @@
+"""
+Climate Alert Engine - rule-based alerts over OpenWeatherMap forecast and air pollution payloads
+"""
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from core.geo import grid_cell
+
+logger = structlog.get_logger()
+
+# Declarative alert thresholds. Within a metric the highest matching band wins,
+# so a 45°C heat index raises only the "danger" alert, not both.
+ALERT_RULES: List[Dict[str, Any]] = [
+    {
+        "id": "air_quality_very_poor",
+        "type": "air_quality",
+        "metric": "aqi",
+        "threshold": 5,
+        "severity": "high",
+        "title": "Very Poor Air Quality Alert",
+        "message": "Air quality index reaches {peak:.0f}/5 (very poor). Avoid outdoor activities and wear a mask outside."
+    },
+    {
+        "id": "air_quality_poor",
+        "type": "air_quality",
+        "metric": "aqi",
+        "threshold": 4,
+        "severity": "moderate",
+        "title": "Poor Air Quality Alert",
+        "message": "Air quality index reaches {peak:.0f}/5 (poor). Consider limiting outdoor activities."
+    },
+    {
+        "id": "heat_danger",
+        "type": "extreme_heat",
+        "metric": "heat_index",
+        "threshold": 41.0,
+        "severity": "high",
+        "title": "Extreme Heat Warning",
+        "message": "Heat index peaks at {peak:.1f}°C. Stay hydrated and avoid prolonged sun exposure."
+    },
+    {
+        "id": "heat_caution",
+        "type": "extreme_heat",
+        "metric": "heat_index",
+        "threshold": 32.0,
+        "severity": "moderate",
+        "title": "Heat Advisory",
+        "message": "Heat index peaks at {peak:.1f}°C. Limit strenuous activity during the hottest hours."
+    },
+    {
+        "id": "rain_heavy",
+        "type": "heavy_rain",
+        "metric": "rain_3h",
+        "threshold": 15.0,
+        "severity": "high",
+        "title": "Heavy Rainfall Warning",
+        "message": "Up to {peak:.1f} mm of rain expected in 3 hours. Watch for waterlogging and flooding."
+    },
+    {
+        "id": "rain_moderate",
+        "type": "heavy_rain",
+        "metric": "rain_3h",
+        "threshold": 7.5,
+        "severity": "moderate",
+        "title": "Heavy Rain Advisory",
+        "message": "Up to {peak:.1f} mm of rain expected in 3 hours. Plan travel accordingly."
+    },
+    {
+        "id": "wind_gale",
+        "type": "high_wind",
+        "metric": "wind",
+        "threshold": 17.2,
+        "severity": "high",
+        "title": "Gale Warning",
+        "message": "Winds up to {peak:.1f} m/s expected. Secure loose objects and avoid travel if possible."
+    },
+    {
+        "id": "wind_strong",
+        "type": "high_wind",
+        "metric": "wind",
+        "threshold": 10.8,
+        "severity": "moderate",
+        "title": "Strong Wind Advisory",
+        "message": "Winds up to {peak:.1f} m/s expected. Take care outdoors."
+    },
+]
+
+METRICS = ("aqi", "heat_index", "rain_3h", "wind")
+
+# Alerts raised from anomaly spells detected in the Indian weather dataset (services.weather_anomalies)
+ANOMALY_ALERTS: Dict[str, Dict[str, str]] = {
+    "heatwave": {
+        "type": "extreme_heat",
+        "title": "Heatwave",
+        "message": "{city} had {days} days of unusual heat, peaking at {value:.1f}°C ({departure:+.1f}°C above normal)."
+    },
+    "temperature_high": {
+        "type": "extreme_heat",
+        "title": "Unusually Hot Day",
+        "message": "{city} reached {value:.1f}°C, {departure:+.1f}°C from the seasonal normal."
+    },
+    "temperature_low": {
+        "type": "cold_wave",
+        "title": "Unusually Cold Spell",
+        "message": "{city} dropped to {value:.1f}°C, {departure:+.1f}°C from the seasonal normal."
+    },
+    "rainfall_deficit": {
+        "type": "drought",
+        "title": "Rainfall Deficit",
+        "message": "{city} received {value:.0f} mm over 30 days against a normal of {expected:.0f} mm "
+                   "({departure_pct:+.0f}%). Conserve water."
+    },
+}
+
+
+def heat_index_celsius(temp_c: np.ndarray, humidity: np.ndarray) -> np.ndarray:
+    """NOAA heat index (Rothfusz regression) for arrays of °C temperature and % relative humidity"""
+    t = temp_c * 9 / 5 + 32
+    rh = humidity
+
+    simple = 0.5 * (t + 61.0 + (t - 68.0) * 1.2 + rh * 0.094)
+    full = (
+        -42.379 + 2.04901523 * t + 10.14333127 * rh
+        - 0.22475541 * t * rh - 6.83783e-3 * t * t
+        - 5.481717e-2 * rh * rh + 1.22874e-3 * t * t * rh
+        + 8.5282e-4 * t * rh * rh - 1.99e-6 * t * t * rh * rh
+    )
+    hi = np.where((simple + t) / 2 >= 80, full, simple)
+
+    # Below ~27°C the regression is not meaningful; heat index equals air temperature
+    hi = np.where(t < 80, t, hi)
+    return (hi - 32) * 5 / 9
+
+
+class ClimateAlertEngine:
+    """Evaluates compiled alert rules across a whole forecast in one vectorized pass"""
+
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None, cache_size: int = 1024):
+        self.rules = rules if rules is not None else ALERT_RULES
+        self._compile_rules()
+
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple, List[Dict]]" = OrderedDict()
+
+    def _compile_rules(self):
+        """Group rules by metric, highest threshold first, as threshold arrays"""
+        self._compiled = {}
+        for metric in METRICS:
+            rules = sorted(
+                (r for r in self.rules if r["metric"] == metric),
+                key=lambda r: r["threshold"],
+                reverse=True
+            )
+            if rules:
+                self._compiled[metric] = (
+                    rules,
+                    np.array([r["threshold"] for r in rules], dtype=float)
+                )
+        logger.info("Compiled climate alert rules", rules=len(self.rules), metrics=list(self._compiled))
+
+    def _extract_series(self, weather_forecast: Dict, air_quality: Dict) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Pull (timestamps, values) arrays for every metric out of the raw payloads"""
+        series = {}
+
+        forecast = (weather_forecast or {}).get("list", [])
+        if forecast:
+            n = len(forecast)
+            dt = np.fromiter((e.get("dt", 0) for e in forecast), dtype=np.int64, count=n)
+            temp = np.fromiter((e.get("main", {}).get("temp", np.nan) for e in forecast), dtype=float, count=n)
+            humidity = np.fromiter((e.get("main", {}).get("humidity", np.nan) for e in forecast), dtype=float, count=n)
+            rain = np.fromiter((e.get("rain", {}).get("3h", 0.0) for e in forecast), dtype=float, count=n)
+            wind = np.fromiter(
+                (max(e.get("wind", {}).get("speed", 0.0), e.get("wind", {}).get("gust", 0.0)) for e in forecast),
+                dtype=float, count=n
+            )
+            series["heat_index"] = (dt, heat_index_celsius(temp, humidity))
+            series["rain_3h"] = (dt, rain)
+            series["wind"] = (dt, wind)
+
+        pollution = (air_quality or {}).get("list", [])
+        if pollution:
+            n = len(pollution)
+            dt = np.fromiter((e.get("dt", 0) for e in pollution), dtype=np.int64, count=n)
+            aqi = np.fromiter((e.get("main", {}).get("aqi", np.nan) for e in pollution), dtype=float, count=n)
+            series["aqi"] = (dt, aqi)
+
+        return series
+
+    def evaluate(self, weather_forecast: Dict, air_quality: Dict) -> List[Dict[str, Any]]:
+        """Evaluate every rule against the full forecast and air quality series"""
+        alerts = []
+        series = self._extract_series(weather_forecast, air_quality)
+
+        for metric, (rules, thresholds) in self._compiled.items():
+            if metric not in series:
+                continue
+            dt, values = series[metric]
+
+            # hits[i, j]: value at step j reaches rule i's threshold (NaN never does)
+            hits = values[None, :] >= thresholds[:, None]
+            if not hits.any():
+                continue
+
+            # Highest band reached at each step; -1 where no band is reached
+            band = np.where(hits.any(axis=0), hits.argmax(axis=0), -1)
+
+            for i, rule in enumerate(rules):
+                steps = np.flatnonzero(band == i)
+                if steps.size == 0:
+                    continue
+                peak = float(values[steps].max())
+                alerts.append({
+                    "id": rule["id"],
+                    "type": rule["type"],
+                    "severity": rule["severity"],
+                    "title": rule["title"],
+                    "message": rule["message"].format(peak=peak),
+                    "peak_value": round(peak, 1),
+                    "starts_at": datetime.utcfromtimestamp(int(dt[steps[0]])).isoformat(),
+                    "ends_at": datetime.utcfromtimestamp(int(dt[steps[-1]])).isoformat(),
+                    "periods": int(steps.size),
+                    "timestamp": datetime.utcnow().isoformat()
+                })
+
+        severity_order = {"high": 0, "moderate": 1}
+        alerts.sort(key=lambda a: (severity_order.get(a["severity"], 2), a["starts_at"]))
+        return alerts
+
+    def anomaly_alerts(self, anomalies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Alerts in the evaluate() format for precomputed weather anomalies"""
+        alerts = []
+        for anomaly in anomalies:
+            template = ANOMALY_ALERTS.get(anomaly["type"])
+            if template is None:
+                continue
+            alerts.append({
+                "id": f"anomaly_{anomaly['type']}",
+                "type": template["type"],
+                "severity": anomaly["severity"],
+                "title": template["title"],
+                "message": template["message"].format(**anomaly),
+                "peak_value": anomaly["value"],
+                "starts_at": anomaly["start"],
+                "ends_at": anomaly["end"],
+                "periods": anomaly["days"],
+                "source": "historical_anomaly",
+                "station": anomaly["city"],
+                "timestamp": datetime.utcnow().isoformat()
+            })
+        return alerts
+
+    def get_alerts(self, lat: float, lon: float, weather_forecast: Dict, air_quality: Dict) -> List[Dict[str, Any]]:
+        """Cached evaluation keyed by grid cell and the forecast/air quality issue timestamps"""
+        forecast_list = (weather_forecast or {}).get("list") or [{}]
+        pollution_list = (air_quality or {}).get("list") or [{}]
+        key = (grid_cell(lat, lon), forecast_list[0].get("dt"), pollution_list[0].get("dt"))
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        alerts = self.evaluate(weather_forecast, air_quality)
+        self._cache[key] = alerts
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return alerts
+
+
+# Rules are compiled once at import
+climate_alert_engine = ClimateAlertEngine()
@@ -128,8 +128,13 @@ class ClimateBot:
             "Electric or hybrid vehicles for sustainable transportation"
         ]
     
-    def process_message(self, message: str, user_id: str = "default") -> Dict[str, Any]:
-        """Process user message and generate appropriate response"""
+    def process_message(self, message: str, user_id: str = "default",
+                        location: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
+        """Process user message and generate appropriate response.
+
+        location is the user's (lat, lon); weather questions without a recognisable city
+        are answered for the nearest city in the Indian dataset.
+        """
         try:
             # Initialize conversation history for new users
             if user_id not in self.conversation_history:
@@ -144,7 +149,7 @@ class ClimateBot:
             
             # Clean and analyze message
             clean_message = message.lower().strip()
-            response_data = self._generate_response(clean_message, user_id)
+            response_data = self._generate_response(clean_message, user_id, location)
             
             # Add bot response to history
             self.conversation_history[user_id].append({
@@ -172,7 +177,8 @@ class ClimateBot:
                 "timestamp": datetime.now().isoformat()
             }
     
-    def _generate_response(self, message: str, user_id: str) -> Dict[str, Any]:
+    def _generate_response(self, message: str, user_id: str,
+                           location: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
         """Generate response based on message analysis"""
         
         # Check for greetings
@@ -199,7 +205,7 @@ class ClimateBot:
         intent, entities = self._analyze_intent(message)
         
         if intent == "weather_query":
-            return self._handle_weather_query(entities)
+            return self._handle_weather_query(entities, location)
         elif intent == "comparison":
             return self._handle_comparison(entities)
         elif intent == "carbon_footprint":
@@ -240,17 +246,29 @@ class ClimateBot:
         
         return "unknown", entities
     
-    def _handle_weather_query(self, entities: Dict[str, Any]) -> Dict[str, Any]:
+    def _handle_weather_query(self, entities: Dict[str, Any],
+                              location: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
         """Handle weather-related queries"""
         city_name = entities.get('city', 'Delhi')  # Default to Delhi
         
         try:
-            # Get weather data from Indian weather service
-            if not indian_weather_service.processed_data:
-                indian_weather_service.initialize()
+            # Get weather data from Indian weather service (loaded in the background)
+            if not indian_weather_service.is_ready:
+                indian_weather_service.start_background_initialize()
+                return self._weather_loading_response("weather_query")
             
             city_data = indian_weather_service.get_city_weather(city_name)
             
+            # No recognisable city in the message: use the dataset city nearest to the user
+            station_note = ""
+            if not city_data and location:
+                context = indian_weather_service.get_location_context(location[0], location[1], k=1)
+                if context:
+                    nearest = context['nearest']
+                    city_name = nearest['name']
+                    city_data = indian_weather_service.get_city_weather(city_name)
+                    station_note = f" (nearest station to you, {nearest['distance_km']} km away)"
+            
             if city_data:
                 temp = city_data['current']['temperature']
                 humidity = city_data['current']['humidity']
@@ -260,7 +278,7 @@ class ClimateBot:
                 weather_advice = self._get_weather_advice(temp, humidity, rainfall)
                 
                 response = random.choice(self.response_templates['weather_info']).format(
-                    city=city_name,
+                    city=city_name + station_note,
                     temp=temp,
                     humidity=humidity,
                     rainfall=rainfall,
@@ -269,6 +287,11 @@ class ClimateBot:
                     climate_insight=self._get_climate_insight(temp, humidity, rainfall)
                 )
                 
+                anomalies = indian_weather_service.get_recent_anomalies(city_name)
+                if anomalies:
+                    response += "\n\n" + self._describe_anomalies(anomalies)
+                    city_data = {**city_data, 'anomalies': anomalies}
+                
                 return {
                     "message": response,
                     "intent": "weather_query",
@@ -294,14 +317,42 @@ class ClimateBot:
                 "intent": "weather_query"
             }
     
+    def _describe_anomalies(self, anomalies: List[Dict[str, Any]]) -> str:
+        """One line per recent anomaly, most recent first"""
+        labels = {
+            'heatwave': "Heatwave",
+            'temperature_high': "Unusually hot",
+            'temperature_low': "Unusually cold",
+            'rainfall_deficit': "Rainfall deficit"
+        }
+        lines = []
+        for anomaly in anomalies[:3]:
+            if anomaly['metric'] == 'rainfall':
+                detail = f"{anomaly['value']:.0f} mm in 30 days vs {anomaly['expected']:.0f} mm normal"
+            else:
+                detail = f"peak {anomaly['value']:.1f}°C, {anomaly['departure']:+.1f}°C vs normal"
+            period = anomaly['start'] if anomaly['days'] == 1 else f"{anomaly['start']} to {anomaly['end']}"
+            lines.append(f"⚠️ {labels.get(anomaly['type'], anomaly['type'])} ({period}): {detail}")
+        return "\n".join(lines)
+    
+    def _weather_loading_response(self, intent: str) -> Dict[str, Any]:
+        """Reply used while the Indian weather dataset is still loading"""
+        return {
+            "message": "I'm still loading the latest Indian weather data. Please ask me again in a few seconds!",
+            "intent": intent,
+            "suggestions": ["Tips to reduce my carbon footprint", "What causes climate change?"]
+        }
+    
     def _handle_comparison(self, entities: Dict[str, Any]) -> Dict[str, Any]:
         """Handle city comparison queries"""
         city1 = entities.get('city1', 'Mumbai')
         city2 = entities.get('city2', 'Delhi')
         
         try:
-            if not indian_weather_service.processed_data:
-                indian_weather_service.initialize()
+            # Weather data loads in the background; never block a chat reply on it
+            if not indian_weather_service.is_ready:
+                indian_weather_service.start_background_initialize()
+                return self._weather_loading_response("comparison")
             
             data1 = indian_weather_service.get_city_weather(city1)
             data2 = indian_weather_service.get_city_weather(city2)
@@ -1,6 +1,6 @@
 import aiohttp
 import asyncio
-import pandas as pd
+import numpy as np
 from typing import Dict, List, Optional
 import os
 from datetime import datetime, timedelta
@@ -9,15 +9,106 @@ import structlog
 
 logger = structlog.get_logger()
 
+# NASA POWER marks missing observations with this sentinel
+NASA_FILL_VALUE = -999.0
+
+# Client timeouts (seconds): NASA POWER's daily point API is slow to answer
+NASA_POWER_TIMEOUT_SECONDS = 30
+OPENWEATHER_TIMEOUT_SECONDS = 10
+
+
+class ClimateSeries:
+    """Columnar view of a daily climate series: one float array per parameter over a shared date index"""
+
+    def __init__(self, dates: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.dates = dates
+        self.columns = columns
+
+    @property
+    def empty(self) -> bool:
+        return len(self.dates) == 0 or not self.columns
+
+    def summary(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Min, max, mean and linear trend (units per day) for each parameter, ignoring missing values"""
+        stats = {}
+        x = np.arange(len(self.dates), dtype=float)
+
+        for param, values in self.columns.items():
+            valid = ~np.isnan(values)
+            count = int(valid.sum())
+            if count == 0:
+                stats[param] = {"min": None, "max": None, "mean": None, "trend": None}
+                continue
+
+            v = values[valid]
+            trend = None
+            if count > 1:
+                xv = x[valid]
+                xc = xv - xv.mean()
+                denom = float(np.dot(xc, xc))
+                trend = round(float(np.dot(xc, v - v.mean()) / denom), 4) if denom else 0.0
+
+            stats[param] = {
+                "min": round(float(v.min()), 2),
+                "max": round(float(v.max()), 2),
+                "mean": round(float(v.mean()), 2),
+                "trend": trend
+            }
+
+        return stats
+
+    def to_dict(self) -> Dict:
+        """JSON-ready representation; missing values become None"""
+        return {
+            "dates": [str(d) for d in self.dates],
+            "parameters": {
+                param: [None if np.isnan(v) else round(float(v), 2) for v in values]
+                for param, values in self.columns.items()
+            },
+            "statistics": self.summary()
+        }
+
+    def to_dataframe(self):
+        """Pandas view for offline analysis; pandas is only imported when this is called"""
+        import pandas as pd
+
+        return pd.DataFrame(self.columns, index=pd.to_datetime(self.dates, format='%Y%m%d'))
+
+
+DEFAULT_NASA_POWER_BASE_URL = "https://power.larc.nasa.gov"
+DEFAULT_OPENWEATHER_BASE_URL = "http://api.openweathermap.org"
+
+
 class ClimateDataIntegrator:
-    def __init__(self):
+    def __init__(self, nasa_base_url: Optional[str] = None, openweather_base_url: Optional[str] = None):
         self.nasa_api_key = os.getenv('NASA_API_KEY')
         self.noaa_api_key = os.getenv('NOAA_API_KEY')
         self.openweather_api_key = os.getenv('OPENWEATHER_API_KEY')
         
+        # Base URLs are configurable so load tests can point at upstream_simulator.py
+        self.nasa_base_url = (
+            nasa_base_url or os.getenv('NASA_POWER_BASE_URL') or DEFAULT_NASA_POWER_BASE_URL
+        ).rstrip('/')
+        self.openweather_base_url = (
+            openweather_base_url or os.getenv('OPENWEATHER_BASE_URL') or DEFAULT_OPENWEATHER_BASE_URL
+        ).rstrip('/')
+        
+        # Upstream call outcomes per source: requests, errors, fallbacks (mock data served)
+        self.upstream_stats = {
+            source: {"requests": 0, "errors": 0, "fallbacks": 0}
+            for source in ("nasa_power", "air_pollution", "forecast", "current_weather")
+        }
+    
+    def _record_upstream(self, source: str, outcome: str):
+        self.upstream_stats[source][outcome] += 1
+    
+    def get_upstream_stats(self) -> Dict[str, Dict[str, int]]:
+        """Copy of upstream request/error/fallback counters"""
+        return {source: dict(counts) for source, counts in self.upstream_stats.items()}
+        
     async def get_nasa_satellite_data(self, lat: float, lon: float, start_date: str, end_date: str) -> Dict:
         """Fetch NASA satellite data for given coordinates and date range"""
-        base_url = "https://power.larc.nasa.gov/api/temporal/daily/point"
+        base_url = f"{self.nasa_base_url}/api/temporal/daily/point"
         
         params = {
             'parameters': 'T2M,PRECTOTCORR,WS2M,RH2M',  # Temperature, Precipitation, Wind Speed, Humidity
@@ -30,12 +121,15 @@ class ClimateDataIntegrator:
         }
         
         try:
+            self._record_upstream("nasa_power", "requests")
             async with aiohttp.ClientSession() as session:
-                async with session.get(base_url, params=params, timeout=30) as response:
+                async with session.get(base_url, params=params, timeout=NASA_POWER_TIMEOUT_SECONDS) as response:
                     response.raise_for_status()
                     return await response.json()
         except Exception as e:
             logger.error("Error fetching NASA data", error=str(e))
+            self._record_upstream("nasa_power", "errors")
+            self._record_upstream("nasa_power", "fallbacks")
             # Return mock data for development
             return self.get_mock_nasa_data()
     
@@ -43,9 +137,10 @@ class ClimateDataIntegrator:
         """Fetch air quality data from OpenWeatherMap API"""
         if not self.openweather_api_key:
             logger.warning("No OpenWeatherMap API key, using mock data")
+            self._record_upstream("air_pollution", "fallbacks")
             return self.get_mock_air_quality_data()
             
-        base_url = f"http://api.openweathermap.org/data/2.5/air_pollution"
+        base_url = f"{self.openweather_base_url}/data/2.5/air_pollution"
         
         params = {
             'lat': lat,
@@ -54,23 +149,27 @@ class ClimateDataIntegrator:
         }
         
         try:
+            self._record_upstream("air_pollution", "requests")
             async with aiohttp.ClientSession() as session:
-                async with session.get(base_url, params=params, timeout=10) as response:
+                async with session.get(base_url, params=params, timeout=OPENWEATHER_TIMEOUT_SECONDS) as response:
                     response.raise_for_status()
                     data = await response.json()
                     logger.info("Successfully fetched real air quality data", lat=lat, lon=lon)
                     return data
         except Exception as e:
             logger.error("Error fetching air quality data, using mock", error=str(e))
+            self._record_upstream("air_pollution", "errors")
+            self._record_upstream("air_pollution", "fallbacks")
             return self.get_mock_air_quality_data()
     
     async def get_weather_forecast(self, lat: float, lon: float) -> Dict:
         """Fetch weather forecast data"""
         if not self.openweather_api_key:
             logger.warning("No OpenWeatherMap API key, using mock data")
+            self._record_upstream("forecast", "fallbacks")
             return self.get_mock_weather_data()
             
-        base_url = f"http://api.openweathermap.org/data/2.5/forecast"
+        base_url = f"{self.openweather_base_url}/data/2.5/forecast"
         
         params = {
             'lat': lat,
@@ -80,23 +179,27 @@ class ClimateDataIntegrator:
         }
         
         try:
+            self._record_upstream("forecast", "requests")
             async with aiohttp.ClientSession() as session:
-                async with session.get(base_url, params=params, timeout=10) as response:
+                async with session.get(base_url, params=params, timeout=OPENWEATHER_TIMEOUT_SECONDS) as response:
                     response.raise_for_status()
                     data = await response.json()
                     logger.info("Successfully fetched real weather data", lat=lat, lon=lon)
                     return data
         except Exception as e:
             logger.error("Error fetching weather forecast, using mock", error=str(e))
+            self._record_upstream("forecast", "errors")
+            self._record_upstream("forecast", "fallbacks")
             return self.get_mock_weather_data()
 
     async def get_current_weather(self, lat: float, lon: float) -> Dict:
         """Fetch current weather data"""
         if not self.openweather_api_key:
             logger.warning("No OpenWeatherMap API key, using mock data")
+            self._record_upstream("current_weather", "fallbacks")
             return self.get_mock_current_weather()
             
-        base_url = f"http://api.openweathermap.org/data/2.5/weather"
+        base_url = f"{self.openweather_base_url}/data/2.5/weather"
         
         params = {
             'lat': lat,
@@ -106,25 +209,39 @@ class ClimateDataIntegrator:
         }
         
         try:
+            self._record_upstream("current_weather", "requests")
             async with aiohttp.ClientSession() as session:
-                async with session.get(base_url, params=params, timeout=10) as response:
+                async with session.get(base_url, params=params, timeout=OPENWEATHER_TIMEOUT_SECONDS) as response:
                     response.raise_for_status()
                     data = await response.json()
                     logger.info("Successfully fetched current weather", lat=lat, lon=lon, city=data.get('name'))
                     return data
         except Exception as e:
             logger.error("Error fetching current weather, using mock", error=str(e))
+            self._record_upstream("current_weather", "errors")
+            self._record_upstream("current_weather", "fallbacks")
             return self.get_mock_current_weather()
     
-    def process_and_normalize_data(self, raw_data: Dict) -> pd.DataFrame:
-        """Process and normalize different data sources"""
-        processed_data = {}
+    def process_and_normalize_data(self, raw_data: Dict) -> ClimateSeries:
+        """Process and normalize NASA POWER data into a columnar series"""
+        parameters = raw_data.get('properties', {}).get('parameter', {}) if raw_data else {}
+        if not parameters:
+            return ClimateSeries(np.array([], dtype=str), {})
+        
+        # All parameters share the same YYYYMMDD keys; union them in case one is ragged
+        date_keys = sorted(set().union(*(values.keys() for values in parameters.values())))
+        dates = np.array(date_keys)
         
-        if 'properties' in raw_data and 'parameter' in raw_data['properties']:
-            for param, values in raw_data['properties']['parameter'].items():
-                processed_data[param] = list(values.values())
+        columns = {}
+        for param, values in parameters.items():
+            column = np.fromiter(
+                (np.nan if values.get(d) is None else values[d] for d in date_keys),
+                dtype=float, count=len(date_keys)
+            )
+            column[column == NASA_FILL_VALUE] = np.nan
+            columns[param] = column
         
-        return pd.DataFrame(processed_data)
+        return ClimateSeries(dates, columns)
     
     def get_mock_nasa_data(self) -> Dict:
         """Return mock NASA data for development/testing"""
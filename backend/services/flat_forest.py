@@ -0,0 +1,111 @@
+"""
+Flat Forest - sklearn-free inference for the forecast random forests
+
+A fitted RandomForestRegressor is compiled into a handful of flat numpy
+arrays (children, split feature, threshold, leaf value) covering every tree,
+and predicted with a vectorized traversal that advances all rows through all
+trees one depth level per step. The StandardScaler becomes two arrays.
+
+Exported bundles only reference numpy and this module, so serving them does
+not import sklearn, and the arrays are memory-mapped by the model registry.
+"""
+from typing import Any, Dict
+
+import numpy as np
+
+FLAT_FOREST_FORMAT = "flat_forest"
+
+
+class FlatScaler:
+    """StandardScaler.transform as (X - mean) / scale"""
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray):
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        return (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+
+
+class FlatForest:
+    """All trees of a regression forest in shared node arrays.
+
+    Leaves point back to themselves with an infinite threshold, so every row
+    can take exactly max_depth steps without checking which rows are done.
+    """
+
+    def __init__(self, roots: np.ndarray, children: np.ndarray, feature: np.ndarray,
+                 threshold: np.ndarray, value: np.ndarray, max_depth: int):
+        self.roots = roots
+        self.children = children  # (n_nodes, 2): left, right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.max_depth = max_depth
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Mean of the tree outputs, matching RandomForestRegressor.predict"""
+        # sklearn compares float32 features against float64 thresholds
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        flat_children = self.children.ravel()
+        row_offset = (np.arange(n_rows, dtype=np.int64) * n_features)[:, None]
+        node = np.broadcast_to(self.roots, (n_rows, self.n_trees)).astype(np.int64)
+
+        for _ in range(self.max_depth):
+            go_right = flat_X.take(row_offset + self.feature.take(node)) > self.threshold.take(node)
+            node = flat_children.take(2 * node + go_right)
+
+        return self.value.take(node).mean(axis=1)
+
+
+def flatten_forest(forest) -> FlatForest:
+    """Compile a fitted RandomForestRegressor (single output) into a FlatForest"""
+    roots, children, features, thresholds, values = [], [], [], [], []
+    offset, max_depth = 0, 0
+
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        is_leaf = tree.children_left < 0
+        own_index = np.arange(tree.node_count) + offset
+        roots.append(offset)
+        children.append(np.column_stack([
+            np.where(is_leaf, own_index, tree.children_left + offset),
+            np.where(is_leaf, own_index, tree.children_right + offset),
+        ]))
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+        values.append(tree.value[:, 0, 0])
+        offset += tree.node_count
+        max_depth = max(max_depth, tree.max_depth)
+
+    index_dtype = np.int32 if offset < 2 ** 31 else np.int64
+    return FlatForest(
+        roots=np.asarray(roots, dtype=index_dtype),
+        children=np.concatenate(children).astype(index_dtype),
+        feature=np.concatenate(features).astype(np.int32),
+        threshold=np.concatenate(thresholds).astype(np.float64),
+        value=np.concatenate(values).astype(np.float64),
+        max_depth=int(max_depth),
+    )
+
+
+def export_forecast_bundle(bundle: Dict[str, Any]) -> Dict[str, Any]:
+    """Serving bundle with every forest flattened and the scaler reduced to arrays"""
+    scaler = bundle["scaler"]
+    exported = {
+        **bundle,
+        "format": FLAT_FOREST_FORMAT,
+        "models": {target: flatten_forest(model) for target, model in bundle["models"].items()},
+        "scaler": FlatScaler(scaler.mean_, scaler.scale_),
+    }
+    return exported
+
+
+def is_flat_bundle(bundle: Dict[str, Any]) -> bool:
+    return bundle.get("format") == FLAT_FOREST_FORMAT
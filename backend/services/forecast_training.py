@@ -0,0 +1,280 @@
+"""
+Forecast Training - builds climate forecast models from the Indian weather dataset
+
+Each training row describes one city on one issue date: its location, the
+recent weather (lags and rolling windows computed per city with vectorized
+groupby operations) and how many days ahead the target lies. One random
+forest per target (temperature, humidity, rainfall) is fitted on all cores.
+
+The resulting bundle is what MLService serves:
+
+    {
+        "models": {target: estimator},
+        "scaler": StandardScaler,
+        "feature_names": [...],
+        "feature_defaults": {feature: dataset mean},
+        "station_state": {"coords": [[lat, lon]], "as_of": [...], "features": [...], "values": [[...]]}
+    }
+
+station_state holds each city's latest recent-weather features and their date
+(as_of) so that a forecast for a nearby location starts from observed
+conditions; serving counts horizon_days from as_of, not from today.
+"""
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+TARGETS = {
+    "temperature": "Temperature",
+    "humidity": "Humidity",
+    "rainfall": "Rainfall",
+}
+
+# Days ahead sampled for training; trees interpolate step-wise in between
+TRAINING_HORIZONS = (1, 2, 3, 5, 7, 10, 14, 21, 30)
+
+LOCATION_FEATURES = ["latitude", "longitude", "horizon_days", "target_doy_sin", "target_doy_cos"]
+STATE_FEATURES = [
+    "temperature_last", "temperature_lag7", "temperature_mean7", "temperature_mean30",
+    "humidity_last", "humidity_mean7",
+    "rainfall_sum7", "rainfall_sum30",
+]
+FEATURE_NAMES = LOCATION_FEATURES + STATE_FEATURES
+
+# Column names seen in public Indian weather CSVs, mapped to the service's names
+COLUMN_ALIASES = {
+    "date": "Date", "date_time": "Date", "datetime": "Date",
+    "city": "City", "location": "City",
+    "state": "State",
+    "temperature": "Temperature", "temp": "Temperature", "tavg": "Temperature", "avg_temp": "Temperature",
+    "humidity": "Humidity", "rh": "Humidity",
+    "rainfall": "Rainfall", "precipitation": "Rainfall", "prcp": "Rainfall", "rain": "Rainfall",
+    "latitude": "Latitude", "lat": "Latitude",
+    "longitude": "Longitude", "lon": "Longitude", "lng": "Longitude",
+}
+
+
+def normalize_dataset(df, cities: Dict[str, Dict[str, float]]):
+    """Rename known column variants, fill coordinates from the city table, one row per city-day"""
+    import pandas as pd
+
+    df = df.rename(columns={c: COLUMN_ALIASES[c.strip().lower()] for c in df.columns
+                            if c.strip().lower() in COLUMN_ALIASES})
+    missing = {"Date", "City", "Temperature"} - set(df.columns)
+    if missing:
+        raise ValueError(f"Dataset is missing required columns: {sorted(missing)}")
+
+    df = df.copy()
+    df["Date"] = pd.to_datetime(df["Date"]).dt.normalize()
+    # The weather store serves City as a categorical; plain strings keep groupby to observed cities
+    df["City"] = df["City"].astype(str)
+    for column in ("Humidity", "Rainfall"):
+        if column not in df.columns:
+            df[column] = np.nan
+
+    lookup = {name.lower(): info for name, info in cities.items()}
+    city_key = df["City"].astype(str).str.lower()
+    for column, key in (("Latitude", "lat"), ("Longitude", "lon")):
+        known = city_key.map(lambda c: lookup.get(c, {}).get(key, np.nan))
+        df[column] = df[column].fillna(known) if column in df.columns else known
+
+    df = df.dropna(subset=["Latitude", "Longitude", "Temperature"])
+    # Several readings per city-day collapse to one daily value
+    df = (df.groupby(["City", "Date"], as_index=False)
+            .agg(Latitude=("Latitude", "first"), Longitude=("Longitude", "first"),
+                 Temperature=("Temperature", "mean"), Humidity=("Humidity", "mean"),
+                 Rainfall=("Rainfall", "sum"), rainfall_readings=("Rainfall", "count")))
+    # A day without any rainfall reading is unknown, not dry
+    df["Rainfall"] = df["Rainfall"].where(df.pop("rainfall_readings") > 0)
+    return daily_rows(df)
+
+
+def daily_rows(df):
+    """One row per city per calendar day between its first and last reading; missing
+    days are NaN, so shifts and rolling windows count days rather than records"""
+    columns = ["Latitude", "Longitude", "Temperature", "Humidity", "Rainfall"]
+    df = (df.set_index("Date").groupby("City", sort=True)[columns]
+            .resample("D").asfreq()
+            .reset_index())
+    df[["Latitude", "Longitude"]] = df.groupby("City", sort=False)[["Latitude", "Longitude"]].ffill()
+    return df[["City", "Date"] + columns]
+
+
+def build_state_features(df):
+    """Recent-weather features per city and day (lags and rolling windows)"""
+    import pandas as pd
+
+    by_city = df.groupby("City", sort=False)
+
+    def rolling(column: str, window: int, how: str):
+        roll = by_city[column].rolling(window, min_periods=1)
+        values = roll.mean() if how == "mean" else roll.sum()
+        return values.reset_index(level=0, drop=True)
+
+    state = pd.DataFrame(index=df.index)
+    state["temperature_last"] = df["Temperature"]
+    state["temperature_lag7"] = by_city["Temperature"].shift(7)
+    state["temperature_mean7"] = rolling("Temperature", 7, "mean")
+    state["temperature_mean30"] = rolling("Temperature", 30, "mean")
+    state["humidity_last"] = df["Humidity"]
+    state["humidity_mean7"] = rolling("Humidity", 7, "mean")
+    state["rainfall_sum7"] = rolling("Rainfall", 7, "sum")
+    state["rainfall_sum30"] = rolling("Rainfall", 30, "sum")
+    return state[STATE_FEATURES]
+
+
+def build_training_set(df, horizons=TRAINING_HORIZONS) -> Tuple[np.ndarray, Dict[str, np.ndarray], np.ndarray]:
+    """Feature matrix, per-target labels and issue dates for every (city, day, horizon)"""
+    state = build_state_features(df)
+    by_city = df.groupby("City", sort=False)
+
+    blocks, labels, issued = [], {target: [] for target in TARGETS}, []
+    # Issue rows are observed days; the days filled in between readings only carry NaN
+    observed = df["Temperature"].notna().to_numpy()
+    for horizon in horizons:
+        target_date = df["Date"] + np.timedelta64(horizon, "D")
+        # Rows are daily, so the city's row `horizon` rows later is the target day if it exists
+        future_date = by_city["Date"].shift(-horizon)
+        valid = (future_date == target_date).to_numpy() & observed
+        if not valid.any():
+            continue
+
+        doy = target_date.dt.dayofyear.to_numpy()[valid]
+        block = np.column_stack([
+            df["Latitude"].to_numpy()[valid],
+            df["Longitude"].to_numpy()[valid],
+            np.full(valid.sum(), horizon),
+            np.sin(2 * np.pi * doy / 365.25),
+            np.cos(2 * np.pi * doy / 365.25),
+            state.to_numpy()[valid],
+        ])
+        blocks.append(block)
+        issued.append(df["Date"].to_numpy()[valid])
+        for target, column in TARGETS.items():
+            labels[target].append(by_city[column].shift(-horizon).to_numpy()[valid])
+
+    if not blocks:
+        raise ValueError("Dataset has no consecutive daily records to learn from")
+
+    X = np.vstack(blocks).astype(np.float64)
+    y = {target: np.concatenate(parts).astype(np.float64) for target, parts in labels.items()}
+    return X, y, np.concatenate(issued)
+
+
+def latest_station_state(df) -> Dict[str, Any]:
+    """Each city's coordinates and most recent state features"""
+    state = build_state_features(df)
+    last_rows = df.groupby("City", sort=False).tail(1).index
+    values = state.loc[last_rows]
+    return {
+        "cities": df.loc[last_rows, "City"].tolist(),
+        "as_of": df.loc[last_rows, "Date"].dt.strftime("%Y-%m-%d").tolist(),
+        "coords": df.loc[last_rows, ["Latitude", "Longitude"]].to_numpy(dtype=float).tolist(),
+        "features": STATE_FEATURES,
+        "values": values.to_numpy(dtype=float).tolist(),
+        # Beyond this lead from as_of the model never saw a state predict a target
+        "max_horizon_days": max(TRAINING_HORIZONS),
+    }
+
+
+def train_forecast_bundle(df, n_estimators: int = 100, max_depth: Optional[int] = 16,
+                          n_jobs: int = -1, holdout_fraction: float = 0.2,
+                          random_state: int = 42) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Fit one forest per target; returns the serving bundle and training metadata"""
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+
+    started = time.perf_counter()
+    X, y, issued = build_training_set(df)
+    # Dataset means, or 0 for a feature the dataset never observes (e.g. no rainfall column)
+    seen = ~np.isnan(X)
+    means = np.where(seen, X, 0.0).sum(axis=0) / np.maximum(seen.sum(axis=0), 1)
+    feature_defaults = {name: float(value) for name, value in zip(FEATURE_NAMES, means)}
+    X = np.where(np.isnan(X), np.array([feature_defaults[n] for n in FEATURE_NAMES]), X)
+
+    # Time-based holdout: evaluate on the most recent issue dates
+    cutoff = np.quantile(issued.astype("datetime64[D]").astype(np.int64), 1 - holdout_fraction)
+    is_train = issued.astype("datetime64[D]").astype(np.int64) <= cutoff
+
+    scaler = StandardScaler().fit(X[is_train])
+    X_train, X_test = scaler.transform(X[is_train]), scaler.transform(X[~is_train])
+    last_column = {"temperature": "temperature_last", "humidity": "humidity_last"}
+
+    models, evaluation = {}, {}
+    for target, labels in y.items():
+        has_label = ~np.isnan(labels)
+        train_rows, test_rows = is_train & has_label, ~is_train & has_label
+        if not has_label.any():
+            logger.warning("Skipping target the dataset does not observe", target=target)
+            continue
+        if train_rows.sum() < 50:
+            logger.warning("Skipping target with too few labels", target=target, rows=int(train_rows.sum()))
+            continue
+
+        model = RandomForestRegressor(
+            n_estimators=n_estimators,
+            max_depth=max_depth,
+            min_samples_leaf=5,
+            n_jobs=n_jobs,
+            random_state=random_state,
+        )
+        model.fit(X_train[has_label[is_train]], labels[train_rows])
+
+        # Fit on everything once evaluated so the served model sees the latest season
+        metrics = {"train_rows": int(train_rows.sum()), "test_rows": int(test_rows.sum())}
+        if test_rows.any():
+            predicted = model.predict(X_test[has_label[~is_train]])
+            metrics["mae"] = round(float(np.mean(np.abs(predicted - labels[test_rows]))), 3)
+            if target in last_column:
+                persistence = X[test_rows, FEATURE_NAMES.index(last_column[target])]
+                metrics["persistence_mae"] = round(float(np.mean(np.abs(persistence - labels[test_rows]))), 3)
+            model.fit(scaler.transform(X[has_label]), labels[has_label])
+
+        models[target] = model
+        evaluation[target] = metrics
+        logger.info("Trained forecast target", target=target, **metrics)
+
+    if "temperature" not in models:
+        raise ValueError("Not enough temperature data to train a forecast model")
+
+    bundle = {
+        "models": models,
+        "scaler": scaler,
+        "feature_names": FEATURE_NAMES,
+        "feature_defaults": feature_defaults,
+        "station_state": latest_station_state(df),
+    }
+    metadata = {
+        "source": "indian_weather_dataset",
+        "model_type": "RandomForestRegressor",
+        "features": FEATURE_NAMES,
+        "targets": sorted(models),
+        "rows": int(len(X)),
+        "cities": int(df["City"].nunique()),
+        "data_start": df["Date"].min().strftime("%Y-%m-%d"),
+        "data_end": df["Date"].max().strftime("%Y-%m-%d"),
+        "horizons": list(TRAINING_HORIZONS),
+        "hyperparameters": {"n_estimators": n_estimators, "max_depth": max_depth, "min_samples_leaf": 5},
+        "evaluation": evaluation,
+        "training_seconds": round(time.perf_counter() - started, 1),
+    }
+    return bundle, metadata
+
+
+def load_indian_weather_frame(csv_path: Optional[str] = None):
+    """The dataset IndianWeatherService uses (Kaggle download, else its mock data), or a CSV"""
+    import pandas as pd
+    from services.indian_weather_service import IndianWeatherService
+
+    service = IndianWeatherService()
+    if csv_path:
+        frame = pd.read_csv(csv_path)
+    else:
+        service.download_dataset()
+        service.load_and_process_data()
+        frame = service.weather_data
+    return normalize_dataset(frame, service.indian_cities)
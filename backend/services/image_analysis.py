@@ -0,0 +1,291 @@
+"""
+Image Analysis - CPU-bound environmental image scoring in a process pool
+
+Decoding (PIL) and colour masking (OpenCV) hold the GIL for tens to hundreds
+of milliseconds on large photos, so they run in worker processes instead of
+on the event loop. Upload bytes are handed over through shared memory rather
+than pickled through the pool's pipe, and the number of analyses in flight
+is bounded so overload is answered with 429 instead of an unbounded queue.
+
+Images are downscaled before any pixel work: JPEGs are decoded at reduced
+resolution with PIL's draft mode, and colour analysis runs on at most
+ANALYSIS_MAX_SIZE pixels per side, so a 12 MP photo costs milliseconds.
+prepare_upload decodes once and derives the upload, thumbnail and dHash
+from that single buffer; the analysis of an upload still goes through the pool.
+"""
+import asyncio
+import base64
+import io
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+# HSV ranges for environmental features
+GREEN_LOWER = np.array([35, 40, 40])
+GREEN_UPPER = np.array([85, 255, 255])
+BLUE_LOWER = np.array([100, 50, 50])
+BLUE_UPPER = np.array([130, 255, 255])
+
+# Colour coverage is a ratio, so it is stable well below full resolution
+ANALYSIS_MAX_SIZE = 384
+UPLOAD_MAX_SIZE = 1920
+THUMBNAIL_MAX_SIZE = 256
+
+
+class ImageAnalysisBusy(Exception):
+    """Raised when the pool already has its maximum number of analyses in flight"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Image analysis queue is full")
+        self.retry_after = retry_after
+
+
+def analyze_image_colors(image_array: np.ndarray) -> Dict[str, Any]:
+    """Analyze image based on color distribution (simplified approach)"""
+    import cv2
+
+    # Convert to HSV for better color analysis
+    if len(image_array.shape) == 3:
+        hsv = cv2.cvtColor(image_array, cv2.COLOR_RGB2HSV)
+    else:
+        hsv = image_array
+
+    # Calculate color percentages
+    green_mask = cv2.inRange(hsv, GREEN_LOWER, GREEN_UPPER)
+    blue_mask = cv2.inRange(hsv, BLUE_LOWER, BLUE_UPPER)
+
+    total_pixels = image_array.shape[0] * image_array.shape[1]
+    green_percentage = float(np.count_nonzero(green_mask)) / total_pixels
+    blue_percentage = float(np.count_nonzero(blue_mask)) / total_pixels
+
+    # Generate analysis based on color distribution
+    objects = []
+    if green_percentage > 0.1:
+        objects.append({
+            "object": "vegetation",
+            "confidence": min(0.9, green_percentage * 3),
+            "bbox": [0, 0, image_array.shape[1], image_array.shape[0]]
+        })
+
+    if blue_percentage > 0.05:
+        objects.append({
+            "object": "sky",
+            "confidence": min(0.8, blue_percentage * 4),
+            "bbox": [0, 0, image_array.shape[1], int(image_array.shape[0] * 0.6)]
+        })
+
+    # Calculate environmental score
+    environmental_score = (
+        green_percentage * 4 +  # Vegetation weight
+        blue_percentage * 2 +   # Sky weight
+        (1 - max(green_percentage + blue_percentage, 1)) * 1  # Urban penalty
+    ) * 10
+
+    environmental_score = max(1, min(10, environmental_score))
+
+    recommendations = []
+    if green_percentage > 0.3:
+        recommendations.append("Great natural environment with abundant vegetation!")
+    if blue_percentage > 0.2:
+        recommendations.append("Clear sky indicates good air quality conditions.")
+    if environmental_score > 7:
+        recommendations.append("This location shows excellent environmental conditions.")
+
+    return {
+        "objects": objects,
+        "features": {
+            "vegetation_coverage": round(green_percentage, 2),
+            "sky_visibility": round(blue_percentage, 2),
+            "dominant_colors": ["green", "blue"] if green_percentage > 0.1 else ["urban"]
+        },
+        "vegetation_confidence": min(0.9, green_percentage * 2),
+        "air_quality_confidence": min(0.8, blue_percentage * 3),
+        "environmental_score": round(environmental_score, 1),
+        "recommendations": recommendations
+    }
+
+
+def decode_image(image_data: bytes, max_size: int, resample: Optional[int] = None):
+    """Decode to an RGB image no larger than max_size on either side.
+
+    draft() lets the JPEG decoder skip straight to a 1/2, 1/4 or 1/8 scale
+    that still covers the target size, so full-resolution pixels are never
+    materialised; thumbnail() then does the remaining exact downscale.
+    """
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(image_data))
+    if image.format == "JPEG":
+        ratio = min(1.0, max_size / max(image.size))
+        image.draft("RGB", (max(1, int(image.width * ratio)), max(1, int(image.height * ratio))))
+
+    # Flatten transparency onto white
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        image = background
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+
+    if image.width > max_size or image.height > max_size:
+        image.thumbnail((max_size, max_size), resample or Image.Resampling.LANCZOS, reducing_gap=2.0)
+    return image
+
+
+def _downscaled(image, max_size: int):
+    """Copy of an already-decoded image shrunk to max_size (or the image itself)"""
+    from PIL import Image
+
+    if image.width <= max_size and image.height <= max_size:
+        return image
+    smaller = image.copy()
+    smaller.thumbnail((max_size, max_size), Image.Resampling.BILINEAR, reducing_gap=2.0)
+    return smaller
+
+
+def encode_jpeg(image, quality: int = 85) -> bytes:
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=quality, optimize=True)
+    return output.getvalue()
+
+
+def build_analysis(image) -> Dict[str, Any]:
+    """Environmental analysis response for a decoded image"""
+    analysis = analyze_image_colors(np.asarray(_downscaled(image, ANALYSIS_MAX_SIZE)))
+
+    return {
+        "detected_objects": analysis["objects"],
+        "environmental_features": analysis["features"],
+        "confidence_scores": {
+            "overall": 0.78,
+            "vegetation": analysis["vegetation_confidence"],
+            "air_quality": analysis["air_quality_confidence"]
+        },
+        "environmental_score": analysis["environmental_score"],
+        "recommendations": analysis["recommendations"]
+    }
+
+
+def analyze_image_bytes(image_data: bytes) -> Dict[str, Any]:
+    """Decode an image at analysis resolution and build the environmental analysis"""
+    from PIL import Image
+
+    return build_analysis(decode_image(image_data, ANALYSIS_MAX_SIZE, Image.Resampling.BILINEAR))
+
+
+def prepare_upload(image_data: bytes, max_size: int = UPLOAD_MAX_SIZE) -> Dict[str, Any]:
+    """Decode once and derive the optimized upload, a thumbnail and its dHash"""
+    from services.image_index import dhash
+
+    image = decode_image(image_data, max_size)
+    thumbnail = _downscaled(image, THUMBNAIL_MAX_SIZE)
+
+    return {
+        "image": encode_jpeg(image, quality=85),
+        "width": image.width,
+        "height": image.height,
+        "thumbnail": "data:image/jpeg;base64," + base64.b64encode(encode_jpeg(thumbnail, quality=70)).decode("ascii"),
+        "dhash": dhash(thumbnail)
+    }
+
+
+def _analyze_shared(shm_name: str, size: int) -> Dict[str, Any]:
+    """Worker entry point: read the upload from shared memory and analyze it"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        image_data = bytes(shm.buf[:size])
+    finally:
+        shm.close()
+    return analyze_image_bytes(image_data)
+
+
+class ImageAnalysisPool:
+    """Bounded process pool for image analysis with throughput/queue metrics"""
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self._started_at = time.monotonic()
+        self.metrics = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "peak_in_flight": 0,
+            "busy_seconds": 0.0
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info("Image analysis pool started", workers=self.max_workers)
+        return self._executor
+
+    def _retry_after(self) -> int:
+        """Rough seconds until a slot frees up, from the observed mean duration"""
+        completed = self.metrics["completed"] + self.metrics["failed"]
+        mean = self.metrics["busy_seconds"] / completed if completed else 1.0
+        return max(1, int(np.ceil(mean * self._in_flight / self.max_workers)))
+
+    async def analyze(self, image_data: bytes) -> Dict[str, Any]:
+        """Run analyze_image_bytes in a worker; raises ImageAnalysisBusy when saturated"""
+        if self._in_flight >= self.max_pending:
+            self.metrics["rejected"] += 1
+            raise ImageAnalysisBusy(self._retry_after())
+
+        self._in_flight += 1
+        self.metrics["submitted"] += 1
+        self.metrics["peak_in_flight"] = max(self.metrics["peak_in_flight"], self._in_flight)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(1, len(image_data)))
+        started = time.perf_counter()
+        try:
+            shm.buf[:len(image_data)] = image_data
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._get_executor(), _analyze_shared, shm.name, len(image_data)
+            )
+            self.metrics["completed"] += 1
+            return result
+        except Exception:
+            self.metrics["failed"] += 1
+            raise
+        finally:
+            self.metrics["busy_seconds"] += time.perf_counter() - started
+            self._in_flight -= 1
+            shm.close()
+            shm.unlink()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        uptime = time.monotonic() - self._started_at
+        finished = self.metrics["completed"] + self.metrics["failed"]
+        return {
+            **self.metrics,
+            "busy_seconds": round(self.metrics["busy_seconds"], 3),
+            "in_flight": self._in_flight,
+            "queued": max(0, self._in_flight - self.max_workers),
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "mean_latency_ms": round(self.metrics["busy_seconds"] / finished * 1000, 1) if finished else None,
+            "throughput_per_minute": round(self.metrics["completed"] / uptime * 60, 2) if uptime else 0.0,
+            "pool_started": self._executor is not None
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,166 @@
+"""
+Image Index - reuse analyses of identical or near-identical uploads
+
+Each analyzed image is recorded under its SHA-256 (byte-identical re-uploads)
+and a 64-bit difference hash (dHash) that survives re-encoding, resizing and
+small edits, so the same photo posted twice is only analyzed once. The index
+is an LRU bounded to max_entries and is persisted as JSON between restarts.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+# Hamming distance (of 64 bits) at or below which two images count as the same photo
+DEFAULT_MAX_DISTANCE = 6
+
+# Persist after this many new entries (and on shutdown)
+SAVE_EVERY = 20
+
+
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def dhash(image, hash_size: int = 8) -> int:
+    """Difference hash: sign of horizontal gradients on a (hash_size+1) x hash_size grayscale"""
+    from PIL import Image
+
+    small = image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).ravel()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def image_dhash(image_data: bytes) -> int:
+    """dHash straight from upload bytes, decoding at a fraction of full resolution"""
+    from PIL import Image
+    from services.image_analysis import decode_image
+
+    return dhash(decode_image(image_data, 64, Image.Resampling.BILINEAR))
+
+
+class ImageAnalysisIndex:
+    """LRU of analysis results addressable by exact SHA-256 or nearest dHash"""
+
+    def __init__(self, path: Optional[Path] = None, max_entries: int = 5000,
+                 max_distance: int = DEFAULT_MAX_DISTANCE):
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._hash_keys = []
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._hashes_stale = False
+        self._unsaved = 0
+        # Lookups also run from upload threadpool workers
+        self._lock = threading.RLock()
+        self.stats = {"exact_hits": 0, "near_hits": 0, "misses": 0}
+        self.load()
+
+    def _rebuild_hashes(self):
+        self._hash_keys = list(self._entries)
+        self._hashes = np.fromiter(
+            (self._entries[k]["dhash"] for k in self._hash_keys), dtype=np.uint64, count=len(self._hash_keys)
+        )
+        self._hashes_stale = False
+
+    def _touch(self, key: str) -> Dict[str, Any]:
+        self._entries.move_to_end(key)
+        return self._entries[key]["analysis"]
+
+    def get_exact(self, sha256: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if sha256 in self._entries:
+                self.stats["exact_hits"] += 1
+                return self._touch(sha256)
+            return None
+
+    def get_similar(self, image_hash: int) -> Optional[Dict[str, Any]]:
+        """Analysis of the closest indexed image within max_distance bits, if any"""
+        with self._lock:
+            if not self._entries:
+                self.stats["misses"] += 1
+                return None
+            if self._hashes_stale:
+                self._rebuild_hashes()
+
+            xor = self._hashes ^ np.uint64(image_hash)
+            distances = np.unpackbits(xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+            best = int(distances.argmin())
+            if distances[best] > self.max_distance:
+                self.stats["misses"] += 1
+                return None
+
+            self.stats["near_hits"] += 1
+            return self._touch(self._hash_keys[best])
+
+    def add(self, sha256: str, image_hash: int, analysis: Dict[str, Any]):
+        with self._lock:
+            self._entries[sha256] = {"dhash": int(image_hash), "analysis": analysis, "added_at": time.time()}
+            self._entries.move_to_end(sha256)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._hashes_stale = True
+            self._unsaved += 1
+            should_save = self._unsaved >= SAVE_EVERY
+
+        if should_save:
+            self.save()
+
+    def load(self):
+        if not self.path or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+            for record in records[-self.max_entries:]:
+                self._entries[record["sha256"]] = {
+                    "dhash": int(record["dhash"], 16),
+                    "analysis": record["analysis"],
+                    "added_at": record.get("added_at", 0)
+                }
+            self._hashes_stale = True
+            logger.info("Loaded image analysis index", entries=len(self._entries))
+        except Exception as e:
+            logger.error("Failed to load image analysis index", path=str(self.path), error=str(e))
+
+    def save(self):
+        """Write entries oldest-first so a reload restores the LRU order"""
+        if not self.path:
+            return
+        with self._lock:
+            records = [
+                {"sha256": key, "dhash": f"{entry['dhash']:016x}", "analysis": entry["analysis"],
+                 "added_at": entry["added_at"]}
+                for key, entry in self._entries.items()
+            ]
+            self._unsaved = 0
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(records, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error("Failed to save image analysis index", path=str(self.path), error=str(e))
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = sum(self.stats.values())
+        hits = self.stats["exact_hits"] + self.stats["near_hits"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hit_rate": round(hits / lookups, 3) if lookups else None
+        }
@@ -1,21 +1,113 @@
-import kagglehub
 import pandas as pd
 import numpy as np
 import os
 import json
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+import threading
+import time
+from typing import Dict, List, Any, Optional, Tuple
+from pathlib import Path
 import logging
 
+from core.config import settings
+from services.station_index import StationIndex, idw_interpolate
+from services.synthetic_weather import generate_weather
+from services.weather_anomalies import AnomalyTable, RECENT_DAYS
+from services.weather_aggregates import WeatherSummary, as_float
+from services.weather_store import WeatherStore, sort_by_city_and_date
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Coordinates farther than this from every dataset city get no Indian station context
+STATION_MAX_KM = 300
+
+class WeatherSnapshot:
+    """One consistent version of the served weather data.
+
+    The frame, its per-city row ranges, the summaries built from it, rows
+    appended since and the anomaly table belong together. A published snapshot
+    is never modified: reloads and appends build a new one and swap it in
+    whole, so a reader that takes service.snapshot once sees matching parts.
+    """
+
+    def __init__(self, weather_data: Optional[pd.DataFrame] = None, city_index: Optional[Dict] = None,
+                 summary: Optional[WeatherSummary] = None, appended_data: Optional[pd.DataFrame] = None,
+                 processed_data: Optional[Dict[str, Any]] = None, station_index: Optional[StationIndex] = None,
+                 store: Optional[WeatherStore] = None, anomalies: Optional[AnomalyTable] = None,
+                 version: int = 0):
+        self.weather_data = weather_data
+        # lowercase city -> its row range in weather_data
+        self.city_index = city_index or {}
+        # Mergeable per-city/state/month statistics behind processed_data
+        self.summary = summary
+        # Rows added by append_observations since the dataset was loaded
+        self.appended_data = appended_data
+        self.processed_data = processed_data or {}
+        # Nearest-city search over the dataset's cities
+        self.station_index = station_index or StationIndex([], [], [])
+        # Mapped store weather_data was read from (None for mock data or an unconverted CSV)
+        self.store = store
+        # Anomaly spells detected against per-city seasonal baselines (see weather_anomalies)
+        self.anomalies = anomalies
+        # Bumped whenever the served data changes (keys query result caches)
+        self.version = version
+
+    def replace(self, **changes) -> "WeatherSnapshot":
+        return WeatherSnapshot(**{**vars(self), **changes})
+
 class IndianWeatherService:
     def __init__(self):
         self.dataset_path = None
-        self.weather_data = None
-        self.processed_data = {}
         self.indian_cities = self._get_indian_cities()
+        self.store_path = Path(settings.INDIAN_WEATHER_STORE_PATH)
+        self.anomaly_path = Path(settings.INDIAN_WEATHER_ANOMALY_PATH)
+        # Everything served comes from one snapshot; _data_lock serializes replacing it
+        self.snapshot = WeatherSnapshot()
+        self._data_lock = threading.Lock()
+        # Background initialization: one loader thread at a time, readable state for routes
+        self._init_lock = threading.Lock()
+        self._init_thread = None
+        self.init_state = 'idle'  # idle -> loading -> ready | failed
+        self.init_error = None
+        self.init_started_at = None
+        self.ready_at = None
+
+    # Parts of the current snapshot; take self.snapshot once to read several consistently
+    @property
+    def weather_data(self) -> Optional[pd.DataFrame]:
+        return self.snapshot.weather_data
+
+    @property
+    def city_index(self) -> Dict[str, Dict[str, Any]]:
+        return self.snapshot.city_index
+
+    @property
+    def summary(self) -> Optional[WeatherSummary]:
+        return self.snapshot.summary
+
+    @property
+    def appended_data(self) -> Optional[pd.DataFrame]:
+        return self.snapshot.appended_data
+
+    @property
+    def processed_data(self) -> Dict[str, Any]:
+        return self.snapshot.processed_data
+
+    @property
+    def station_index(self) -> StationIndex:
+        return self.snapshot.station_index
+
+    @property
+    def store(self) -> Optional[WeatherStore]:
+        return self.snapshot.store
+
+    @property
+    def anomalies(self) -> Optional[AnomalyTable]:
+        return self.snapshot.anomalies
+
+    @property
+    def data_version(self) -> int:
+        return self.snapshot.version
         
     def _get_indian_cities(self) -> Dict[str, Dict[str, float]]:
         """Major Indian cities with their coordinates"""
@@ -43,8 +135,10 @@ class IndianWeatherService:
         }
     
     def download_dataset(self) -> bool:
-        """Download the Indian weather dataset from Kaggle"""
+        """Download the Indian weather dataset from Kaggle (load_and_process_data falls back to mock data)"""
         try:
+            # Optional: without kagglehub the service falls back to mock data
+            import kagglehub
             logger.info("Downloading Indian weather dataset from Kaggle...")
             # Download latest version of the dataset
             self.dataset_path = kagglehub.dataset_download("pratikjadhav05/indian-weather-data")
@@ -52,70 +146,58 @@ class IndianWeatherService:
             return True
         except Exception as e:
             logger.error(f"Failed to download dataset: {e}")
-            # Use fallback mock data if download fails
-            self._create_mock_data()
             return False
     
-    def _create_mock_data(self):
+    def _create_mock_data(self) -> pd.DataFrame:
         """Create mock Indian weather data for development/testing"""
         logger.info("Creating mock Indian weather data...")
         
-        # Generate realistic weather data for Indian cities
-        mock_data = []
-        cities = list(self.indian_cities.keys())
-        
-        # Generate data for the last 365 days
-        base_date = datetime.now() - timedelta(days=365)
-        
-        for i in range(365):
-            current_date = base_date + timedelta(days=i)
-            
-            for city in cities[:10]:  # Use top 10 cities for mock data
-                city_info = self.indian_cities[city]
-                
-                # Simulate seasonal weather patterns for India
-                month = current_date.month
-                
-                # Temperature patterns (India has distinct seasons)
-                if month in [12, 1, 2]:  # Winter
-                    base_temp = np.random.normal(20, 5)  # 15-25°C
-                elif month in [3, 4, 5]:  # Summer  
-                    base_temp = np.random.normal(35, 8)  # 27-43°C
-                elif month in [6, 7, 8, 9]:  # Monsoon
-                    base_temp = np.random.normal(28, 5)  # 23-33°C
-                else:  # Post-monsoon
-                    base_temp = np.random.normal(25, 6)  # 19-31°C
-                
-                # Humidity patterns
-                if month in [6, 7, 8, 9]:  # Monsoon - high humidity
-                    humidity = np.random.normal(80, 10)
-                else:
-                    humidity = np.random.normal(60, 15)
-                
-                # Rainfall patterns
-                if month in [6, 7, 8, 9]:  # Monsoon season
-                    rainfall = np.random.exponential(5)  # Higher rainfall
-                else:
-                    rainfall = np.random.exponential(0.5)  # Lower rainfall
-                
-                mock_data.append({
-                    'Date': current_date.strftime('%Y-%m-%d'),
-                    'City': city,
-                    'State': city_info['state'],
-                    'Temperature': round(max(5, base_temp), 1),
-                    'Humidity': round(max(20, min(100, humidity)), 1),
-                    'Rainfall': round(max(0, rainfall), 2),
-                    'Wind_Speed': round(np.random.normal(10, 5), 1),
-                    'Pressure': round(np.random.normal(1013, 15), 1),
-                    'Latitude': city_info['lat'],
-                    'Longitude': city_info['lon']
-                })
-        
-        self.weather_data = pd.DataFrame(mock_data)
-        logger.info(f"Created mock dataset with {len(mock_data)} records")
+        # Seeded seasonal data for every known city over the last 365 days
+        frame = generate_weather(self.indian_cities, days=365)
+        logger.info(f"Created mock dataset with {len(frame)} records")
+        return frame
     
-    def load_and_process_data(self) -> bool:
-        """Load and process the weather dataset"""
+    def _open_store(self) -> Optional[WeatherStore]:
+        """Memory-map the columnar copy of the dataset if one has been built"""
+        if not WeatherStore.exists(self.store_path):
+            return None
+        try:
+            store = WeatherStore.open(self.store_path)
+        except ValueError as e:
+            logger.warning(f"Ignoring weather store: {e}")
+            return None
+
+        self.dataset_path = self.dataset_path or store.source.get('dataset_path')
+        logger.info(f"Mapped weather store with {store.n_rows} records from {self.store_path}")
+        return store
+
+    def _convert_csv(self, csv_file: str) -> Tuple[pd.DataFrame, Optional[WeatherStore]]:
+        """One-time CSV parse into the columnar store, then serve from the mapped copy"""
+        frame = pd.read_csv(csv_file)
+        stat = os.stat(csv_file)
+        source = {
+            'dataset_path': self.dataset_path,
+            'csv': csv_file,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime
+        }
+        try:
+            store = WeatherStore.build(frame, self.store_path, source)
+            return store.to_frame(), store
+        except OSError as e:
+            logger.warning(f"Could not write weather store, using the parsed CSV: {e}")
+            return frame, None
+
+    def _store_matches(self, store: Optional[WeatherStore], csv_file: str) -> bool:
+        if store is None:
+            return False
+        source = store.source
+        stat = os.stat(csv_file)
+        return (source.get('csv') == csv_file and source.get('size') == stat.st_size
+                and source.get('mtime') == stat.st_mtime)
+
+    def _load_frame(self) -> Tuple[pd.DataFrame, Optional[WeatherStore], bool]:
+        """Read the dataset (store, else CSV, else mock data) without touching the served snapshot"""
         try:
             if self.dataset_path and os.path.exists(self.dataset_path):
                 # Try to find CSV files in the dataset
@@ -128,129 +210,141 @@ class IndianWeatherService:
                 if csv_files:
                     logger.info(f"Found CSV files: {csv_files}")
                     # Load the first CSV file (assuming it's the main dataset)
-                    self.weather_data = pd.read_csv(csv_files[0])
-                    logger.info(f"Loaded dataset with {len(self.weather_data)} records")
-                else:
-                    logger.warning("No CSV files found in dataset, using mock data")
-                    self._create_mock_data()
+                    store = self._open_store()
+                    if self._store_matches(store, csv_files[0]):
+                        frame = store.to_frame()
+                    else:
+                        frame, store = self._convert_csv(csv_files[0])
+                    logger.info(f"Loaded dataset with {len(frame)} records")
+                    return frame, store, True
+                logger.warning("No CSV files found in dataset, using mock data")
             else:
                 logger.warning("Dataset path not found, using mock data")
-                self._create_mock_data()
-            
-            # Process the data
-            self._process_weather_data()
-            return True
+            return self._create_mock_data(), None, True
             
         except Exception as e:
             logger.error(f"Failed to load dataset: {e}")
-            self._create_mock_data()
-            self._process_weather_data()
+            return self._create_mock_data(), None, False
+
+    def load_and_process_data(self) -> bool:
+        """Load and process the weather dataset, then serve it"""
+        frame, store, success = self._load_frame()
+        snapshot = self._process_weather_data(frame, store)
+        if snapshot is None:
             return False
+        self._publish(snapshot)
+        return success
     
-    def _process_weather_data(self):
-        """Process and aggregate weather data"""
-        if self.weather_data is None:
-            return
-        
+    def _process_weather_data(self, frame: pd.DataFrame,
+                              store: Optional[WeatherStore] = None) -> Optional[WeatherSnapshot]:
+        """Index and summarize a loaded frame into a new, unpublished snapshot"""
         try:
-            # Convert date column if it exists
-            if 'Date' in self.weather_data.columns:
-                self.weather_data['Date'] = pd.to_datetime(self.weather_data['Date'])
-            
-            # Add month and year columns for aggregation
-            if 'Date' in self.weather_data.columns:
-                self.weather_data['Month'] = self.weather_data['Date'].dt.month
-                self.weather_data['Year'] = self.weather_data['Date'].dt.year
-            
-            # Process data by city
-            self.processed_data = {
-                'cities_overview': self._get_cities_overview(),
-                'monthly_trends': self._get_monthly_trends(),
-                'current_conditions': self._get_current_conditions(),
-                'regional_summary': self._get_regional_summary()
-            }
+            # Stores and mock data hold parsed dates already; only a raw CSV needs converting
+            if 'Date' in frame.columns and not pd.api.types.is_datetime64_any_dtype(frame['Date']):
+                frame = frame.assign(Date=pd.to_datetime(frame['Date']))
+
+            # No derived Month/Year columns: adding them would copy every mapped column into
+            # this process, and the monthly aggregates take the month from Date as needed
+            frame, city_index = self._build_city_index(frame)
+
+            # Summaries are mergeable aggregates; appended rows are folded in later
+            snapshot = WeatherSnapshot(weather_data=frame, city_index=city_index, store=store)
+            snapshot = self._with_summary(snapshot, WeatherSummary.from_frame(frame))
             
             logger.info("Data processing completed successfully")
+            return snapshot
             
         except Exception as e:
             logger.error(f"Error processing data: {e}")
+            return None
     
-    def _get_cities_overview(self) -> List[Dict]:
-        """Get overview data for all cities"""
-        cities_data = []
-        
-        # Group by city and get latest data
-        if 'City' in self.weather_data.columns:
-            city_groups = self.weather_data.groupby('City')
-            
-            for city, group in city_groups:
-                latest_data = group.iloc[-1]  # Get most recent record
-                
-                cities_data.append({
-                    'city': city,
-                    'state': latest_data.get('State', 'Unknown'),
-                    'lat': latest_data.get('Latitude', self.indian_cities.get(city, {}).get('lat', 0)),
-                    'lon': latest_data.get('Longitude', self.indian_cities.get(city, {}).get('lon', 0)),
-                    'temperature': float(latest_data.get('Temperature', 0)),
-                    'humidity': float(latest_data.get('Humidity', 0)),
-                    'rainfall': float(latest_data.get('Rainfall', 0)),
-                    'wind_speed': float(latest_data.get('Wind_Speed', 0)),
-                    'pressure': float(latest_data.get('Pressure', 1013))
-                })
-        
-        return cities_data
+    def _publish(self, snapshot: WeatherSnapshot):
+        """Serve snapshot from now on"""
+        with self._data_lock:
+            self.snapshot = snapshot.replace(version=self.snapshot.version + 1)
     
-    def _get_monthly_trends(self) -> Dict:
-        """Get monthly weather trends"""
-        trends = {}
-        
-        if 'Month' in self.weather_data.columns:
-            monthly_avg = self.weather_data.groupby('Month').agg({
-                'Temperature': 'mean',
-                'Humidity': 'mean', 
-                'Rainfall': 'sum'
-            }).round(2)
-            
-            trends = {
-                'temperature': monthly_avg['Temperature'].to_dict(),
-                'humidity': monthly_avg['Humidity'].to_dict(),
-                'rainfall': monthly_avg['Rainfall'].to_dict()
+    def _with_summary(self, snapshot: WeatherSnapshot, summary: WeatherSummary) -> WeatherSnapshot:
+        """snapshot with summary and the processed_data built from it (O(cities + states + months))"""
+        return snapshot.replace(
+            summary=summary,
+            station_index=self._build_station_index(summary),
+            processed_data={
+                'cities_overview': summary.cities_overview(self.indian_cities),
+                'monthly_trends': summary.monthly_trends(),
+                'current_conditions': summary.current_conditions(),
+                'regional_summary': summary.regional_summary()
             }
-        
-        return trends
+        )
     
-    def _get_current_conditions(self) -> Dict:
-        """Get current weather conditions summary"""
-        if self.weather_data.empty:
-            return {}
-        
-        latest_date = self.weather_data['Date'].max() if 'Date' in self.weather_data.columns else None
-        
-        current_data = self.weather_data.tail(20)  # Get recent data
-        
-        return {
-            'avg_temperature': round(current_data['Temperature'].mean(), 1) if 'Temperature' in current_data else 0,
-            'avg_humidity': round(current_data['Humidity'].mean(), 1) if 'Humidity' in current_data else 0,
-            'total_rainfall': round(current_data['Rainfall'].sum(), 2) if 'Rainfall' in current_data else 0,
-            'date': latest_date.isoformat() if latest_date else datetime.now().isoformat()
-        }
+    def _build_station_index(self, summary: WeatherSummary) -> StationIndex:
+        """Index every city with coordinates (dataset columns, else the known-city table)"""
+        names, lats, lons = [], [], []
+        for city, latest in summary.latest.items():
+            known = self.indian_cities.get(city, {})
+            lat = as_float(latest.get('Latitude'), known.get('lat'))
+            lon = as_float(latest.get('Longitude'), known.get('lon'))
+            if lat is not None and lon is not None:
+                names.append(city)
+                lats.append(lat)
+                lons.append(lon)
+        return StationIndex(names, lats, lons)
     
-    def _get_regional_summary(self) -> Dict:
-        """Get weather summary by region/state"""
-        regional_data = {}
-        
-        if 'State' in self.weather_data.columns:
-            state_groups = self.weather_data.groupby('State')
+    def append_observations(self, observations: pd.DataFrame) -> int:
+        """Add new readings without reprocessing the loaded history.
+
+        Only the new rows are grouped and merged into (a copy of) the summaries;
+        they are kept beside the (memory-mapped) base data until the next full load.
+        """
+        with self._data_lock:
+            snapshot = self.snapshot
+            if snapshot.summary is None:
+                raise RuntimeError("Weather data is not loaded yet")
+            if observations.empty:
+                return 0
             
-            for state, group in state_groups:
-                regional_data[state] = {
-                    'avg_temperature': round(group['Temperature'].mean(), 1) if 'Temperature' in group else 0,
-                    'avg_humidity': round(group['Humidity'].mean(), 1) if 'Humidity' in group else 0,
-                    'total_rainfall': round(group['Rainfall'].sum(), 2) if 'Rainfall' in group else 0,
-                    'cities_count': len(group['City'].unique()) if 'City' in group else 0
-                }
+            observations = sort_by_city_and_date(observations)
+            summary = snapshot.summary.copy()
+            summary.add(observations)
+            city_index = dict(snapshot.city_index)
+            if 'City' in observations.columns:
+                # Cities first seen in this batch have no rows in the base data
+                for city in observations['City'].astype(str).unique():
+                    city_index.setdefault(city.lower(), {'city': city, 'start': 0, 'end': 0})
+            appended = (observations if snapshot.appended_data is None
+                        else pd.concat([snapshot.appended_data, observations], ignore_index=True))
+            updated = self._with_summary(snapshot.replace(city_index=city_index, appended_data=appended), summary)
+            self.snapshot = updated.replace(version=snapshot.version + 1)
+        return len(observations)
+    
+    def _build_city_index(self, frame: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Dict[str, Any]]]:
+        """Index each city's row range in the (city, date) sorted data (sorting it if needed)"""
+        city_index = {}
+        if 'City' not in frame.columns or frame.empty:
+            return frame, city_index
+        
+        codes, cities = pd.factorize(frame['City'])
+        boundaries = np.flatnonzero(np.diff(codes)) + 1
+        in_order = len(boundaries) + 1 == len(cities)
+        if in_order and 'Date' in frame.columns:
+            dates = frame['Date'].to_numpy()
+            in_order = np.isin(np.flatnonzero(dates[1:] < dates[:-1]) + 1, boundaries).all()
+        if not in_order:
+            # Stores and mock data are written sorted; anything else is sorted once here
+            logger.info("Sorting weather data by city and date")
+            frame = sort_by_city_and_date(frame)
+            codes, cities = pd.factorize(frame['City'])
+            boundaries = np.flatnonzero(np.diff(codes)) + 1
+        
+        starts = np.concatenate([[0], boundaries])
+        ends = np.concatenate([boundaries, [len(codes)]])
         
-        return regional_data
+        for start, end in zip(starts, ends):
+            city_index[str(cities[codes[start]]).lower()] = {
+                'city': str(cities[codes[start]]),
+                'start': int(start),
+                'end': int(end)
+            }
+        return frame, city_index
     
     def get_weather_data(self) -> Dict[str, Any]:
         """Get all processed weather data"""
@@ -258,46 +352,223 @@ class IndianWeatherService:
     
     def get_city_weather(self, city_name: str) -> Dict[str, Any]:
         """Get weather data for a specific city"""
-        if self.weather_data is None:
+        return self._city_weather(self.snapshot, city_name)
+    
+    def _city_weather(self, snapshot: WeatherSnapshot, city_name: str) -> Dict[str, Any]:
+        if snapshot.weather_data is None:
             return {}
         
-        city_data = self.weather_data[self.weather_data['City'].str.lower() == city_name.lower()]
+        entry = snapshot.city_index.get(city_name.lower())
         
-        if city_data.empty:
+        if entry is None or snapshot.summary is None:
             return {}
         
-        latest = city_data.iloc[-1]
+        latest = snapshot.summary.latest.get(entry['city'], {})
         
         return {
             'city': city_name,
             'state': latest.get('State', 'Unknown'),
             'current': {
-                'temperature': float(latest.get('Temperature', 0)),
-                'humidity': float(latest.get('Humidity', 0)),
-                'rainfall': float(latest.get('Rainfall', 0)),
-                'wind_speed': float(latest.get('Wind_Speed', 0)),
-                'pressure': float(latest.get('Pressure', 1013))
+                'temperature': as_float(latest.get('Temperature'), 0),
+                'humidity': as_float(latest.get('Humidity'), 0),
+                'rainfall': as_float(latest.get('Rainfall'), 0),
+                'wind_speed': as_float(latest.get('Wind_Speed'), 0),
+                'pressure': as_float(latest.get('Pressure'), 1013)
             },
-            'historical': {
-                'avg_temperature': round(city_data['Temperature'].mean(), 1) if 'Temperature' in city_data else 0,
-                'max_temperature': round(city_data['Temperature'].max(), 1) if 'Temperature' in city_data else 0,
-                'min_temperature': round(city_data['Temperature'].min(), 1) if 'Temperature' in city_data else 0,
-                'total_rainfall': round(city_data['Rainfall'].sum(), 2) if 'Rainfall' in city_data else 0
-            }
+            'historical': snapshot.summary.city_historical(entry['city'])
         }
     
-    def initialize(self) -> bool:
-        """Initialize the service by downloading and processing data"""
+    def get_location_context(self, lat: float, lon: float, k: int = 3, interpolate: bool = False,
+                             max_km: float = STATION_MAX_KM) -> Optional[Dict[str, Any]]:
+        """Nearest dataset cities to a coordinate, with their weather and optional IDW estimates.
+
+        Returns None while the data is loading or when no city lies within max_km.
+        """
+        snapshot = self.snapshot
+        if not snapshot.processed_data:
+            return None
+        stations = snapshot.station_index.nearest(lat, lon, k=max(k, 1), max_km=max_km)
+        if not stations:
+            return None
+        
+        for station in stations:
+            weather = self._city_weather(snapshot, station['name'])
+            station.update(state=weather.get('state'), current=weather.get('current'),
+                           historical=weather.get('historical'))
+        
+        context = {'nearest': stations[0], 'stations': stations}
+        if interpolate:
+            distances = [station['distance_km'] for station in stations]
+            context['interpolated'] = {
+                'method': 'inverse_distance',
+                'stations_used': len(stations),
+                'current': {
+                    metric: _rounded(idw_interpolate(distances, [st['current'].get(metric) for st in stations]), 1)
+                    for metric in ('temperature', 'humidity', 'rainfall')
+                },
+                'historical': {
+                    metric: _rounded(idw_interpolate(distances, [st['historical'].get(metric) for st in stations]), 1)
+                    for metric in ('avg_temperature', 'max_temperature', 'min_temperature')
+                }
+            }
+        return context
+    
+    def _anomaly_source(self, snapshot: WeatherSnapshot) -> Optional[Dict[str, Any]]:
+        """Identity of a snapshot's weather store; None for data that is never persisted (mock, raw CSV)"""
+        if snapshot.store is None or snapshot.weather_data is None:
+            return None
+        store = snapshot.store
+        return {'weather_built_at': store.meta.get('built_at'), 'weather_rows': store.n_rows,
+                'weather_source': store.source}
+    
+    def _detect_anomalies(self, snapshot: WeatherSnapshot, recompute: bool = False) -> Optional[AnomalyTable]:
+        """The persisted anomaly table for a snapshot's data, else detect (and persist) it"""
+        if snapshot.weather_data is None:
+            return None
+        source = self._anomaly_source(snapshot)
+        if source is not None and not recompute:
+            try:
+                table = AnomalyTable.load(self.anomaly_path)
+                if all(table.source.get(key) == value for key, value in source.items()):
+                    logger.info(f"Loaded {len(table)} weather anomalies from {self.anomaly_path}")
+                    return table
+            except ValueError:
+                pass
+        
+        try:
+            table = AnomalyTable.detect(snapshot.weather_data, source)
+        except Exception as e:
+            logger.error(f"Anomaly detection failed: {e}")
+            return snapshot.anomalies
+        if source is not None:
+            try:
+                table.save(self.anomaly_path)
+            except OSError as e:
+                logger.warning(f"Could not persist weather anomalies: {e}")
+        return table
+    
+    def load_anomalies(self, recompute: bool = False) -> Optional[AnomalyTable]:
+        """Load or detect the anomaly table for the served data and serve it with that data"""
+        snapshot = self.snapshot
+        table = self._detect_anomalies(snapshot, recompute)
+        with self._data_lock:
+            # Skipped if a reload or append replaced the data meanwhile
+            if self.snapshot is snapshot:
+                self.snapshot = snapshot.replace(anomalies=table)
+        return table
+    
+    def get_anomalies(self, city_name: Optional[str] = None, **filters) -> List[Dict[str, Any]]:
+        """Detected anomalies (AnomalyTable.query filters); readings appended since the last load are not scored"""
+        anomalies = self.anomalies
+        if anomalies is None:
+            return []
+        return anomalies.query(city_name, **filters)
+    
+    def get_recent_anomalies(self, city_name: str, days: int = RECENT_DAYS, **filters) -> List[Dict[str, Any]]:
+        """Anomalies that ended within days of the city's latest reading"""
+        anomalies = self.anomalies
+        if anomalies is None:
+            return []
+        return anomalies.recent(city_name, days=days, **filters)
+    
+    def get_city_history(self, city_name: str) -> Optional[pd.DataFrame]:
+        """All rows for a city in date order: a slice of the indexed data plus appended rows"""
+        snapshot = self.snapshot
+        entry = snapshot.city_index.get(city_name.lower())
+        if entry is None:
+            return None
+        history = snapshot.weather_data.iloc[entry['start']:entry['end']]
+        appended = snapshot.appended_data
+        if appended is not None:
+            recent = appended[appended['City'].astype(str) == entry['city']]
+            if not recent.empty:
+                history = pd.concat([history, recent], ignore_index=True)
+        return history
+    
+    def initialize(self, refresh: bool = False) -> bool:
+        """Initialize the service by downloading and processing data.
+
+        A previously converted store is memory-mapped without contacting Kaggle;
+        refresh=True re-checks the download and rebuilds the store if it changed.
+        The new data, its indexes, summaries and anomalies are built before any
+        of it is served, then published together.
+        """
         logger.info("Initializing Indian Weather Service...")
         
-        # Download dataset (or use mock data if fails)
+        if not refresh:
+            store = self._open_store()
+            snapshot = self._process_weather_data(store.to_frame(), store) if store is not None else None
+            if snapshot is not None:
+                self._publish(snapshot.replace(anomalies=self._detect_anomalies(snapshot)))
+                logger.info("Service initialized from weather store")
+                return True
+        
+        # Download dataset (mock data is used if that fails)
         download_success = self.download_dataset()
         
         # Load and process data
-        process_success = self.load_and_process_data()
+        frame, store, process_success = self._load_frame()
+        snapshot = self._process_weather_data(frame, store)
+        if snapshot is None:
+            process_success = False
+        else:
+            self._publish(snapshot.replace(anomalies=self._detect_anomalies(snapshot)))
         
         logger.info(f"Service initialized. Download: {download_success}, Process: {process_success}")
         return process_success
 
+    @property
+    def is_ready(self) -> bool:
+        return bool(self.snapshot.processed_data)
+
+    def start_background_initialize(self, refresh: bool = False) -> bool:
+        """Run initialize() on a background thread unless one is already running.
+
+        Returns True if this call started a loader. Without refresh, nothing is
+        started once the data is ready.
+        """
+        with self._init_lock:
+            if self._init_thread is not None and self._init_thread.is_alive():
+                return False
+            if self.is_ready and not refresh:
+                return False
+            self.init_state = 'loading'
+            self.init_error = None
+            self.init_started_at = time.time()
+            self._init_thread = threading.Thread(
+                target=self._run_initialize, args=(refresh,), name='indian-weather-init', daemon=True
+            )
+            self._init_thread.start()
+            return True
+
+    def _run_initialize(self, refresh: bool):
+        try:
+            self.initialize(refresh=refresh)
+        except Exception as e:
+            logger.error(f"Background initialization failed: {e}")
+            self.init_error = str(e)
+        if self.is_ready:
+            self.init_state = 'ready'
+            self.ready_at = time.time()
+        else:
+            self.init_state = 'failed'
+            self.init_error = self.init_error or 'No weather data could be processed'
+        logger.info(f"Indian weather data {self.init_state} after {time.time() - self.init_started_at:.1f}s")
+
+    def get_init_status(self) -> Dict[str, Any]:
+        """Readiness summary for API responses"""
+        weather_data = self.weather_data
+        return {
+            'state': 'ready' if self.is_ready and self.init_state != 'loading' else self.init_state,
+            'ready': self.is_ready,
+            'error': self.init_error,
+            'loading_for_seconds': round(time.time() - self.init_started_at, 1)
+            if self.init_state == 'loading' else None,
+            'records': int(len(weather_data)) if weather_data is not None else 0
+        }
+
+def _rounded(value: Optional[float], digits: int) -> Optional[float]:
+    return None if value is None else round(value, digits)
+
 # Create a global instance
 indian_weather_service = IndianWeatherService()
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+Live weather hub - one upstream refresher per active grid cell, fanned out to SSE subscribers
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+import structlog
+
+from core.geo import grid_cell, cell_center
+
+logger = structlog.get_logger()
+
+Cell = Tuple[int, int]
+
+
+def flatten_conditions(weather: Dict, air_quality: Dict) -> Dict[str, Any]:
+    """Reduce current weather and air pollution payloads to the fields dashboards display"""
+    main = weather.get("main", {})
+    wind = weather.get("wind", {})
+    condition = (weather.get("weather") or [{}])[0]
+    pollution = ((air_quality or {}).get("list") or [{}])[0]
+    components = pollution.get("components", {})
+
+    return {
+        "city": weather.get("name"),
+        "temperature": main.get("temp"),
+        "feels_like": main.get("feels_like"),
+        "humidity": main.get("humidity"),
+        "pressure": main.get("pressure"),
+        "wind_speed": wind.get("speed"),
+        "wind_deg": wind.get("deg"),
+        "clouds": weather.get("clouds", {}).get("all"),
+        "visibility": weather.get("visibility"),
+        "condition": condition.get("main"),
+        "description": condition.get("description"),
+        "icon": condition.get("icon"),
+        "observed_at": weather.get("dt"),
+        "aqi": pollution.get("main", {}).get("aqi"),
+        "pm2_5": components.get("pm2_5"),
+        "pm10": components.get("pm10"),
+        "no2": components.get("no2"),
+        "o3": components.get("o3"),
+        "co": components.get("co"),
+        "air_quality_at": pollution.get("dt")
+    }
+
+
+class _CellChannel:
+    """Subscribers and refresher task for a single grid cell"""
+
+    def __init__(self, cell: Cell):
+        self.cell = cell
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self.task: Optional[asyncio.Task] = None
+        self.upstream_fetches = 0
+
+
+class LiveWeatherHub:
+    """Shares one periodic upstream fetch per grid cell among all of its subscribers"""
+
+    def __init__(self, data_integrator, refresh_interval: float = 60.0, queue_size: int = 8):
+        self.data_integrator = data_integrator
+        self.refresh_interval = refresh_interval
+        self.queue_size = queue_size
+        self._channels: Dict[Cell, _CellChannel] = {}
+
+    async def subscribe(self, lat: float, lon: float) -> Tuple[Cell, asyncio.Queue]:
+        """Register a subscriber; starts the cell's refresher if it is the first one"""
+        cell = grid_cell(lat, lon)
+        channel = self._channels.get(cell)
+        if channel is None:
+            channel = self._channels[cell] = _CellChannel(cell)
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        channel.subscribers.add(queue)
+
+        if channel.snapshot is not None:
+            queue.put_nowait(self._event("snapshot", cell, channel.snapshot))
+        if channel.task is None or channel.task.done():
+            channel.task = asyncio.create_task(self._refresh_loop(channel))
+
+        logger.info("Live weather subscriber added", cell=cell, subscribers=len(channel.subscribers))
+        return cell, queue
+
+    def unsubscribe(self, cell: Cell, queue: asyncio.Queue):
+        """Remove a subscriber; the cell's refresher stops once nobody is listening"""
+        channel = self._channels.get(cell)
+        if channel is None:
+            return
+
+        channel.subscribers.discard(queue)
+        if not channel.subscribers:
+            if channel.task:
+                channel.task.cancel()
+            del self._channels[cell]
+        logger.info("Live weather subscriber removed", cell=cell, subscribers=len(channel.subscribers))
+
+    async def _refresh_loop(self, channel: _CellChannel):
+        lat, lon = cell_center(channel.cell)
+        while channel.subscribers:
+            try:
+                weather, air_quality = await asyncio.gather(
+                    self.data_integrator.get_current_weather(lat, lon),
+                    self.data_integrator.get_air_quality_data(lat, lon)
+                )
+                channel.upstream_fetches += 1
+                self._publish(channel, flatten_conditions(weather, air_quality))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Live weather refresh failed", cell=channel.cell, error=str(e))
+
+            await asyncio.sleep(self.refresh_interval)
+
+    def _publish(self, channel: _CellChannel, conditions: Dict[str, Any]):
+        previous = channel.snapshot
+        channel.snapshot = conditions
+
+        if previous is None:
+            event = self._event("snapshot", channel.cell, conditions)
+        else:
+            changes = {k: v for k, v in conditions.items() if previous.get(k) != v}
+            if not changes:
+                return
+            event = self._event("update", channel.cell, changes)
+
+        for queue in list(channel.subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A slow client missed diffs; resync it with the full state
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self._event("snapshot", channel.cell, conditions))
+
+    @staticmethod
+    def _event(kind: str, cell: Cell, data: Dict[str, Any]) -> Dict[str, Any]:
+        lat, lon = cell_center(cell)
+        return {
+            "event": kind,
+            "cell": {"lat": lat, "lon": lon},
+            "data": data,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Active cells with their subscriber counts and upstream fetch totals"""
+        return {
+            "active_cells": len(self._channels),
+            "subscribers": sum(len(c.subscribers) for c in self._channels.values()),
+            "refresh_interval_seconds": self.refresh_interval,
+            "cells": [
+                {
+                    "cell": list(cell_center(c.cell)),
+                    "subscribers": len(c.subscribers),
+                    "upstream_fetches": c.upstream_fetches
+                }
+                for c in self._channels.values()
+            ]
+        }
@@ -1,24 +1,71 @@
 """
 Machine Learning Service for Climate Predictions and Image Analysis
+
+joblib is imported on first use rather than at module import, so including
+the ML router does not slow gateway startup. Published forecast models are
+flattened numpy forests (services/flat_forest.py), so serving never imports
+sklearn; it is only needed to train. Image decoding and OpenCV analysis run
+in worker processes (services/image_analysis.py).
 """
+import asyncio
+import threading
+from collections import OrderedDict
+import time
 import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
-import joblib
-import cv2
-from PIL import Image
-import io
 import structlog
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import date, datetime, timedelta
 import os
 from pathlib import Path
 
 from core.config import settings
+from core.geo import grid_cell, cell_center
+from services.model_registry import ModelRegistry
+from services.flat_forest import export_forecast_bundle, FLAT_FOREST_FORMAT
+from services.image_analysis import ImageAnalysisPool, ImageAnalysisBusy
+from services.image_index import ImageAnalysisIndex, sha256_hex, image_dhash
+from services.activity_recommender import ActivityRecommender
 
 logger = structlog.get_logger()
 
+FORECAST_MODEL_NAME = "climate_forecast"
+FORECAST_FEATURES = ["latitude", "longitude", "day_of_year", "historical_temp", "historical_aqi"]
+
+# How often a worker checks whether another process activated a different version
+REGISTRY_POLL_SECONDS = 30
+
+# Beyond this distance a training city's recent weather says little about a location
+STATION_STATE_MAX_KM = 300
+
+# Longest lead (days after a station state's date) bundles without max_horizon_days were trained on
+STATION_STATE_MAX_LEAD_DAYS = 30
+
+
+# (model version, grid cell, target date) entries kept per issue day
+FORECAST_CACHE_SIZE = 50_000
+
+
+def horizon_confidence(horizon_days: np.ndarray) -> np.ndarray:
+    """Confidence that decays with lead time (deterministic so cached forecasts are stable)"""
+    return np.round(np.clip(0.9 - 0.012 * (horizon_days - 1), 0.5, 0.9), 3)
+
+
+def seasonal_humidity(days_of_year: np.ndarray) -> np.ndarray:
+    """Climatological relative humidity for models without a humidity target (monsoon peak in August)"""
+    return np.clip(65 + 15 * np.cos(2 * np.pi * (days_of_year - 220) / 365.25), 20, 90)
+
+
+def format_prediction(target: str, value: float):
+    """Round a model output the way the forecast API reports that quantity"""
+    if target == "aqi":
+        return int(round(max(0.0, value)))
+    if target == "rainfall":
+        return round(max(0.0, float(value)), 2)
+    if target == "humidity":
+        return round(min(100.0, max(0.0, float(value))), 1)
+    return round(float(value), 1)
+
+
 class MLService:
     """Machine Learning service for climate predictions and image analysis"""
     
@@ -26,37 +73,155 @@ class MLService:
         self.model_path = Path(settings.MODEL_PATH)
         self.model_path.mkdir(exist_ok=True)
         
-        # Initialize models
-        self.climate_model = None
-        self.scaler = None
+        self.registry = ModelRegistry(self.model_path / "registry")
+        
+        # Models are loaded lazily (see ensure_models_loaded / start_background_load).
+        # The active forecaster is one dict so a hot swap replaces models, scaler
+        # and metadata together.
+        self._active: Optional[Dict[str, Any]] = None
+        self._last_registry_check = 0.0
+        
+        # Forecast results keyed by (model version, grid cell, target date), reset daily
+        self._forecast_cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._forecast_cache_date = None
+        self.forecast_cache_stats = {"hits": 0, "misses": 0}
         self.image_model = None
+        self.image_pool = ImageAnalysisPool(
+            max_workers=settings.IMAGE_ANALYSIS_WORKERS,
+            max_pending=settings.IMAGE_ANALYSIS_MAX_PENDING
+        )
+        self.image_index = ImageAnalysisIndex(
+            self.model_path / "image_analysis_index.json",
+            max_entries=settings.IMAGE_INDEX_MAX_ENTRIES
+        )
+        self.recommender = ActivityRecommender()
         
-        # Load or create models
-        self._initialize_models()
+        # not_loaded -> loading -> ready | fallback
+        self.model_state = "not_loaded"
+        self.load_duration_seconds: Optional[float] = None
+        self._load_lock = threading.Lock()
+        self._load_future: Optional[asyncio.Future] = None
+    
+    def load_models(self):
+        """Load (or train) the models synchronously; concurrent callers wait for the first"""
+        with self._load_lock:
+            if self.model_state in ("ready", "fallback"):
+                return
+            
+            self.model_state = "loading"
+            started = time.perf_counter()
+            self._initialize_models()
+            self.load_duration_seconds = round(time.perf_counter() - started, 3)
+            self.model_state = "ready" if self.climate_model and self.scaler else "fallback"
+            logger.info("ML models loaded", state=self.model_state, seconds=self.load_duration_seconds)
+    
+    def start_background_load(self) -> asyncio.Future:
+        """Begin loading models in a worker thread without blocking the event loop"""
+        if self._load_future is None:
+            loop = asyncio.get_running_loop()
+            self._load_future = loop.run_in_executor(None, self.load_models)
+        return self._load_future
+    
+    async def ensure_models_loaded(self):
+        """Wait for models, starting the load if nobody has yet (single flight)"""
+        if self.model_state not in ("ready", "fallback"):
+            await asyncio.shield(self.start_background_load())
+        await self._follow_registry()
+    
+    @property
+    def climate_model(self) -> Optional[Dict[str, Any]]:
+        return self._active["models"] if self._active else None
+    
+    @property
+    def scaler(self):
+        return self._active["scaler"] if self._active else None
+    
+    @property
+    def model_metadata(self) -> Dict[str, Any]:
+        return self._active["metadata"] if self._active else {}
     
     def _initialize_models(self):
-        """Initialize or load ML models"""
+        """Load the current registry version, publishing one first if the registry is empty"""
         try:
-            # Try to load existing models
-            climate_model_path = self.model_path / "climate_forecast_model.joblib"
-            scaler_path = self.model_path / "feature_scaler.joblib"
-            
-            if climate_model_path.exists() and scaler_path.exists():
-                self.climate_model = joblib.load(climate_model_path)
-                self.scaler = joblib.load(scaler_path)
-                logger.info("Loaded existing ML models")
-            else:
-                # Create and train basic models with synthetic data
-                self._create_basic_models()
-                logger.info("Created new ML models with synthetic data")
+            if self.registry.current_version(FORECAST_MODEL_NAME) is None:
+                self._bootstrap_registry()
+            self._load_version()
                 
         except Exception as e:
             logger.error("Failed to initialize ML models", error=str(e))
             # Create fallback models
             self._create_fallback_models()
     
-    def _create_basic_models(self):
+    def _bootstrap_registry(self):
+        """Import legacy joblib files, or train synthetic models, as the first registry version"""
+        import joblib
+        
+        climate_model_path = self.model_path / "climate_forecast_model.joblib"
+        scaler_path = self.model_path / "feature_scaler.joblib"
+        
+        if climate_model_path.exists() and scaler_path.exists():
+            bundle = {"models": joblib.load(climate_model_path), "scaler": joblib.load(scaler_path)}
+            trained_at = datetime.utcfromtimestamp(climate_model_path.stat().st_mtime).isoformat()
+            source = "legacy_joblib"
+            logger.info("Importing existing ML models into registry")
+        else:
+            bundle = self._create_basic_models()
+            trained_at = datetime.utcnow().isoformat()
+            source = "synthetic"
+            logger.info("Created new ML models with synthetic data")
+        
+        # Serve the sklearn-free export so workers never import sklearn after this
+        self.registry.publish(FORECAST_MODEL_NAME, export_forecast_bundle(bundle), {
+            "trained_at": trained_at,
+            "source": source,
+            "format": FLAT_FOREST_FORMAT,
+            "model_type": "RandomForestRegressor",
+            "features": FORECAST_FEATURES,
+            "targets": sorted(bundle["models"])
+        })
+    
+    def _load_version(self, version: Optional[str] = None) -> Dict[str, Any]:
+        """Load a registry version (current by default) and swap it in atomically"""
+        bundle, metadata = self.registry.load(FORECAST_MODEL_NAME, version)
+        self._active = {"models": bundle["models"], "scaler": bundle["scaler"], "bundle": bundle, "metadata": metadata}
+        self._last_registry_check = time.monotonic()
+        logger.info("Loaded forecast model", version=metadata["version"], trained_at=metadata.get("trained_at"))
+        return metadata
+    
+    async def activate_model_version(self, version: str) -> Dict[str, Any]:
+        """Hot-swap to another published version; in-flight predictions finish on the old one"""
+        loop = asyncio.get_running_loop()
+        metadata = await loop.run_in_executor(None, self._load_version, version)
+        self.registry.activate(FORECAST_MODEL_NAME, version)
+        self.model_state = "ready"
+        return metadata
+    
+    def list_model_versions(self) -> Dict[str, Any]:
+        return {
+            "current": self.registry.current_version(FORECAST_MODEL_NAME),
+            "active_in_worker": self.model_metadata.get("version"),
+            "versions": self.registry.list_versions(FORECAST_MODEL_NAME)
+        }
+    
+    async def _follow_registry(self):
+        """Pick up a version another worker activated since our last check"""
+        if self._active is None or time.monotonic() - self._last_registry_check < REGISTRY_POLL_SECONDS:
+            return
+        self._last_registry_check = time.monotonic()
+        
+        current = self.registry.current_version(FORECAST_MODEL_NAME)
+        if current and current != self.model_metadata.get("version"):
+            try:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self._load_version, current)
+            except Exception as e:
+                logger.error("Failed to follow registry version", version=current, error=str(e))
+    
+    def _create_basic_models(self) -> Dict[str, Any]:
         """Create basic models with synthetic training data"""
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.preprocessing import StandardScaler
+        
         # Generate synthetic climate data for training
         np.random.seed(42)
         n_samples = 1000
@@ -74,83 +239,229 @@ class MLService:
         y_aqi = X[:, 4] + np.random.normal(0, 20, n_samples)  # AQI with noise
         
         # Train models
-        self.climate_model = {
+        models = {
             'temperature': RandomForestRegressor(n_estimators=50, random_state=42),
             'aqi': RandomForestRegressor(n_estimators=50, random_state=42)
         }
         
-        self.scaler = StandardScaler()
-        X_scaled = self.scaler.fit_transform(X)
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
         
-        self.climate_model['temperature'].fit(X_scaled, y_temp)
-        self.climate_model['aqi'].fit(X_scaled, y_aqi)
+        models['temperature'].fit(X_scaled, y_temp)
+        models['aqi'].fit(X_scaled, y_aqi)
         
-        # Save models
-        joblib.dump(self.climate_model, self.model_path / "climate_forecast_model.joblib")
-        joblib.dump(self.scaler, self.model_path / "feature_scaler.joblib")
+        return {"models": models, "scaler": scaler}
     
     def _create_fallback_models(self):
         """Create simple fallback models"""
-        self.climate_model = None
-        self.scaler = None
+        self._active = None
         logger.warning("Using fallback ML models")
     
     async def predict_climate(self, latitude: float, longitude: float, days: int, features: List[str]) -> Dict[str, Any]:
         """Predict climate conditions for the next few days"""
         try:
+            await self.ensure_models_loaded()
             if not self.climate_model or not self.scaler:
                 # Return mock predictions
                 return self._generate_mock_predictions(latitude, longitude, days, features)
             
-            predictions = []
-            base_date = datetime.utcnow().date()
-            
-            for day in range(1, days + 1):
-                predict_date = base_date + timedelta(days=day)
-                day_of_year = predict_date.timetuple().tm_yday
-                
-                # Create feature vector
-                # [lat, lon, day_of_year, historical_temp, historical_aqi]
-                feature_vector = np.array([[
-                    latitude,
-                    longitude,
-                    day_of_year,
-                    20.0,  # Default historical temp
-                    100.0  # Default historical AQI
-                ]])
-                
-                feature_vector_scaled = self.scaler.transform(feature_vector)
-                
-                # Predict
-                pred_temp = self.climate_model['temperature'].predict(feature_vector_scaled)[0]
-                pred_aqi = max(0, self.climate_model['aqi'].predict(feature_vector_scaled)[0])
-                
-                prediction = {
-                    "date": predict_date.isoformat(),
-                    "temperature": round(pred_temp, 1),
-                    "aqi": round(pred_aqi),
-                    "confidence": 0.75 + np.random.uniform(-0.1, 0.1)
-                }
-                
-                # Add humidity if requested
-                if "humidity" in features:
-                    prediction["humidity"] = max(20, min(90, 60 + np.random.normal(0, 15)))
-                
-                predictions.append(prediction)
+            predictions = self._predict_batch([(latitude, longitude)], days, features)[0]
             
             return {
                 "predictions": predictions,
-                "model_info": {
-                    "name": "climate_forecast_rf",
-                    "version": "1.0",
-                    "last_trained": datetime.utcnow().isoformat()
-                }
+                "model_info": self._model_info()
             }
             
         except Exception as e:
             logger.error("Climate prediction failed", error=str(e))
             return self._generate_mock_predictions(latitude, longitude, days, features)
     
+    async def predict_climate_batch(self, locations: List[Tuple[float, float]], days: int, features: List[str]) -> Dict[str, Any]:
+        """Predict the next few days for many locations with one transform and one predict per model"""
+        try:
+            await self.ensure_models_loaded()
+            if not self.climate_model or not self.scaler:
+                return self._generate_mock_batch(locations, days, features)
+            forecasts = self._predict_batch(locations, days, features)
+        except Exception as e:
+            logger.error("Batch climate prediction failed", error=str(e), locations=len(locations))
+            return self._generate_mock_batch(locations, days, features)
+        
+        return {
+            "forecasts": [
+                {"location": {"lat": lat, "lon": lon}, "predictions": predictions}
+                for (lat, lon), predictions in zip(locations, forecasts)
+            ],
+            "model_info": self._model_info()
+        }
+    
+    def _generate_mock_batch(self, locations: List[Tuple[float, float]], days: int, features: List[str]) -> Dict[str, Any]:
+        results = [self._generate_mock_predictions(lat, lon, days, features) for lat, lon in locations]
+        return {
+            "forecasts": [
+                {"location": {"lat": lat, "lon": lon}, "predictions": result["predictions"]}
+                for (lat, lon), result in zip(locations, results)
+            ],
+            "model_info": results[0]["model_info"] if results else {}
+        }
+    
+    def _model_info(self) -> Dict[str, Any]:
+        metadata = self.model_metadata
+        return {
+            "name": "climate_forecast_rf",
+            "version": metadata.get("version"),
+            "last_trained": metadata.get("trained_at"),
+            "source": metadata.get("source")
+        }
+    
+    def _build_feature_matrix(self, locations: List[Tuple[float, float]], days_of_year: np.ndarray,
+                              bundle: Optional[Dict[str, Any]] = None,
+                              issue_date: Optional[date] = None) -> np.ndarray:
+        """One row per (location, horizon day) in the column order the active bundle was trained on"""
+        coords = np.asarray(locations, dtype=float).reshape(-1, 2)
+        n_locations, horizon = len(coords), len(days_of_year)
+        feature_names = (bundle or {}).get("feature_names")
+        
+        if not feature_names:
+            # Synthetic bundle: [lat, lon, day_of_year, historical_temp, historical_aqi]
+            X = np.empty((n_locations * horizon, 5))
+            X[:, 0] = np.repeat(coords[:, 0], horizon)
+            X[:, 1] = np.repeat(coords[:, 1], horizon)
+            X[:, 2] = np.tile(days_of_year, n_locations)
+            X[:, 3] = 20.0  # Default historical temp
+            X[:, 4] = 100.0  # Default historical AQI
+            return X
+        
+        doy = np.tile(days_of_year, n_locations)
+        lead_days = np.tile(np.arange(1, horizon + 1), n_locations)
+        columns = {
+            "latitude": np.repeat(coords[:, 0], horizon),
+            "longitude": np.repeat(coords[:, 1], horizon),
+            "horizon_days": lead_days,
+            "target_doy_sin": np.sin(2 * np.pi * doy / 365.25),
+            "target_doy_cos": np.cos(2 * np.pi * doy / 365.25),
+        }
+        
+        # Recent-weather features come from the nearest training station, if close enough
+        station_state = bundle.get("station_state")
+        state_values = None
+        if station_state and station_state.get("coords"):
+            station_coords = np.asarray(station_state["coords"], dtype=float)
+            lat_rad = np.radians(coords[:, 0])[:, None]
+            d_lat = np.radians(coords[:, 0][:, None] - station_coords[None, :, 0])
+            d_lon = np.radians(coords[:, 1][:, None] - station_coords[None, :, 1]) * np.cos(lat_rad)
+            distance_km = 6371.0 * np.hypot(d_lat, d_lon)
+            nearest = distance_km.argmin(axis=1)
+            near_enough = distance_km[np.arange(n_locations), nearest] <= STATION_STATE_MAX_KM
+            state_values = np.repeat(np.asarray(station_state["values"], dtype=float)[nearest], horizon, axis=0)
+            usable = np.repeat(near_enough, horizon)
+            state_index = {name: i for i, name in enumerate(station_state["features"])}
+            
+            # The model learned a state's lags against targets `horizon_days` after the state's
+            # own date, so the lead is counted from as_of; a state too old for any trained lead
+            # would describe another season and is dropped for the defaults instead
+            if station_state.get("as_of") and issue_date is not None:
+                as_of = np.asarray(station_state["as_of"], dtype="datetime64[D]")[nearest]
+                age_days = (np.datetime64(issue_date, "D") - as_of).astype(np.int64)
+                state_lead = lead_days + np.repeat(age_days, horizon)
+                max_lead = station_state.get("max_horizon_days", STATION_STATE_MAX_LEAD_DAYS)
+                usable &= state_lead <= max_lead
+                columns["horizon_days"] = np.where(usable, state_lead, lead_days)
+            state_values[~usable] = np.nan
+        
+        defaults = bundle.get("feature_defaults", {})
+        X = np.empty((n_locations * horizon, len(feature_names)))
+        for i, name in enumerate(feature_names):
+            if name in columns:
+                X[:, i] = columns[name]
+                continue
+            values = np.full(n_locations * horizon, np.nan)
+            if state_values is not None and name in state_index:
+                values = state_values[:, state_index[name]]
+            X[:, i] = np.where(np.isnan(values), defaults.get(name, 0.0), values)
+        return X
+    
+    def _predict_batch(self, locations: List[Tuple[float, float]], days: int, features: List[str]) -> List[List[Dict[str, Any]]]:
+        """Forecast every (location, day) pair, computing only the (cell, date) pairs not cached"""
+        base_date = datetime.utcnow().date()
+        dates = [base_date + timedelta(days=day) for day in range(1, days + 1)]
+        
+        # Read the active forecaster once so a concurrent hot swap can't mix versions
+        active = self._active
+        version = active["metadata"].get("version")
+        cache = self._forecast_cache_for(base_date)
+        
+        # Model inputs depend only on the grid cell and target date, so nearby callers share rows
+        cells = [grid_cell(lat, lon) for lat, lon in locations]
+        
+        # This request's entries are collected before the cache is trimmed, so a batch
+        # larger than the cache can't evict cells it still has to answer
+        entries = {}
+        missing = []
+        for cell in dict.fromkeys(cells):
+            keys = [(version, cell, d) for d in dates]
+            if all(key in cache for key in keys):
+                for key in keys:
+                    cache.move_to_end(key)
+                    entries[key] = cache[key]
+            else:
+                missing.append(cell)
+        
+        if missing:
+            self.forecast_cache_stats["misses"] += len(missing)
+            predicted = self._predict_cells(active, missing, dates)
+            entries.update(predicted)
+            cache.update(predicted)
+            while len(cache) > FORECAST_CACHE_SIZE:
+                cache.popitem(last=False)
+        self.forecast_cache_stats["hits"] += len(cells) - len(missing)
+        
+        forecasts = []
+        for cell in cells:
+            predictions = []
+            for predict_date in dates:
+                cached = entries[(version, cell, predict_date)]
+                prediction = {"date": predict_date.isoformat()}
+                for target, value in cached.items():
+                    if target == "temperature" or target == "confidence" or target in features:
+                        prediction[target] = value
+                predictions.append(prediction)
+            forecasts.append(predictions)
+        
+        return forecasts
+    
+    def _predict_cells(self, active: Dict[str, Any], cells: List[Tuple[int, int]], dates: List) -> Dict[Tuple, Dict[str, Any]]:
+        """Run every model once over the cell centers; the result for each (version, cell, date) key"""
+        days_of_year = np.array([d.timetuple().tm_yday for d in dates])
+        centers = [cell_center(cell) for cell in cells]
+        # dates are the days following the issue date
+        issue_date = dates[0] - timedelta(days=1)
+        X_scaled = active["scaler"].transform(
+            self._build_feature_matrix(centers, days_of_year, active.get("bundle"), issue_date)
+        )
+        
+        shape = (len(cells), len(dates))
+        predicted = {t: model.predict(X_scaled).reshape(shape) for t, model in active["models"].items()}
+        if "humidity" not in predicted:
+            predicted["humidity"] = np.broadcast_to(seasonal_humidity(days_of_year), shape)
+        confidence = horizon_confidence(np.arange(1, len(dates) + 1))
+        
+        version = active["metadata"].get("version")
+        entries = {}
+        for i, cell in enumerate(cells):
+            for j, predict_date in enumerate(dates):
+                entry = {target: format_prediction(target, values[i, j]) for target, values in predicted.items()}
+                entry["confidence"] = float(confidence[j])
+                entries[(version, cell, predict_date)] = entry
+        return entries
+    
+    def _forecast_cache_for(self, base_date) -> "OrderedDict":
+        """Forecast cache for the current issue day; yesterday's entries expire at midnight UTC"""
+        if self._forecast_cache_date != base_date:
+            self._forecast_cache = OrderedDict()
+            self._forecast_cache_date = base_date
+        return self._forecast_cache
+    
     def _generate_mock_predictions(self, latitude: float, longitude: float, days: int, features: List[str]) -> Dict[str, Any]:
         """Generate mock predictions when ML models are not available"""
         predictions = []
@@ -183,28 +494,29 @@ class MLService:
             }
         }
     
-    async def analyze_environmental_image(self, image_data: bytes) -> Dict[str, Any]:
-        """Analyze image for environmental content"""
+    async def analyze_environmental_image(self, image_data: bytes, image_hash: Optional[int] = None) -> Dict[str, Any]:
+        """Analyze image for environmental content in the image worker pool, unless already seen.
+
+        image_hash is the upload's dHash if the caller has already computed it.
+        """
         try:
-            # Convert bytes to image
-            image = Image.open(io.BytesIO(image_data))
-            image_array = np.array(image)
+            # Re-uploads of the same photo reuse the stored analysis
+            sha256 = sha256_hex(image_data)
+            cached = self.image_index.get_exact(sha256)
+            if cached is None:
+                if image_hash is None:
+                    loop = asyncio.get_running_loop()
+                    image_hash = await loop.run_in_executor(None, image_dhash, image_data)
+                cached = self.image_index.get_similar(image_hash)
+            if cached is not None:
+                return {**cached, "cached": True}
             
-            # Simple color-based analysis (mock implementation)
-            analysis = self._analyze_image_colors(image_array)
-            
-            return {
-                "detected_objects": analysis["objects"],
-                "environmental_features": analysis["features"],
-                "confidence_scores": {
-                    "overall": 0.78,
-                    "vegetation": analysis["vegetation_confidence"],
-                    "air_quality": analysis["air_quality_confidence"]
-                },
-                "environmental_score": analysis["environmental_score"],
-                "recommendations": analysis["recommendations"]
-            }
+            analysis = await self.image_pool.analyze(image_data)
+            self.image_index.add(sha256, image_hash, analysis)
+            return analysis
             
+        except ImageAnalysisBusy:
+            raise
         except Exception as e:
             logger.error("Image analysis failed", error=str(e))
             # Return basic analysis
@@ -221,112 +533,47 @@ class MLService:
                 "recommendations": ["Image analyzed with basic color detection"]
             }
     
-    def _analyze_image_colors(self, image_array: np.ndarray) -> Dict[str, Any]:
-        """Analyze image based on color distribution (simplified approach)"""
-        # Convert to HSV for better color analysis
-        if len(image_array.shape) == 3:
-            hsv = cv2.cvtColor(image_array, cv2.COLOR_RGB2HSV)
-        else:
-            hsv = image_array
-        
-        # Define color ranges for environmental features
-        green_lower = np.array([35, 40, 40])
-        green_upper = np.array([85, 255, 255])
-        
-        blue_lower = np.array([100, 50, 50])
-        blue_upper = np.array([130, 255, 255])
-        
-        # Calculate color percentages
-        green_mask = cv2.inRange(hsv, green_lower, green_upper)
-        blue_mask = cv2.inRange(hsv, blue_lower, blue_upper)
-        
-        total_pixels = image_array.shape[0] * image_array.shape[1]
-        green_percentage = np.sum(green_mask > 0) / total_pixels
-        blue_percentage = np.sum(blue_mask > 0) / total_pixels
-        
-        # Generate analysis based on color distribution
-        objects = []
-        if green_percentage > 0.1:
-            objects.append({
-                "object": "vegetation",
-                "confidence": min(0.9, green_percentage * 3),
-                "bbox": [0, 0, image_array.shape[1], image_array.shape[0]]
-            })
-        
-        if blue_percentage > 0.05:
-            objects.append({
-                "object": "sky",
-                "confidence": min(0.8, blue_percentage * 4),
-                "bbox": [0, 0, image_array.shape[1], int(image_array.shape[0] * 0.6)]
-            })
-        
-        # Calculate environmental score
-        environmental_score = (
-            green_percentage * 4 +  # Vegetation weight
-            blue_percentage * 2 +   # Sky weight
-            (1 - max(green_percentage + blue_percentage, 1)) * 1  # Urban penalty
-        ) * 10
-        
-        environmental_score = max(1, min(10, environmental_score))
-        
-        recommendations = []
-        if green_percentage > 0.3:
-            recommendations.append("Great natural environment with abundant vegetation!")
-        if blue_percentage > 0.2:
-            recommendations.append("Clear sky indicates good air quality conditions.")
-        if environmental_score > 7:
-            recommendations.append("This location shows excellent environmental conditions.")
-        
-        return {
-            "objects": objects,
-            "features": {
-                "vegetation_coverage": round(green_percentage, 2),
-                "sky_visibility": round(blue_percentage, 2),
-                "dominant_colors": ["green", "blue"] if green_percentage > 0.1 else ["urban"]
-            },
-            "vegetation_confidence": min(0.9, green_percentage * 2),
-            "air_quality_confidence": min(0.8, blue_percentage * 3),
-            "environmental_score": round(environmental_score, 1),
-            "recommendations": recommendations
-        }
-    
-    async def get_personalized_recommendations(self, user_id: str, location: Optional[str] = None, category: Optional[str] = None) -> Dict[str, Any]:
-        """Generate personalized environmental recommendations"""
-        # This would typically use user history and ML models
-        # For now, return smart defaults based on location and category
+    async def get_personalized_recommendations(self, user_id: str, location: Optional[str] = None,
+                                               category: Optional[str] = None, db=None) -> Dict[str, Any]:
+        """Generate recommendations ranked against the user's own activity history"""
+        ranked = self.recommender.recommend(user_id, db=db, category=category)
+        profile = ranked["profile"]
         
         recommendations = {
             "daily_tips": [],
             "weekly_challenges": [],
-            "location_specific": []
+            "location_specific": [],
+            "profile": profile
         }
         
-        # Category-specific recommendations
-        if category == "transportation" or not category:
+        for suggestion in ranked["suggestions"]:
             recommendations["daily_tips"].append({
-                "category": "transportation",
-                "tip": "Consider carpooling or using public transport for your commute",
-                "impact": "Save 2-5 kg CO2 per day",
-                "difficulty": "medium",
-                "personalized": True
+                "category": suggestion["category"],
+                "tip": f"{suggestion['title']}: {suggestion['description']}",
+                "impact": suggestion["impact"],
+                "difficulty": suggestion["difficulty"].lower(),
+                "icon": suggestion.get("icon"),
+                "score": suggestion["score"],
+                "personalized": profile["personalized"]
             })
         
-        if category == "energy" or not category:
-            recommendations["daily_tips"].append({
-                "category": "energy",
-                "tip": "Unplug devices when not in use to reduce phantom energy consumption",
-                "impact": "Save 0.5-1 kg CO2 per day",
-                "difficulty": "easy",
-                "personalized": True
+        # Weekly challenge aimed at the user's largest (or rising) emission category
+        focus = (profile["rising_categories"] or [profile["top_category"]])[0]
+        if focus:
+            recommendations["weekly_challenges"].append({
+                "title": f"Cut {focus} emissions this week",
+                "description": f"{focus.title()} makes up {profile['category_shares'][focus]:.0%} of your "
+                               f"last 30 days of emissions - try one of today's tips every day",
+                "potential_impact": "Save 3-7 kg CO2",
+                "category": focus
+            })
+        else:
+            recommendations["weekly_challenges"].append({
+                "title": "Zero Waste Week",
+                "description": "Try to minimize waste by reusing and recycling",
+                "potential_impact": "Save 3-7 kg CO2",
+                "category": "waste"
             })
-        
-        # Weekly challenges
-        recommendations["weekly_challenges"].append({
-            "title": "Zero Waste Week",
-            "description": "Try to minimize waste by reusing and recycling",
-            "potential_impact": "Save 3-7 kg CO2",
-            "category": "waste"
-        })
         
         # Location-specific (if provided)
         if location:
@@ -343,12 +590,25 @@ class MLService:
         status = {}
         
         # Climate model status
-        if self.climate_model and self.scaler:
+        if self.model_state in ("not_loaded", "loading"):
+            status["climate_forecast"] = {
+                "status": self.model_state,
+                "note": "Models load in the background after startup"
+            }
+        elif self.climate_model and self.scaler:
+            metadata = self.model_metadata
             status["climate_forecast"] = {
                 "status": "active",
-                "model_type": "RandomForestRegressor",
-                "features": ["temperature", "aqi"],
-                "last_updated": datetime.utcnow().isoformat()
+                "load_seconds": self.load_duration_seconds,
+                "version": metadata.get("version"),
+                "registry_current": self.registry.current_version(FORECAST_MODEL_NAME),
+                "model_type": metadata.get("model_type", "RandomForestRegressor"),
+                "features": metadata.get("features", FORECAST_FEATURES),
+                "targets": metadata.get("targets", ["temperature", "aqi"]),
+                "trained_at": metadata.get("trained_at"),
+                "sha256": metadata.get("sha256"),
+                "source": metadata.get("source"),
+                "forecast_cache": {**self.forecast_cache_stats, "entries": len(self._forecast_cache)}
             }
         else:
             status["climate_forecast"] = {
@@ -366,8 +626,9 @@ class MLService:
         # Recommendations status
         status["recommendations"] = {
             "status": "active",
-            "method": "rule_based",
-            "personalization": "basic"
+            "method": "activity_profile_similarity",
+            "personalization": "carbon_activity_history",
+            **self.recommender.get_stats()
         }
         
         return status
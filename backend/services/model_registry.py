@@ -0,0 +1,153 @@
+"""
+Model Registry - versioned, checksummed model artifacts on local disk
+
+Layout under the registry root:
+
+    <name>/CURRENT                      active version id (replaced atomically)
+    <name>/<version>/artifact.joblib    uncompressed joblib dump
+    <name>/<version>/metadata.json      version, trained_at, sha256, extra metadata
+
+Artifacts are loaded with joblib mmap_mode='r', so numpy buffers inside them
+are memory-mapped and shared between uvicorn workers through the page cache.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+ARTIFACT_FILE = "artifact.joblib"
+METADATA_FILE = "metadata.json"
+CURRENT_FILE = "CURRENT"
+
+
+class ModelRegistryError(Exception):
+    """Raised for missing versions or artifacts that fail checksum verification"""
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _atomic_write_text(path: Path, text: str):
+    """Write via a temp file and os.replace so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+class ModelRegistry:
+    """Publishes, lists, activates and loads versioned model artifacts"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _model_dir(self, name: str) -> Path:
+        return self.root / name
+
+    def list_versions(self, name: str) -> List[Dict[str, Any]]:
+        """Metadata of every published version, oldest first"""
+        model_dir = self._model_dir(name)
+        if not model_dir.exists():
+            return []
+
+        versions = []
+        for version_dir in model_dir.iterdir():
+            metadata_path = version_dir / METADATA_FILE
+            if version_dir.is_dir() and metadata_path.exists():
+                with open(metadata_path, "r", encoding="utf-8") as f:
+                    versions.append(json.load(f))
+        return sorted(versions, key=lambda m: m.get("sequence", 0))
+
+    def current_version(self, name: str) -> Optional[str]:
+        current_path = self._model_dir(name) / CURRENT_FILE
+        if not current_path.exists():
+            return None
+        return current_path.read_text(encoding="utf-8").strip() or None
+
+    def get_metadata(self, name: str, version: str) -> Dict[str, Any]:
+        metadata_path = self._model_dir(name) / version / METADATA_FILE
+        if not metadata_path.exists():
+            raise ModelRegistryError(f"Model '{name}' has no version '{version}'")
+        with open(metadata_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def publish(self, name: str, artifact: Any, metadata: Optional[Dict[str, Any]] = None,
+                activate: bool = True) -> Dict[str, Any]:
+        """Store a new version of an artifact and optionally make it current"""
+        import joblib
+
+        model_dir = self._model_dir(name)
+        model_dir.mkdir(parents=True, exist_ok=True)
+
+        # Sequential version ids; mkdir without exist_ok claims the id atomically
+        sequence = max((m.get("sequence", 0) for m in self.list_versions(name)), default=0) + 1
+        while True:
+            version = f"v{sequence}"
+            version_dir = model_dir / version
+            try:
+                version_dir.mkdir()
+                break
+            except FileExistsError:
+                sequence += 1
+
+        artifact_path = version_dir / ARTIFACT_FILE
+        joblib.dump(artifact, artifact_path)  # uncompressed so it can be memory-mapped
+
+        record = {
+            "name": name,
+            "version": version,
+            "sequence": sequence,
+            "trained_at": datetime.utcnow().isoformat(),
+            **(metadata or {}),
+            "published_at": datetime.utcnow().isoformat(),
+            "sha256": file_sha256(artifact_path),
+            "size_bytes": artifact_path.stat().st_size
+        }
+        _atomic_write_text(version_dir / METADATA_FILE, json.dumps(record, indent=2))
+        logger.info("Published model version", name=name, version=version)
+
+        if activate:
+            self.activate(name, version)
+        return record
+
+    def activate(self, name: str, version: str) -> Dict[str, Any]:
+        """Point CURRENT at an existing version"""
+        metadata = self.get_metadata(name, version)
+        _atomic_write_text(self._model_dir(name) / CURRENT_FILE, version)
+        logger.info("Activated model version", name=name, version=version)
+        return metadata
+
+    def load(self, name: str, version: Optional[str] = None, mmap: bool = True,
+             verify: bool = True) -> Tuple[Any, Dict[str, Any]]:
+        """Load an artifact (the current version by default) and its metadata"""
+        import joblib
+
+        version = version or self.current_version(name)
+        if version is None:
+            raise ModelRegistryError(f"Model '{name}' has no published versions")
+
+        metadata = self.get_metadata(name, version)
+        artifact_path = self._model_dir(name) / version / ARTIFACT_FILE
+        if not artifact_path.exists():
+            raise ModelRegistryError(f"Artifact missing for {name} {version}")
+        if verify and file_sha256(artifact_path) != metadata.get("sha256"):
+            raise ModelRegistryError(f"Checksum mismatch for {name} {version}")
+
+        artifact = joblib.load(artifact_path, mmap_mode="r" if mmap else None)
+        return artifact, metadata
@@ -0,0 +1,326 @@
+"""
+Product Catalogue - indexed search over the EcoMarket product list
+
+Built once when the products are loaded, so a search never scans product
+dicts:
+
+    text      tokenized inverted index over name, brand, tags and description.
+              Postings for all terms are stored in one array in vocabulary
+              order, so every term starting with a prefix is one contiguous
+              slice, and each posting carries its precomputed BM25 weight.
+    filters   boolean masks per category, per eco feature and for in-stock;
+              price and rating ranges come from sorted arrays via searchsorted
+    sorting   product orders for each sort key are precomputed; a sorted
+              result is that order filtered by the match mask
+    facets    counts per category, eco feature, price range and rating from
+              the same filter masks, each facet ignoring its own filter so the
+              alternatives to a selection keep their counts
+
+Every query token must match (as a prefix of) some indexed term, and the
+`relevance` sort ranks by BM25 score, keeping catalogue order when there is
+no query.
+"""
+import bisect
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Field weights: a term in the name counts as much as three in the description
+FIELD_WEIGHTS = {"name": 3, "brand": 2, "tags": 2, "description": 1}
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Price facet buckets (INR): [edge, next edge), the last one open-ended
+PRICE_BUCKET_EDGES = [0, 1000, 2500, 5000, 10000]
+# Rating facet: products rated at least each threshold
+RATING_THRESHOLDS = [4.5, 4.0, 3.5, 3.0]
+
+SORT_KEYS = {
+    "price-low": ("price", False),
+    "price-high": ("price", True),
+    "rating": ("rating", True),
+    "eco-score": ("ecoScore", True),
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _product_text(product: Dict[str, Any], field: str) -> str:
+    value = product.get(field) or ""
+    return " ".join(value) if isinstance(value, list) else str(value)
+
+
+def _intersect(masks: List[np.ndarray], n: int) -> np.ndarray:
+    if not masks:
+        return np.ones(n, dtype=bool)
+    mask = masks[0].copy()
+    for other in masks[1:]:
+        mask &= other
+    return mask
+
+
+class ProductCatalogue:
+    """Immutable search index over a list of product dicts"""
+
+    def __init__(self, products: List[Dict[str, Any]]):
+        self.products = list(products)
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        for product in self.products:
+            self._by_id.setdefault(product.get("id"), product)
+
+        self.price = np.array([p.get("price", 0) or 0 for p in self.products], dtype=np.float64)
+        self.rating = np.array([p.get("rating", 0) or 0 for p in self.products], dtype=np.float64)
+        eco_score = np.array([p.get("ecoScore", 0) or 0 for p in self.products], dtype=np.float64)
+        self.in_stock = np.array([bool(p.get("inStock", False)) for p in self.products], dtype=bool)
+
+        categories: Dict[str, List[int]] = {}
+        features: Dict[str, List[int]] = {}
+        self.subcategories: Dict[str, List[str]] = {}
+        for position, product in enumerate(self.products):
+            category = product.get("category")
+            if category is not None:
+                categories.setdefault(category, []).append(position)
+                subcategories = self.subcategories.setdefault(category, [])
+                if product.get("subCategory") and product["subCategory"] not in subcategories:
+                    subcategories.append(product["subCategory"])
+            for feature_type in dict.fromkeys(f.get("type") for f in product.get("ecoFeatures", [])):
+                if feature_type is not None:
+                    features.setdefault(feature_type, []).append(position)
+        self.category_masks = {name: self._mask(positions) for name, positions in categories.items()}
+        self.feature_masks = {name: self._mask(positions) for name, positions in features.items()}
+
+        # Facet value masks; every facet count is one of these intersected with the filters
+        bounds = [-np.inf] + PRICE_BUCKET_EDGES[1:] + [np.inf]
+        self.price_bucket_masks = [(self.price >= low) & (self.price < high) for low, high in zip(bounds, bounds[1:])]
+        self.rating_masks = [self.rating >= threshold for threshold in RATING_THRESHOLDS]
+
+        # Ascending orders for range lookups; stable so ties keep catalogue order
+        self._price_order = np.argsort(self.price, kind="stable")
+        self._price_sorted = self.price[self._price_order]
+        self._rating_order = np.argsort(self.rating, kind="stable")
+        self._rating_sorted = self.rating[self._rating_order]
+
+        values = {"price": self.price, "rating": self.rating, "ecoScore": eco_score}
+        self._sort_orders = {
+            key: np.argsort(-values[field] if descending else values[field], kind="stable")
+            for key, (field, descending) in SORT_KEYS.items()
+        }
+
+        self._build_text_index()
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def _mask(self, positions) -> np.ndarray:
+        mask = np.zeros(len(self.products), dtype=bool)
+        mask[positions] = True
+        return mask
+
+    def _build_text_index(self):
+        n = len(self.products)
+        tokens, token_counts, token_weights = [], [], []
+        for product in self.products:
+            for field, weight in FIELD_WEIGHTS.items():
+                field_tokens = tokenize(_product_text(product, field))
+                tokens.extend(field_tokens)
+                token_counts.append(len(field_tokens))
+                token_weights.append(weight)
+        token_counts = np.array(token_counts, dtype=np.int64)
+        token_docs = np.repeat(np.repeat(np.arange(n), len(FIELD_WEIGHTS)), token_counts)
+        token_weights = np.repeat(np.array(token_weights, dtype=np.float64), token_counts)
+
+        # Number terms in sorted order so a prefix covers a contiguous id range
+        first_seen: Dict[str, int] = {}
+        token_ids = np.array([first_seen.setdefault(token, len(first_seen)) for token in tokens], dtype=np.int64)
+        self.vocabulary = sorted(first_seen)
+        rank = np.empty(len(first_seen), dtype=np.int64)
+        rank[[first_seen[term] for term in self.vocabulary]] = np.arange(len(first_seen))
+
+        # One posting per (term, product), ordered by term then product
+        keys = rank[token_ids] * max(n, 1) + token_docs
+        keys, inverse = np.unique(keys, return_inverse=True)
+        tf = np.bincount(inverse, weights=token_weights, minlength=len(keys))
+        terms, docs = np.divmod(keys, max(n, 1))
+
+        lengths = np.bincount(token_docs, weights=token_weights, minlength=n)
+        average_length = lengths.mean() if n and lengths.mean() > 0 else 1.0
+        document_frequency = np.bincount(terms, minlength=len(self.vocabulary))
+        idf = np.log(1 + (n - document_frequency + 0.5) / (document_frequency + 0.5))
+        norms = BM25_K1 * (1 - BM25_B + BM25_B * lengths / average_length)
+
+        self._posting_docs = docs.astype(np.int32)
+        self._posting_weights = idf[terms] * tf * (BM25_K1 + 1) / (tf + norms[docs])
+        self._term_offsets = np.concatenate([[0], np.cumsum(document_frequency)]).astype(np.int64)
+
+    def _prefix_postings(self, prefix: str) -> slice:
+        """Posting range of every term starting with prefix"""
+        first = bisect.bisect_left(self.vocabulary, prefix)
+        # U+FFFF sorts after any character a token can contain
+        last = bisect.bisect_left(self.vocabulary, prefix + "\uffff", first)
+        return slice(self._term_offsets[first], self._term_offsets[last])
+
+    def _text_scores(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(matched mask, BM25 score) per product; a product matches when every token does"""
+        n = len(self.products)
+        matched, scores = np.zeros(n, dtype=bool), np.zeros(n)
+        for i, token in enumerate(dict.fromkeys(tokenize(query))):
+            postings = self._prefix_postings(token)
+            token_scores = np.bincount(self._posting_docs[postings], weights=self._posting_weights[postings],
+                                       minlength=n)
+            # BM25 weights are positive, so a product matched the token iff it scored
+            if i == 0:
+                matched, scores = token_scores > 0, token_scores
+            else:
+                matched &= token_scores > 0
+                scores += token_scores
+        return matched, scores
+
+    def _range_mask(self, values: np.ndarray, order: np.ndarray, sorted_values: np.ndarray,
+                    low: Optional[float], high: Optional[float]) -> np.ndarray:
+        first = np.searchsorted(sorted_values, low, side="left") if low is not None else 0
+        last = np.searchsorted(sorted_values, high, side="right") if high is not None else len(sorted_values)
+        if last - first > len(values) // 8:
+            # A wide range is cheaper to test directly than to scatter
+            return (values >= sorted_values[first]) & (values <= sorted_values[last - 1])
+        return self._mask(order[first:last])
+
+    def get(self, product_id: str) -> Optional[Dict[str, Any]]:
+        return self._by_id.get(product_id)
+
+    def match(self, query: str = "", category: Optional[str] = None,
+              min_price: Optional[float] = None, max_price: Optional[float] = None,
+              eco_features: Optional[Iterable[str]] = None, min_rating: Optional[float] = None,
+              in_stock: bool = False) -> Dict[str, Any]:
+        """Mask of products passing every filter, the mask of each filter and the text
+        scores (None without a query)"""
+        n = len(self.products)
+        filters, scores = {}, None
+        if query:
+            filters["query"], scores = self._text_scores(query)
+        if category:
+            filters["category"] = self.category_masks.get(category, np.zeros(n, dtype=bool))
+        if min_price is not None or max_price is not None:
+            filters["price"] = self._range_mask(self.price, self._price_order, self._price_sorted,
+                                                min_price, max_price)
+        if eco_features:
+            present = [self.feature_masks[f] for f in eco_features if f in self.feature_masks]
+            filters["eco_features"] = np.logical_or.reduce(present) if present else np.zeros(n, dtype=bool)
+        if min_rating:
+            filters["rating"] = self._range_mask(self.rating, self._rating_order, self._rating_sorted,
+                                                 min_rating, None)
+        if in_stock:
+            filters["in_stock"] = self.in_stock
+
+        return {"mask": _intersect(list(filters.values()), n), "filters": filters, "scores": scores}
+
+    def facets(self, filters: Dict[str, np.ndarray]) -> Dict[str, List[Dict[str, Any]]]:
+        """Facet counts for a match() result; each facet counts the products passing every other filter"""
+
+        def counts(value_masks: Iterable[np.ndarray], facet: str) -> List[int]:
+            """Products with each value among those passing every filter except the facet's own"""
+            others = [mask for name, mask in filters.items() if name != facet]
+            if not others:
+                return [int(np.count_nonzero(mask)) for mask in value_masks]
+            passing = _intersect(others, len(self.products))
+            return [int(np.count_nonzero(mask & passing)) for mask in value_masks]
+
+        def ranked(labels: Iterable[str], values: List[int], key: str) -> List[Dict[str, Any]]:
+            """Values with at least one product, most products first"""
+            pairs = sorted(zip(labels, values), key=lambda pair: -pair[1])
+            return [{key: label, "count": count} for label, count in pairs if count > 0]
+
+        edges = PRICE_BUCKET_EDGES + [None]
+        price_counts = counts(self.price_bucket_masks, "price")
+        rating_counts = counts(self.rating_masks, "rating")
+        return {
+            "categories": ranked(self.category_masks, counts(self.category_masks.values(), "category"), "name"),
+            "ecoFeatures": ranked(self.feature_masks, counts(self.feature_masks.values(), "eco_features"), "type"),
+            "priceRanges": [
+                {"min": edges[i], "max": edges[i + 1], "count": count} for i, count in enumerate(price_counts)
+            ],
+            "ratings": [
+                {"minRating": threshold, "count": count} for threshold, count in zip(RATING_THRESHOLDS, rating_counts)
+            ]
+        }
+
+    def category_summary(self) -> List[Dict[str, Any]]:
+        """Every category with its product count and subcategories, in catalogue order"""
+        return [
+            {"name": name, "count": int(self.category_masks[name].sum()),
+             "subcategories": list(self.subcategories.get(name, []))}
+            for name in self.category_masks
+        ]
+
+    def search(self, query: str = "", category: Optional[str] = None,
+               min_price: Optional[float] = None, max_price: Optional[float] = None,
+               eco_features: Optional[Iterable[str]] = None, min_rating: Optional[float] = None,
+               in_stock: bool = False, sort_by: str = "relevance",
+               page: int = 1, limit: int = 12, facets: bool = False) -> Dict[str, Any]:
+        """Filtered, sorted page of products in the shape the product endpoints return,
+        with facet counts for the same filters if requested"""
+        matched = self.match(query, category, min_price, max_price, eco_features, min_rating, in_stock)
+        mask, scores = matched["mask"], matched["scores"]
+
+        start_idx = (page - 1) * limit
+        end_idx = start_idx + limit
+        total = int(np.count_nonzero(mask))
+        if scores is not None and sort_by not in self._sort_orders:
+            positions = np.flatnonzero(mask)
+            positions = self._rank(positions, scores[positions], max(end_idx, 0))
+        else:
+            positions = self._first_matches(self._sort_orders.get(sort_by), mask, total, max(end_idx, 0))
+
+        result = {
+            "products": [self.products[i] for i in positions[max(start_idx, 0):max(end_idx, 0)]],
+            "totalCount": total,
+            "page": page,
+            "limit": limit,
+            "hasNext": end_idx < total,
+            "hasPrev": page > 1
+        }
+        if facets:
+            result["facets"] = self.facets(matched["filters"])
+        return result
+
+    @staticmethod
+    def _first_matches(order: Optional[np.ndarray], mask: np.ndarray, total: int, needed: int) -> np.ndarray:
+        """The first needed matching positions in order (catalogue order if None)"""
+        n = len(mask)
+        if needed >= total:
+            return np.flatnonzero(mask) if order is None else order[mask[order]]
+        # Walk the order in growing chunks sized from the match density
+        found, count, start = [], 0, 0
+        step = max(256, 2 * needed * n // max(total, 1))
+        while count < needed and start < n:
+            if order is None:
+                hits = start + np.flatnonzero(mask[start:start + step])
+            else:
+                chunk = order[start:start + step]
+                hits = chunk[mask[chunk]]
+            found.append(hits)
+            count += len(hits)
+            start += step
+            step *= 2
+        return np.concatenate(found)
+
+    @staticmethod
+    def _rank(positions: np.ndarray, scores: np.ndarray, top: int) -> np.ndarray:
+        """The top best-scoring positions (ascending) by descending score, ties in catalogue order"""
+        if top <= 0:
+            return positions[:0]
+        if top < len(positions):
+            threshold = np.partition(scores, len(scores) - top)[len(scores) - top]
+            keep = scores > threshold
+            # Of the products tied at the threshold, the earliest in the catalogue make the cut
+            ties = np.flatnonzero(scores == threshold)[:top - int(np.count_nonzero(keep))]
+            keep[ties] = True
+            positions, scores = positions[keep], scores[keep]
+        return positions[np.argsort(-scores, kind="stable")]
+
@@ -0,0 +1,229 @@
+"""
+Weather Aggregates - mergeable summaries of the Indian weather dataset
+
+Every summary the Indian climate API serves is derived from per-key
+statistics that merge by addition: count, sum, sum of squares, min and max
+of each metric, keyed by city, state and month. Folding in a batch of new
+observations groups only the new rows and merges the result, so appending a
+day of readings costs O(new rows) instead of reprocessing years of history.
+Means and standard deviations are read off the merged totals.
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+METRICS = ["Temperature", "Humidity", "Rainfall", "Wind_Speed", "Pressure"]
+
+# Rows of the (5, n_metrics) block kept per key
+COUNT, SUM, SUMSQ, MIN, MAX = range(5)
+
+
+class MergeableStats:
+    """count, sum, sum of squares, min and max of several metrics per key"""
+
+    def __init__(self, metrics: Iterable[str]):
+        self.metrics = list(metrics)
+        self.blocks: Dict[Any, np.ndarray] = {}
+
+    def update(self, keys, values: pd.DataFrame):
+        """Group values (columns = self.metrics) by keys and merge the partial totals"""
+        if values.empty:
+            return
+        values = values[self.metrics].astype(np.float64)
+        grouped = values.groupby(keys, sort=False, observed=True)
+        counts = grouped.count()
+        squares = (values ** 2).groupby(keys, sort=False, observed=True).sum()
+        partial = np.stack([
+            counts.to_numpy(dtype=np.float64),
+            grouped.sum().to_numpy(),
+            squares.to_numpy(),
+            grouped.min().to_numpy(),
+            grouped.max().to_numpy(),
+        ], axis=1)
+        for key, block in zip(counts.index, partial):
+            self.merge_block(key, block)
+
+    def merge_block(self, key, block: np.ndarray):
+        current = self.blocks.get(key)
+        if current is None:
+            self.blocks[key] = block.copy()
+            return
+        current[COUNT:MIN] += block[COUNT:MIN]
+        # fmin/fmax skip the NaN of a metric that had no readings
+        current[MIN] = np.fmin(current[MIN], block[MIN])
+        current[MAX] = np.fmax(current[MAX], block[MAX])
+
+    def merge(self, other: "MergeableStats"):
+        for key, block in other.blocks.items():
+            self.merge_block(key, block)
+
+    def copy(self) -> "MergeableStats":
+        stats = MergeableStats(self.metrics)
+        stats.blocks = {key: block.copy() for key, block in self.blocks.items()}
+        return stats
+
+    def get(self, key, metric: str) -> Optional[Dict[str, float]]:
+        """count/sum/mean/std/min/max of one metric for one key"""
+        block = self.blocks.get(key)
+        if block is None or metric not in self.metrics:
+            return None
+        column = block[:, self.metrics.index(metric)]
+        count = column[COUNT]
+        if count == 0:
+            return {"count": 0, "sum": 0.0, "mean": None, "std": None, "min": None, "max": None}
+        mean = column[SUM] / count
+        variance = max(column[SUMSQ] / count - mean ** 2, 0.0)
+        return {
+            "count": int(count),
+            "sum": float(column[SUM]),
+            "mean": float(mean),
+            "std": float(np.sqrt(variance)),
+            "min": float(column[MIN]),
+            "max": float(column[MAX]),
+        }
+
+    def value(self, key, metric: str, stat: str, digits: int, default=0):
+        stats = self.get(key, metric)
+        if not stats or stats[stat] is None:
+            return default
+        return round(stats[stat], digits)
+
+
+class WeatherSummary:
+    """Per-city, per-state and per-month statistics plus each city's latest reading"""
+
+    def __init__(self, metrics: Iterable[str] = METRICS):
+        self.by_city = MergeableStats(metrics)
+        self.by_state = MergeableStats(metrics)
+        self.by_month = MergeableStats(metrics)
+        self.latest: Dict[str, Dict[str, Any]] = {}
+        self.state_cities: Dict[str, set] = {}
+        self.rows = 0
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "WeatherSummary":
+        summary = cls([metric for metric in METRICS if metric in frame.columns])
+        summary.add(frame)
+        return summary
+
+    def copy(self) -> "WeatherSummary":
+        """Independent copy (O(keys)) to fold new rows into while the original is being served"""
+        summary = WeatherSummary(self.by_city.metrics)
+        summary.by_city, summary.by_state, summary.by_month = (
+            self.by_city.copy(), self.by_state.copy(), self.by_month.copy())
+        summary.latest = {city: dict(record) for city, record in self.latest.items()}
+        summary.state_cities = {state: set(cities) for state, cities in self.state_cities.items()}
+        summary.rows = self.rows
+        return summary
+
+    def add(self, frame: pd.DataFrame):
+        """Fold a batch of rows (Date parsed, any order) into every summary"""
+        if frame.empty:
+            return
+        for metric in self.by_city.metrics:
+            if metric not in frame.columns:
+                frame = frame.assign(**{metric: np.nan})
+
+        self.rows += len(frame)
+        if "City" in frame.columns:
+            self.by_city.update(frame["City"].astype(str), frame)
+            self._update_latest(frame)
+        if "State" in frame.columns:
+            states = frame["State"].astype(str)
+            self.by_state.update(states, frame)
+            if "City" in frame.columns:
+                pairs = pd.DataFrame({"state": states, "city": frame["City"].astype(str)}).drop_duplicates()
+                for state, city in pairs.itertuples(index=False):
+                    self.state_cities.setdefault(state, set()).add(city)
+        if "Date" in frame.columns:
+            self.by_month.update(frame["Date"].dt.month, frame)
+
+    def _update_latest(self, frame: pd.DataFrame):
+        if "Date" in frame.columns:
+            last_rows = frame.sort_values("Date", kind="mergesort").groupby(
+                frame["City"].astype(str), sort=False, observed=True).tail(1)
+        else:
+            last_rows = frame.groupby(frame["City"].astype(str), sort=False, observed=True).tail(1)
+
+        for record in last_rows.to_dict("records"):
+            city = str(record["City"])
+            current = self.latest.get(city)
+            if current is None or "Date" not in record or record["Date"] >= current["Date"]:
+                self.latest[city] = record
+
+    # Views served as IndianWeatherService.processed_data
+
+    def cities_overview(self, known_cities: Dict[str, Dict[str, float]]) -> List[Dict[str, Any]]:
+        cities_data = []
+        for city in sorted(self.latest):
+            latest = self.latest[city]
+            cities_data.append({
+                'city': city,
+                'state': latest.get('State', 'Unknown'),
+                'lat': as_float(latest.get('Latitude'), known_cities.get(city, {}).get('lat', 0)),
+                'lon': as_float(latest.get('Longitude'), known_cities.get(city, {}).get('lon', 0)),
+                'temperature': as_float(latest.get('Temperature'), 0),
+                'humidity': as_float(latest.get('Humidity'), 0),
+                'rainfall': as_float(latest.get('Rainfall'), 0),
+                'wind_speed': as_float(latest.get('Wind_Speed'), 0),
+                'pressure': as_float(latest.get('Pressure'), 1013)
+            })
+        return cities_data
+
+    def monthly_trends(self) -> Dict[str, Dict[int, float]]:
+        months = sorted(self.by_month.blocks)
+        if not months:
+            return {}
+        return {
+            'temperature': {int(m): self.by_month.value(m, 'Temperature', 'mean', 2) for m in months},
+            'humidity': {int(m): self.by_month.value(m, 'Humidity', 'mean', 2) for m in months},
+            'rainfall': {int(m): self.by_month.value(m, 'Rainfall', 'sum', 2) for m in months}
+        }
+
+    def current_conditions(self) -> Dict[str, Any]:
+        """Averages over the latest reading of every city"""
+        if not self.latest:
+            return {}
+        latest = list(self.latest.values())
+
+        def mean(metric):
+            values = [as_float(record.get(metric), np.nan) for record in latest]
+            return round(float(np.nanmean(values)), 1) if not np.isnan(values).all() else 0
+
+        dates = [record['Date'] for record in latest if 'Date' in record]
+        return {
+            'avg_temperature': mean('Temperature'),
+            'avg_humidity': mean('Humidity'),
+            'total_rainfall': round(float(np.nansum([as_float(r.get('Rainfall'), 0) for r in latest])), 2),
+            'date': max(dates).isoformat() if dates else datetime.now().isoformat()
+        }
+
+    def regional_summary(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            state: {
+                'avg_temperature': self.by_state.value(state, 'Temperature', 'mean', 1),
+                'avg_humidity': self.by_state.value(state, 'Humidity', 'mean', 1),
+                'total_rainfall': self.by_state.value(state, 'Rainfall', 'sum', 2),
+                'cities_count': len(self.state_cities.get(state, ()))
+            }
+            for state in sorted(self.by_state.blocks)
+        }
+
+    def city_historical(self, city: str) -> Dict[str, float]:
+        return {
+            'avg_temperature': self.by_city.value(city, 'Temperature', 'mean', 1),
+            'max_temperature': self.by_city.value(city, 'Temperature', 'max', 1),
+            'min_temperature': self.by_city.value(city, 'Temperature', 'min', 1),
+            'total_rainfall': self.by_city.value(city, 'Rainfall', 'sum', 2)
+        }
+
+
+def as_float(value, default) -> float:
+    """float(value), or default for missing/NaN readings"""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return default
+    return default if np.isnan(value) else value
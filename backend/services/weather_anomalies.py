@@ -0,0 +1,356 @@
+"""
+Weather Anomalies - seasonal baselines and anomaly detection for the Indian weather dataset
+
+Readings are laid out on a dense (city x day) grid. Each city gets a
+day-of-year climatology from it: the mean and standard deviation of every day
+over all years, smoothed with a circular rolling window so that a baseline day
+also draws on its neighbours. Every day is then scored against its city's
+baseline in whole-array passes:
+
+    temperature_high/low  runs of days with a temperature z-score beyond +/-TEMPERATURE_Z
+    heatwave              HEATWAVE_MIN_DAYS or more consecutive days with z >= HEATWAVE_Z
+    rainfall_deficit      runs of days whose trailing DEFICIT_WINDOW_DAYS rainfall is at
+                          least DEFICIT_FRACTION below the climatological total for that window
+
+Each run is collapsed to one row (start, end, days and its peak day). The rows
+form an AnomalyTable: grouped by city in start-date order with a city -> row
+range index, and persisted as a WeatherStore so the alert engine and chatbot
+read it without recomputing baselines.
+"""
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from services.weather_store import WeatherStore, sort_by_city_and_date
+
+logger = logging.getLogger(__name__)
+
+# Day-of-year bins (index 365 only occurs in leap years) and the smoothing window
+DOY_BINS = 366
+CLIMATOLOGY_WINDOW_DAYS = 15
+# Readings a smoothed baseline day needs before it is trusted
+MIN_BASELINE_SAMPLES = 10
+
+TEMPERATURE_Z = 2.5
+HEATWAVE_Z = 1.5
+HEATWAVE_MIN_DAYS = 3
+
+DEFICIT_WINDOW_DAYS = 30
+DEFICIT_FRACTION = 0.6
+# Windows that normally see less rain than this cannot be in deficit (dry season)
+DEFICIT_MIN_NORMAL_MM = 25.0
+# Share of the window's days that need a rainfall reading
+DEFICIT_MIN_COVERAGE = 0.8
+
+ANOMALY_TYPES = ["temperature_high", "temperature_low", "heatwave", "rainfall_deficit"]
+SEVERITIES = ["moderate", "high"]
+
+# Days an anomaly stays "recent" after it ends, counted back from the city's latest reading
+RECENT_DAYS = 14
+
+
+def _circular_window_sum(values: np.ndarray, window: int, centered: bool = True) -> np.ndarray:
+    """Rolling sum along the last axis wrapping around the year (centered or trailing)"""
+    before = window // 2 if centered else window - 1
+    after = window - 1 - before
+    padded = np.concatenate([values[:, values.shape[1] - before:], values, values[:, :after]], axis=1)
+    totals = np.cumsum(padded, axis=1)
+    totals = np.concatenate([np.zeros((values.shape[0], 1)), totals], axis=1)
+    return totals[:, window:] - totals[:, :-window]
+
+
+def _trailing_window_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sum along the last axis over each day and the window - 1 days before it"""
+    totals = np.cumsum(values, axis=1)
+    shifted = np.zeros_like(totals)
+    shifted[:, window:] = totals[:, :-window]
+    return totals - shifted
+
+
+class DailyGrid:
+    """Daily (city x day) arrays of each metric; NaN where a city has no reading"""
+
+    def __init__(self, frame: pd.DataFrame, metrics: Iterable[str] = ("Temperature", "Rainfall")):
+        codes, cities = pd.factorize(frame["City"].astype(str), sort=True)
+        days = frame["Date"].to_numpy().astype("datetime64[D]")
+        self.cities = [str(city) for city in cities]
+        self.first_day = days.min()
+        offsets = (days - self.first_day).astype(np.int64)
+        self.n_days = int(offsets.max()) + 1
+        self.dates = self.first_day + np.arange(self.n_days)
+        self.doy = (self.dates - self.dates.astype("datetime64[Y]")).astype(np.int64)
+
+        if "State" in frame.columns:
+            states = pd.Series(frame["State"].astype(str).to_numpy()).groupby(codes).first()
+            self.states = [states.get(code, "Unknown") for code in range(len(self.cities))]
+        else:
+            self.states = ["Unknown"] * len(self.cities)
+
+        # Several readings on one day are averaged (rainfall is summed)
+        cells = codes * self.n_days + offsets
+        size = len(self.cities) * self.n_days
+        self.values = {}
+        for metric in metrics:
+            if metric not in frame.columns:
+                continue
+            values = frame[metric].to_numpy(dtype=np.float64)
+            present = ~np.isnan(values)
+            counts = np.bincount(cells[present], minlength=size)
+            totals = np.bincount(cells[present], weights=values[present], minlength=size)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                grid = totals if metric == "Rainfall" else totals / counts
+            grid = np.where(counts > 0, grid, np.nan)
+            self.values[metric] = grid.reshape(len(self.cities), self.n_days)
+
+
+class Climatology:
+    """Smoothed day-of-year mean and standard deviation of each metric per city"""
+
+    def __init__(self, grid: DailyGrid, window: int = CLIMATOLOGY_WINDOW_DAYS):
+        self.cities = grid.cities
+        self.mean: Dict[str, np.ndarray] = {}
+        self.std: Dict[str, np.ndarray] = {}
+        self.count: Dict[str, np.ndarray] = {}
+
+        n_cities = len(grid.cities)
+        bins = (np.arange(n_cities)[:, None] * DOY_BINS + grid.doy[None, :]).ravel()
+        for metric, values in grid.values.items():
+            values = values.ravel()
+            present = ~np.isnan(values)
+            stats = [
+                np.bincount(bins[present], weights=weights, minlength=n_cities * DOY_BINS).reshape(n_cities, DOY_BINS)
+                for weights in (None, values[present], values[present] ** 2)
+            ]
+            count, total, squares = (_circular_window_sum(s.astype(np.float64), window) for s in stats)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = total / count
+                std = np.sqrt(np.maximum(squares / count - mean ** 2, 0.0))
+            trusted = count >= MIN_BASELINE_SAMPLES
+            self.mean[metric] = np.where(trusted, mean, np.nan)
+            self.std[metric] = np.where(trusted & (std > 0), std, np.nan)
+            self.count[metric] = count
+
+    def expected(self, metric: str, doy: np.ndarray) -> np.ndarray:
+        """(city x day) baseline mean for the given day-of-year of each grid column"""
+        return self.mean[metric][:, doy]
+
+    def z_scores(self, metric: str, values: np.ndarray, doy: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (values - self.mean[metric][:, doy]) / self.std[metric][:, doy]
+
+
+def find_spells(flags: np.ndarray, score: np.ndarray, min_days: int = 1, lowest: bool = False) -> Dict[str, np.ndarray]:
+    """Runs of True along each row of flags: city row, first day, end day (exclusive) and
+    the day where score peaks (its minimum if lowest), all as day indices"""
+    n_rows, n_days = flags.shape
+    padded = np.zeros((n_rows, n_days + 2), dtype=np.int8)
+    padded[:, 1:-1] = flags
+    edges = np.diff(padded, axis=1)
+    # nonzero walks row-major, so starts and ends pair up run by run
+    city, start = np.nonzero(edges == 1)
+    _, end = np.nonzero(edges == -1)
+
+    # Peak day of each run: sort flagged cells by (run, score) and take each run's first
+    cell_city, cell_day = np.nonzero(flags)
+    run = np.cumsum(edges[cell_city, cell_day] == 1) - 1
+    ranking = score[cell_city, cell_day] if lowest else -score[cell_city, cell_day]
+    order = np.lexsort((ranking, run))
+    _, firsts = np.unique(run[order], return_index=True)
+    peak = cell_day[order[firsts]]
+
+    keep = end - start >= min_days
+    return {"city": city[keep], "start": start[keep], "end": end[keep], "peak": peak[keep]}
+
+
+def _spell_rows(grid: DailyGrid, spells: Dict[str, np.ndarray], anomaly_type: str, metric: str,
+                value: np.ndarray, expected: np.ndarray, z_score: Optional[np.ndarray],
+                high: np.ndarray) -> pd.DataFrame:
+    city, peak = spells["city"], spells["peak"]
+    return pd.DataFrame({
+        "City": np.asarray(grid.cities, dtype=object)[city],
+        "State": np.asarray(grid.states, dtype=object)[city],
+        "Type": anomaly_type,
+        "Metric": metric,
+        "Date": grid.dates[spells["start"]].astype("datetime64[ns]"),
+        "End_Date": grid.dates[spells["end"] - 1].astype("datetime64[ns]"),
+        "Peak_Date": grid.dates[peak].astype("datetime64[ns]"),
+        "Days": (spells["end"] - spells["start"]).astype(np.int32),
+        "Value": np.round(value[city, peak], 2),
+        "Expected": np.round(expected[city, peak], 2),
+        "Z_Score": np.round(z_score[city, peak], 2) if z_score is not None else np.full(len(city), np.nan),
+        "Severity": np.where(high, "high", "moderate"),
+    })
+
+
+def detect_anomalies(frame: pd.DataFrame) -> pd.DataFrame:
+    """One row per anomaly spell found in a weather frame (Date parsed)"""
+    started = time.perf_counter()
+    if frame.empty or not {"City", "Date"} <= set(frame.columns):
+        return _empty_anomalies()
+
+    grid = DailyGrid(frame)
+    climatology = Climatology(grid)
+    parts = []
+
+    if "Temperature" in grid.values:
+        temperature = grid.values["Temperature"]
+        expected = climatology.expected("Temperature", grid.doy)
+        z = climatology.z_scores("Temperature", temperature, grid.doy)
+
+        for anomaly_type, flags, lowest in (("temperature_high", z >= TEMPERATURE_Z, False),
+                                            ("temperature_low", z <= -TEMPERATURE_Z, True)):
+            spells = find_spells(flags, z, lowest=lowest)
+            peak_z = np.abs(z[spells["city"], spells["peak"]])
+            parts.append(_spell_rows(grid, spells, anomaly_type, "Temperature", temperature, expected, z,
+                                     high=peak_z >= TEMPERATURE_Z + 1.0))
+
+        spells = find_spells(z >= HEATWAVE_Z, z, min_days=HEATWAVE_MIN_DAYS)
+        days = spells["end"] - spells["start"]
+        parts.append(_spell_rows(grid, spells, "heatwave", "Temperature", temperature, expected, z,
+                                 high=(days >= 2 * HEATWAVE_MIN_DAYS) | (z[spells["city"], spells["peak"]] >= 3.0)))
+
+    if "Rainfall" in grid.values:
+        rainfall = grid.values["Rainfall"]
+        present = ~np.isnan(rainfall)
+        actual = _trailing_window_sum(np.where(present, rainfall, 0.0), DEFICIT_WINDOW_DAYS)
+        coverage = _trailing_window_sum(present.astype(np.float64), DEFICIT_WINDOW_DAYS) / DEFICIT_WINDOW_DAYS
+        normal = _circular_window_sum(np.nan_to_num(climatology.mean["Rainfall"]), DEFICIT_WINDOW_DAYS,
+                                      centered=False)[:, grid.doy]
+        normal = np.where(np.isnan(climatology.mean["Rainfall"][:, grid.doy]), np.nan, normal)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            departure = actual / normal - 1.0
+        # The first window of the record is incomplete
+        coverage[:, :DEFICIT_WINDOW_DAYS - 1] = 0.0
+        flags = (departure <= -DEFICIT_FRACTION) & (normal >= DEFICIT_MIN_NORMAL_MM) \
+            & (coverage >= DEFICIT_MIN_COVERAGE)
+
+        spells = find_spells(flags, departure, lowest=True)
+        parts.append(_spell_rows(grid, spells, "rainfall_deficit", "Rainfall", actual, normal, None,
+                                 high=departure[spells["city"], spells["peak"]] <= -0.8))
+
+    anomalies = pd.concat(parts, ignore_index=True) if parts else _empty_anomalies()
+    logger.info(f"Detected {len(anomalies)} weather anomalies across {len(grid.cities)} cities "
+                f"and {grid.n_days} days in {time.perf_counter() - started:.2f}s")
+    return anomalies
+
+
+def _empty_anomalies() -> pd.DataFrame:
+    dates = pd.Series([], dtype="datetime64[ns]")
+    return pd.DataFrame({
+        "City": pd.Series([], dtype=object), "State": pd.Series([], dtype=object),
+        "Type": pd.Series([], dtype=object), "Metric": pd.Series([], dtype=object),
+        "Date": dates, "End_Date": dates, "Peak_Date": dates,
+        "Days": pd.Series([], dtype=np.int32), "Value": pd.Series([], dtype=np.float64),
+        "Expected": pd.Series([], dtype=np.float64), "Z_Score": pd.Series([], dtype=np.float64),
+        "Severity": pd.Series([], dtype=object),
+    })
+
+
+class AnomalyTable:
+    """Anomaly spells grouped by city in start-date order, indexed by city"""
+
+    def __init__(self, frame: pd.DataFrame, source: Optional[Dict[str, Any]] = None):
+        self.frame = sort_by_city_and_date(frame) if not frame.empty else frame
+        self.source = source or {}
+        self.city_index: Dict[str, Dict[str, Any]] = {}
+        self.latest_day: Dict[str, str] = dict(self.source.get("latest_day", {}))
+
+        if not self.frame.empty:
+            codes, cities = pd.factorize(self.frame["City"].astype(str))
+            bounds = np.concatenate([[0], np.flatnonzero(np.diff(codes)) + 1, [len(codes)]])
+            for code, city in enumerate(cities):
+                self.city_index[str(city).lower()] = {"city": str(city), "start": int(bounds[code]),
+                                                       "end": int(bounds[code + 1])}
+        self._types = self.frame["Type"].astype(str).to_numpy()
+        self._severity = self.frame["Severity"].astype(str).to_numpy()
+        self._starts = self.frame["Date"].to_numpy()
+        self._ends = self.frame["End_Date"].to_numpy()
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @classmethod
+    def detect(cls, weather: pd.DataFrame, source: Optional[Dict[str, Any]] = None) -> "AnomalyTable":
+        source = dict(source or {})
+        if not weather.empty and {"City", "Date"} <= set(weather.columns):
+            # Last reading per city, so "recent" is measured against each city's own record
+            last = weather.groupby(weather["City"].astype(str), observed=True)["Date"].max()
+            source["latest_day"] = {city.lower(): str(day.date()) for city, day in last.items()}
+        return cls(detect_anomalies(weather), source)
+
+    def save(self, path) -> None:
+        WeatherStore.build(self.frame, path, self.source)
+
+    @classmethod
+    def load(cls, path) -> "AnomalyTable":
+        """Open a persisted table; raises ValueError if it is missing or unreadable"""
+        store = WeatherStore.open(Path(path))
+        frame = store.to_frame().copy()
+        for column in ("City", "State", "Type", "Metric", "Severity"):
+            frame[column] = frame[column].astype(str)
+        return cls(frame, store.source)
+
+    def query(self, city: Optional[str] = None, types: Optional[Iterable[str]] = None,
+              start: Optional[str] = None, end: Optional[str] = None,
+              severity: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Anomalies overlapping [start, end], most recent first; severity="high" drops moderate ones"""
+        if city is not None:
+            entry = self.city_index.get(city.lower())
+            if entry is None:
+                return []
+            lo, hi = entry["start"], entry["end"]
+        else:
+            lo, hi = 0, len(self.frame)
+
+        mask = np.ones(hi - lo, dtype=bool)
+        if types:
+            mask &= np.isin(self._types[lo:hi], list(types))
+        if severity == "high":
+            mask &= self._severity[lo:hi] == "high"
+        if start:
+            mask &= self._ends[lo:hi] >= np.datetime64(pd.Timestamp(start)).astype(self._ends.dtype)
+        if end:
+            mask &= self._starts[lo:hi] <= np.datetime64(pd.Timestamp(end)).astype(self._starts.dtype)
+
+        rows = lo + np.flatnonzero(mask)
+        rows = rows[np.argsort(self._ends[rows], kind="stable")[::-1]]
+        if limit is not None:
+            rows = rows[:limit]
+        return [self._record(record) for record in self.frame.iloc[rows].to_dict("records")]
+
+    def recent(self, city: str, days: int = RECENT_DAYS, **filters) -> List[Dict[str, Any]]:
+        """Anomalies that ended within days of the city's latest reading (other query filters apply)"""
+        latest = self.latest_day.get(city.lower())
+        if latest is None:
+            return []
+        since = (pd.Timestamp(latest) - pd.Timedelta(days=days)).strftime("%Y-%m-%d")
+        return self.query(city, start=since, **filters)
+
+    def counts(self) -> Dict[str, int]:
+        types, counts = np.unique(self._types, return_counts=True)
+        return {str(t): int(c) for t, c in zip(types, counts)}
+
+    @staticmethod
+    def _record(record: Dict[str, Any]) -> Dict[str, Any]:
+        z_score = float(record["Z_Score"])
+        value, expected = float(record["Value"]), float(record["Expected"])
+        return {
+            "city": record["City"],
+            "state": record["State"],
+            "type": record["Type"],
+            "metric": record["Metric"].lower(),
+            "start": record["Date"].strftime("%Y-%m-%d"),
+            "end": record["End_Date"].strftime("%Y-%m-%d"),
+            "peak_date": record["Peak_Date"].strftime("%Y-%m-%d"),
+            "days": int(record["Days"]),
+            "value": value,
+            "expected": expected,
+            "departure": round(value - expected, 2),
+            "departure_pct": round((value / expected - 1.0) * 100, 1) if expected else None,
+            "z_score": None if np.isnan(z_score) else z_score,
+            "severity": record["Severity"],
+        }
@@ -0,0 +1,296 @@
+"""
+Weather Query - time-range and resampling queries over the Indian weather dataset
+
+A query names cities and/or states, an optional date range, the metrics to
+return and a granularity (day, week, month or season). Rows are selected by
+slicing each city's row range from the service's current WeatherSnapshot and
+binary-searching its dates, so only the requested slice is touched; periods
+are computed on numpy datetime arrays and aggregated in one groupby.
+
+Results are cached in an LRU keyed by a hash of the normalised query plus the
+dataset version, so repeated chart requests are served without recomputing.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from services.indian_weather_service import WeatherSnapshot, indian_weather_service
+
+# API metric name -> dataset column, and how it is aggregated by default
+METRIC_COLUMNS = {
+    "temperature": "Temperature",
+    "humidity": "Humidity",
+    "rainfall": "Rainfall",
+    "wind_speed": "Wind_Speed",
+    "pressure": "Pressure",
+}
+DEFAULT_AGGREGATIONS = {"rainfall": "sum"}
+AGGREGATIONS = {"mean", "min", "max", "sum"}
+GRANULARITIES = {"day", "week", "month", "season"}
+GROUP_BY = {"city", "state", "none"}
+
+# Indian meteorological seasons by calendar month (December counts towards the next year's winter)
+SEASON_NAMES = ["Winter", "Summer", "Monsoon", "Post-monsoon"]
+SEASON_OF_MONTH = np.array([0, 0, 1, 1, 1, 2, 2, 2, 2, 3, 3, 0])
+
+QUERY_CACHE_SIZE = 256
+
+# Points (series x periods) one response may hold; charts never need more
+MAX_POINTS = 20000
+
+
+def _as_list(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+def normalize_query(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate a query and put it in canonical form (raises ValueError)"""
+    metrics = [m.lower() for m in _as_list(spec.get("metrics"))] or ["temperature", "humidity", "rainfall"]
+    unknown = sorted(set(metrics) - set(METRIC_COLUMNS))
+    if unknown:
+        raise ValueError(f"Unknown metrics {unknown}; choose from {sorted(METRIC_COLUMNS)}")
+
+    granularity = str(spec.get("granularity") or "month").lower()
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of {sorted(GRANULARITIES)}")
+
+    aggregation = spec.get("aggregation")
+    if aggregation is not None and str(aggregation).lower() not in AGGREGATIONS:
+        raise ValueError(f"aggregation must be one of {sorted(AGGREGATIONS)}")
+
+    cities = sorted({c.lower() for c in _as_list(spec.get("cities"))})
+    states = sorted({s.lower() for s in _as_list(spec.get("states"))})
+    group_by = str(spec.get("group_by") or ("state" if states and not cities else "city")).lower()
+    if group_by not in GROUP_BY:
+        raise ValueError(f"group_by must be one of {sorted(GROUP_BY)}")
+
+    dates = {}
+    for key in ("start", "end"):
+        if spec.get(key):
+            try:
+                dates[key] = pd.Timestamp(spec[key]).strftime("%Y-%m-%d")
+            except (ValueError, TypeError):
+                raise ValueError(f"Invalid {key} date: {spec[key]}")
+    if "start" in dates and "end" in dates and dates["start"] > dates["end"]:
+        raise ValueError("start must not be after end")
+
+    return {
+        "cities": cities,
+        "states": states,
+        "start": dates.get("start"),
+        "end": dates.get("end"),
+        "metrics": sorted(set(metrics), key=metrics.index),
+        "granularity": granularity,
+        "aggregation": str(aggregation).lower() if aggregation else None,
+        "group_by": group_by,
+    }
+
+
+def query_hash(query: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(query, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def period_keys(dates: np.ndarray, granularity: str) -> np.ndarray:
+    """Integer period per date: day/week start as days since epoch, month index, or year*4+season"""
+    days = dates.astype("datetime64[D]")
+    if granularity == "day":
+        return days.astype(np.int64)
+    if granularity == "week":
+        # 1970-01-01 was a Thursday; weeks start on Monday
+        day_numbers = days.astype(np.int64)
+        return day_numbers - (day_numbers + 3) % 7
+    months = days.astype("datetime64[M]").astype(np.int64)
+    if granularity == "month":
+        return months
+    month_of_year = months % 12
+    season_year = 1970 + months // 12 + (month_of_year == 11)
+    return season_year * 4 + SEASON_OF_MONTH[month_of_year]
+
+
+def period_labels(keys: np.ndarray, granularity: str) -> List[str]:
+    if granularity in ("day", "week"):
+        return np.datetime_as_string(keys.astype("datetime64[D]"), unit="D").tolist()
+    if granularity == "month":
+        return np.datetime_as_string(keys.astype("datetime64[M]"), unit="M").tolist()
+    return [f"{key // 4} {SEASON_NAMES[key % 4]}" for key in keys.tolist()]
+
+
+def _json_values(values: np.ndarray) -> List[Optional[float]]:
+    """Floats with NaN (periods without readings) as None"""
+    missing = np.isnan(values)
+    if not missing.any():
+        return values.tolist()
+    boxed = values.astype(object)
+    boxed[missing] = None
+    return boxed.tolist()
+
+
+class WeatherQueryEngine:
+    """Runs normalised queries against IndianWeatherService data with an LRU result cache"""
+
+    def __init__(self, weather_service, cache_size: int = QUERY_CACHE_SIZE):
+        self.weather_service = weather_service
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def query(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        query = normalize_query(spec)
+        # One snapshot per query so a concurrent reload can't mix row ranges from different data
+        snapshot = self.weather_service.snapshot
+        key = f"{snapshot.version}:{query_hash(query)}"
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return {**cached, "cached": True}
+
+        result = self._run(query, snapshot)
+        result["query_hash"] = query_hash(query)
+        with self._lock:
+            self.stats["misses"] += 1
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return {**result, "cached": False}
+
+    def _resolve_cities(self, query: Dict[str, Any], snapshot: WeatherSnapshot) -> Dict[str, Any]:
+        """Canonical city names for the requested cities and states"""
+        names, unknown = [], []
+        for city in query["cities"]:
+            entry = snapshot.city_index.get(city)
+            if entry is None:
+                unknown.append(city)
+            else:
+                names.append(entry["city"])
+
+        state_cities = {state.lower(): cities for state, cities in snapshot.summary.state_cities.items()}
+        for state in query["states"]:
+            if state not in state_cities:
+                unknown.append(state)
+            else:
+                names.extend(sorted(state_cities[state]))
+
+        if not query["cities"] and not query["states"]:
+            names = [entry["city"] for entry in snapshot.city_index.values()]
+        return {"cities": list(dict.fromkeys(names)), "unknown": unknown}
+
+    def _select(self, cities: List[str], query: Dict[str, Any], columns: List[str],
+                snapshot: WeatherSnapshot) -> Dict[str, np.ndarray]:
+        """Dates, city labels and metric values of the selected rows (base slices + appended rows)"""
+        base = snapshot.weather_data
+        date_column = base["Date"]
+        start = np.datetime64(query["start"]).astype(date_column.dtype) if query["start"] else None
+        end = (np.datetime64(query["end"]) + np.timedelta64(1, "D")).astype(date_column.dtype) if query["end"] else None
+
+        ranges, labels = [], []
+        for city in cities:
+            entry = snapshot.city_index[city.lower()]
+            lo, hi = entry["start"], entry["end"]
+            # Rows of a city are in date order, so the range is two binary searches
+            city_dates = date_column.iloc[lo:hi].to_numpy()
+            first = lo + (np.searchsorted(city_dates, start, "left") if start is not None else 0)
+            last = lo + (np.searchsorted(city_dates, end, "left") if end is not None else hi - lo)
+            ranges.append((first, last))
+            labels.append(np.full(last - first, city, dtype=object))
+
+        def gather(column: pd.Series, dtype=None) -> np.ndarray:
+            """The selected rows of a column, converting only those rows"""
+            parts = [column.iloc[first:last].to_numpy(dtype=dtype) for first, last in ranges]
+            return np.concatenate(parts) if parts else column.iloc[:0].to_numpy(dtype=dtype)
+
+        selected = {
+            "Date": gather(date_column),
+            "City": np.concatenate(labels) if labels else np.empty(0, dtype=object),
+        }
+        n_rows = len(selected["Date"])
+        for column in columns:
+            selected[column] = gather(base[column], np.float64) if column in base.columns else np.full(n_rows, np.nan)
+
+        appended = snapshot.appended_data
+        if appended is not None and not appended.empty:
+            mask = appended["City"].astype(str).isin(cities).to_numpy()
+            appended_dates = appended["Date"].to_numpy()
+            if start is not None:
+                mask = mask & (appended_dates >= start)
+            if end is not None:
+                mask = mask & (appended_dates < end)
+            if mask.any():
+                selected["Date"] = np.concatenate([selected["Date"].astype("datetime64[ns]"),
+                                                   appended_dates[mask].astype("datetime64[ns]")])
+                selected["City"] = np.concatenate([selected["City"],
+                                                   appended["City"].astype(str).to_numpy()[mask]])
+                for column in columns:
+                    extra = (appended[column].to_numpy(dtype=np.float64)[mask] if column in appended.columns
+                             else np.full(mask.sum(), np.nan))
+                    selected[column] = np.concatenate([selected[column], extra])
+        return selected
+
+    def _run(self, query: Dict[str, Any], snapshot: WeatherSnapshot) -> Dict[str, Any]:
+        resolved = self._resolve_cities(query, snapshot)
+        columns = [METRIC_COLUMNS[m] for m in query["metrics"]]
+        selected = self._select(resolved["cities"], query, columns, snapshot)
+
+        if query["group_by"] == "city":
+            groups = selected["City"]
+        elif query["group_by"] == "state":
+            city_state = {city: str(record.get("State", "Unknown"))
+                          for city, record in snapshot.summary.latest.items()}
+            groups = np.array([city_state.get(city, "Unknown") for city in selected["City"]], dtype=object) \
+                if len(selected["City"]) else selected["City"]
+        else:
+            groups = np.full(len(selected["City"]), "All", dtype=object)
+
+        frame = pd.DataFrame({
+            "group": groups,
+            "period": period_keys(selected["Date"], query["granularity"]),
+            **{column: selected[column] for column in columns},
+        })
+        aggregations = {
+            column: query["aggregation"] or DEFAULT_AGGREGATIONS.get(metric, "mean")
+            for metric, column in zip(query["metrics"], columns)
+        }
+
+        series = []
+        if not frame.empty:
+            grouped = frame.groupby(["group", "period"], sort=True)
+            table = grouped.agg(aggregations).round(2)
+            if len(table) > MAX_POINTS:
+                raise ValueError(f"Query returns {len(table)} points (limit {MAX_POINTS}); "
+                                 f"narrow the date range or use a coarser granularity")
+            counts = grouped.size()
+            for name in table.index.get_level_values(0).unique():
+                part = table.loc[name]
+                series.append({
+                    "name": str(name),
+                    "period": period_labels(part.index.to_numpy(), query["granularity"]),
+                    "count": counts.loc[name].astype(int).tolist(),
+                    **{metric: _json_values(part[column].to_numpy())
+                       for metric, column in zip(query["metrics"], columns)},
+                })
+
+        return {
+            "query": query,
+            "aggregations": {metric: aggregations[column] for metric, column in zip(query["metrics"], columns)},
+            "series": series,
+            "rows_scanned": int(len(frame)),
+            "unknown": resolved["unknown"],
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "entries": len(self._cache), "max_entries": self.cache_size}
+
+
+# Create a global instance
+weather_query_engine = WeatherQueryEngine(indian_weather_service)
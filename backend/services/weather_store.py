@@ -0,0 +1,166 @@
+"""
+Weather Store - columnar, memory-mapped copy of the Indian weather dataset
+
+The dataset is converted once from CSV into a directory holding one .npy file
+per column plus meta.json:
+
+    numeric columns      stored with their own dtype
+    date columns         datetime64[s]
+    text columns         dictionary-encoded: int32 codes + a sorted dictionary
+                         in meta.json (City and State become categoricals)
+
+Opening the store memory-maps every column read-only, so startup costs a few
+milliseconds regardless of dataset size, and every worker process on the host
+shares the same page-cache pages instead of holding its own parsed copy.
+
+Rows are stored grouped by city in date order, so one city's history is a
+contiguous slice of every column.
+"""
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+STORE_FORMAT_VERSION = 2
+META_FILE = "meta.json"
+
+# Text columns with these names are parsed as dates instead of dictionary-encoded
+DATE_COLUMNS = {"date", "date_time", "datetime", "time"}
+
+
+def sort_by_city_and_date(frame: pd.DataFrame) -> pd.DataFrame:
+    """Rows of each city contiguous and in date order (Date parsed if it is text)"""
+    if "Date" in frame.columns and not pd.api.types.is_datetime64_any_dtype(frame["Date"]):
+        frame = frame.assign(Date=pd.to_datetime(frame["Date"]))
+    keys = [column for column in ("City", "Date") if column in frame.columns]
+    if not keys:
+        return frame
+    return frame.sort_values(keys, kind="mergesort").reset_index(drop=True)
+
+
+class WeatherStore:
+    """A read-only columnar weather table backed by memory-mapped .npy files"""
+
+    def __init__(self, path: Path, meta: Dict[str, Any], columns: Dict[str, np.ndarray]):
+        self.path = path
+        self.meta = meta
+        self.columns = columns
+        self._frame = None
+
+    @property
+    def n_rows(self) -> int:
+        return self.meta["rows"]
+
+    @property
+    def source(self) -> Dict[str, Any]:
+        return self.meta.get("source", {})
+
+    @staticmethod
+    def exists(path) -> bool:
+        return (Path(path) / META_FILE).exists()
+
+    @classmethod
+    def build(cls, frame: pd.DataFrame, path, source: Optional[Dict[str, Any]] = None) -> "WeatherStore":
+        """Write frame as a store at path (replacing any existing one) and open it"""
+        path = Path(path)
+        staging = path.with_name(f".{path.name}.building-{os.getpid()}")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        started = time.perf_counter()
+        frame = sort_by_city_and_date(frame)
+        column_meta = []
+        for position, name in enumerate(frame.columns):
+            series = frame[name]
+            file_name = f"col_{position:03d}.npy"
+            entry = {"name": str(name), "file": file_name}
+
+            if pd.api.types.is_datetime64_any_dtype(series) or (
+                str(name).strip().lower() in DATE_COLUMNS and not pd.api.types.is_numeric_dtype(series)
+            ):
+                values = pd.to_datetime(series).to_numpy(dtype="datetime64[s]")
+                entry["kind"] = "datetime"
+            elif pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+                values = series.to_numpy()
+                entry["kind"] = "numeric"
+            else:
+                codes, dictionary = pd.factorize(series.astype("string"), sort=True)
+                values = codes.astype(np.int32)
+                entry["kind"] = "dictionary"
+                entry["dictionary"] = [str(v) for v in dictionary]
+
+            np.save(staging / file_name, np.ascontiguousarray(values), allow_pickle=False)
+            entry["dtype"] = str(values.dtype)
+            column_meta.append(entry)
+
+        meta = {
+            "format_version": STORE_FORMAT_VERSION,
+            "rows": int(len(frame)),
+            "columns": column_meta,
+            "source": source or {},
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        with open(staging / META_FILE, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        # Swap directories so readers never see a half-written store
+        previous = path.with_name(f".{path.name}.previous-{os.getpid()}")
+        if path.exists():
+            os.replace(path, previous)
+        os.replace(staging, path)
+        shutil.rmtree(previous, ignore_errors=True)
+
+        logger.info(f"Built weather store at {path}: {meta['rows']} rows, "
+                    f"{len(column_meta)} columns in {time.perf_counter() - started:.2f}s")
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path) -> "WeatherStore":
+        """Memory-map an existing store; raises ValueError if it is missing or unreadable"""
+        path = Path(path)
+        try:
+            with open(path / META_FILE, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"No readable weather store at {path}: {e}")
+
+        if meta.get("format_version") != STORE_FORMAT_VERSION:
+            raise ValueError(f"Weather store at {path} has format {meta.get('format_version')}, "
+                             f"expected {STORE_FORMAT_VERSION}")
+
+        columns = {}
+        for entry in meta["columns"]:
+            values = np.load(path / entry["file"], mmap_mode="r", allow_pickle=False)
+            if len(values) != meta["rows"]:
+                raise ValueError(f"Weather store column {entry['name']} has {len(values)} rows, "
+                                 f"expected {meta['rows']}")
+            columns[entry["name"]] = values
+        return cls(path, meta, columns)
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame view over the mapped columns (numeric and date columns are not copied)"""
+        if self._frame is None:
+            data = {}
+            for entry in self.meta["columns"]:
+                values = self.columns[entry["name"]]
+                if entry["kind"] == "dictionary":
+                    data[entry["name"]] = pd.Categorical.from_codes(values, entry["dictionary"])
+                else:
+                    data[entry["name"]] = values
+            self._frame = pd.DataFrame(data, copy=False)
+        return self._frame
+
+    def dictionary(self, column: str) -> list:
+        """Distinct values of a dictionary-encoded column, in code order"""
+        for entry in self.meta["columns"]:
+            if entry["name"] == column and entry["kind"] == "dictionary":
+                return entry["dictionary"]
+        raise KeyError(column)
@@ -0,0 +1,85 @@
+"""
+Flat forest checks: a flattened forest and scaler must predict exactly what the
+sklearn estimators they were compiled from predict
+Run with: python -m pytest test_flat_forest.py  (or python test_flat_forest.py)
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import StandardScaler
+
+from services.flat_forest import export_forecast_bundle, flatten_forest, is_flat_bundle
+
+
+def make_data(rows=400, seed=0):
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        rng.uniform(8, 35, rows),      # latitude
+        rng.uniform(68, 97, rows),     # longitude
+        rng.integers(1, 366, rows),    # day of year
+        rng.integers(2015, 2025, rows),
+    ]).astype(np.float64)
+    y = 30 - 0.4 * (X[:, 0] - 8) + 5 * np.sin(X[:, 2] / 58) + rng.normal(0, 1, rows)
+    return X, y
+
+
+def test_forest_parity():
+    X, y = make_data()
+    forest = RandomForestRegressor(n_estimators=12, max_depth=10, random_state=0).fit(X, y)
+    flat = flatten_forest(forest)
+    assert flat.n_trees == 12
+
+    X_new, _ = make_data(rows=300, seed=1)
+    np.testing.assert_allclose(flat.predict(X_new), forest.predict(X_new), rtol=1e-12)
+
+
+def test_rows_on_split_thresholds():
+    # Rows sitting exactly on a threshold (and on either side of it) must take the same branch
+    X, y = make_data()
+    forest = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y)
+    flat = flatten_forest(forest)
+
+    tree = forest.estimators_[0].tree_
+    splits = tree.children_left >= 0
+    rows = np.repeat(X[:len(tree.feature[splits])], 3, axis=0)
+    for i, (feature, threshold) in enumerate(zip(tree.feature[splits], tree.threshold[splits])):
+        for j, value in enumerate(np.nextafter(threshold, [-np.inf, threshold, np.inf])):
+            rows[3 * i + j, feature] = value
+    np.testing.assert_allclose(flat.predict(rows), forest.predict(rows), rtol=1e-12)
+
+
+def test_unlimited_depth_forest():
+    # Fully grown trees of very different depths share one traversal loop
+    X, y = make_data(rows=200)
+    forest = RandomForestRegressor(n_estimators=8, min_samples_leaf=1, random_state=3).fit(X, y)
+    flat = flatten_forest(forest)
+    assert flat.max_depth == max(e.tree_.max_depth for e in forest.estimators_)
+    np.testing.assert_allclose(flat.predict(X), forest.predict(X), rtol=1e-12)
+
+
+def test_exported_bundle_parity():
+    X, y = make_data()
+    scaler = StandardScaler().fit(X)
+    forest = RandomForestRegressor(n_estimators=6, max_depth=8, random_state=0).fit(scaler.transform(X), y)
+    bundle = {"models": {"temperature": forest}, "scaler": scaler, "features": ["lat", "lon", "doy", "year"]}
+
+    exported = export_forecast_bundle(bundle)
+    assert is_flat_bundle(exported) and not is_flat_bundle(bundle)
+    assert exported["features"] == bundle["features"]
+
+    X_new, _ = make_data(rows=100, seed=2)
+    np.testing.assert_allclose(exported["scaler"].transform(X_new), scaler.transform(X_new), rtol=1e-12)
+    expected = forest.predict(scaler.transform(X_new))
+    actual = exported["models"]["temperature"].predict(exported["scaler"].transform(X_new))
+    np.testing.assert_allclose(actual, expected, rtol=1e-12)
+
+
+if __name__ == "__main__":
+    test_forest_parity()
+    test_rows_on_split_thresholds()
+    test_unlimited_depth_forest()
+    test_exported_bundle_parity()
+    print("flat forest checks passed")
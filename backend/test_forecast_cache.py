@@ -0,0 +1,91 @@
+"""
+Forecast cache checks: a batch with more (cell, date) pairs than the cache holds
+must still be answered from the model, never from the mock fallback
+Run with: python -m pytest test_forecast_cache.py  (or python test_forecast_cache.py)
+"""
+import sys
+import os
+import asyncio
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(__file__))
+os.environ.setdefault("MODEL_PATH", tempfile.mkdtemp())
+
+import numpy as np
+
+import services.ml_service as ml
+from core.geo import grid_cell, cell_center
+
+
+class IdentityScaler:
+    def transform(self, X):
+        return np.asarray(X, dtype=float)
+
+
+class LatitudeModel:
+    """Predicts latitude + day of year so every (cell, date) has a known answer"""
+    def predict(self, X):
+        return X[:, 0] + X[:, 2]
+
+
+def make_service():
+    service = ml.MLService()
+    service._active = {
+        "models": {"temperature": LatitudeModel()},
+        "scaler": IdentityScaler(),
+        "bundle": {},
+        "metadata": {"version": "test"}
+    }
+    service.model_state = "ready"
+    service._last_registry_check = time.monotonic()
+    return service
+
+
+def expected_temperature(lat, lon, predict_date):
+    center_lat, _ = cell_center(grid_cell(lat, lon))
+    return ml.format_prediction("temperature", center_lat + predict_date.timetuple().tm_yday)
+
+
+def check_forecasts(result, locations):
+    assert result["model_info"]["name"] == "climate_forecast_rf"
+    for forecast, (lat, lon) in zip(result["forecasts"], locations):
+        for prediction in forecast["predictions"]:
+            predict_date = ml.datetime.fromisoformat(prediction["date"]).date()
+            assert prediction["temperature"] == expected_temperature(lat, lon, predict_date)
+
+
+def test_batch_larger_than_cache():
+    original = ml.FORECAST_CACHE_SIZE
+    ml.FORECAST_CACHE_SIZE = 10
+    try:
+        service = make_service()
+        locations = [(10.0 + i, 75.0) for i in range(8)]  # 8 cells x 3 days = 24 entries
+        result = asyncio.run(service.predict_climate_batch(locations, 3, ["temperature"]))
+        check_forecasts(result, locations)
+        assert len(service._forecast_cache) <= 10
+
+        # Cells cached by the first request mixed with new ones, larger than the cache again
+        mixed = locations[-2:] + [(30.0 + i, 80.0) for i in range(6)]
+        result = asyncio.run(service.predict_climate_batch(mixed, 3, ["temperature"]))
+        check_forecasts(result, mixed)
+        assert len(service._forecast_cache) <= 10
+    finally:
+        ml.FORECAST_CACHE_SIZE = original
+
+
+def test_repeat_request_hits_cache():
+    service = make_service()
+    locations = [(19.07, 72.87), (19.071, 72.871), (28.6, 77.2)]  # first two share a cell
+    first = asyncio.run(service.predict_climate_batch(locations, 5, ["temperature"]))
+    misses = service.forecast_cache_stats["misses"]
+    second = asyncio.run(service.predict_climate_batch(locations, 5, ["temperature"]))
+    assert misses == 2
+    assert service.forecast_cache_stats["misses"] == misses
+    assert first["forecasts"] == second["forecasts"]
+    check_forecasts(second, locations)
+
+
+if __name__ == "__main__":
+    test_batch_larger_than_cache()
+    test_repeat_request_hits_cache()
+    print("forecast cache checks passed")
@@ -0,0 +1,73 @@
+"""
+Forecast feature checks: station state lags are paired with the lead time from
+the state's own date, and a state too old for any trained lead is not used
+Run with: python -m pytest test_forecast_features.py  (or python test_forecast_features.py)
+"""
+import sys
+import os
+import tempfile
+from datetime import date
+sys.path.insert(0, os.path.dirname(__file__))
+os.environ.setdefault("MODEL_PATH", tempfile.mkdtemp())
+
+import numpy as np
+
+import services.ml_service as ml
+from services.forecast_training import FEATURE_NAMES, STATE_FEATURES
+
+TODAY = date(2026, 6, 1)
+
+
+def make_bundle(as_of):
+    return {
+        "feature_names": FEATURE_NAMES,
+        "feature_defaults": {name: -1.0 for name in FEATURE_NAMES},
+        "station_state": {
+            "cities": ["Delhi"],
+            "as_of": [as_of],
+            "coords": [[28.6, 77.2]],
+            "features": STATE_FEATURES,
+            "values": [[float(i + 1) for i in range(len(STATE_FEATURES))]],
+            "max_horizon_days": 30,
+        },
+    }
+
+
+def build(bundle, locations, days=3):
+    days_of_year = np.arange(days) + TODAY.timetuple().tm_yday + 1
+    return ml.MLService()._build_feature_matrix(locations, days_of_year, bundle, TODAY)
+
+
+def column(X, name):
+    return X[:, FEATURE_NAMES.index(name)]
+
+
+def test_lead_counted_from_state_date():
+    X = build(make_bundle("2026-05-25"), [(28.61, 77.21)])  # state is 7 days old
+    assert column(X, "horizon_days").tolist() == [8, 9, 10]
+    assert column(X, "temperature_last").tolist() == [1.0, 1.0, 1.0]
+
+
+def test_stale_state_falls_back_to_defaults():
+    # 28 days old: day 1 and 2 are within the longest trained lead, day 3 is not
+    X = build(make_bundle("2026-05-04"), [(28.61, 77.21)])
+    assert column(X, "horizon_days").tolist() == [29, 30, 3]
+    assert column(X, "temperature_last").tolist() == [1.0, 1.0, -1.0]
+
+    # Months old: never used, lead counted from today
+    X = build(make_bundle("2025-12-01"), [(28.61, 77.21)])
+    assert column(X, "horizon_days").tolist() == [1, 2, 3]
+    assert (column(X, "rainfall_sum30") == -1.0).all()
+
+
+def test_far_location_uses_defaults():
+    X = build(make_bundle("2026-05-31"), [(28.61, 77.21), (10.0, 76.0)], days=2)
+    assert column(X, "horizon_days").tolist() == [2, 3, 1, 2]
+    assert column(X, "humidity_last").tolist() == [5.0, 5.0, -1.0, -1.0]
+
+
+if __name__ == "__main__":
+    test_lead_counted_from_state_date()
+    test_stale_state_falls_back_to_defaults()
+    test_far_location_uses_defaults()
+    print("forecast feature checks passed")
@@ -0,0 +1,53 @@
+"""
+Grid cell checks: coordinates on a cell boundary belong to the cell that starts
+there, whatever the binary rounding of the division
+Run with: python -m pytest test_geo.py  (or python test_geo.py)
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+from core.geo import DEFAULT_CELL_SIZE, cell_center, grid_cell
+
+
+def test_boundaries_start_their_cell():
+    # 12.9 / 0.1 is 128.99999999999997 in floating point; it must still be cell 129
+    assert grid_cell(12.9, 77.3) == (129, 773)
+    assert grid_cell(0.0, 0.0) == (0, 0)
+    assert grid_cell(-0.1, -0.3) == (-1, -3)
+    for k in range(-900, 901):
+        boundary = round(k * DEFAULT_CELL_SIZE, 1)
+        assert grid_cell(boundary, boundary) == (k, k), boundary
+
+
+def test_points_inside_a_cell():
+    assert grid_cell(12.95, 77.35) == (129, 773)
+    assert grid_cell(12.999999, 77.399999) == (129, 773)
+    assert grid_cell(-0.05, -0.05) == (-1, -1)
+    assert grid_cell(-12.95, 77.35) == (-130, 773)
+    # Just below a boundary stays in the cell before it
+    for k in range(-900, 901):
+        below = round(k * DEFAULT_CELL_SIZE, 1) - 1e-6
+        assert grid_cell(below, below) == (k - 1, k - 1), below
+
+
+def test_center_round_trip():
+    for cell in [(0, 0), (129, 773), (-1, -1), (-900, 1799), (899, -1800)]:
+        lat, lon = cell_center(cell)
+        assert grid_cell(lat, lon) == cell
+    assert cell_center((129, 773)) == (12.95, 77.35)
+
+
+def test_other_cell_sizes():
+    assert grid_cell(1.5, 3.0, cell_size=0.5) == (3, 6)
+    assert grid_cell(1.49, 2.99, cell_size=0.5) == (2, 5)
+    assert grid_cell(0.3, 0.6, cell_size=0.3) == (1, 2)
+    assert cell_center((1, 2), cell_size=0.3) == (0.45, 0.75)
+
+
+if __name__ == "__main__":
+    test_boundaries_start_their_cell()
+    test_points_inside_a_cell()
+    test_center_round_trip()
+    test_other_cell_sizes()
+    print("geo checks passed")
@@ -0,0 +1,164 @@
+"""
+Product catalogue checks: indexed search, sorting and facet counts must agree
+with a plain filter over the product dicts
+Run with: python -m pytest test_product_catalogue.py  (or python test_product_catalogue.py)
+"""
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(__file__))
+
+from services.product_catalogue import PRICE_BUCKET_EDGES, RATING_THRESHOLDS, ProductCatalogue, tokenize
+
+CATEGORIES = ["home", "fashion", "electronics", "personal-care"]
+FEATURES = ["organic", "recyclable", "biodegradable", "fair-trade", "solar"]
+WORDS = ["bamboo", "cotton", "bottle", "brush", "solar", "lamp", "bag", "jute", "steel", "soap", "bar", "charger"]
+
+
+def make_products(count=300, seed=7):
+    rng = random.Random(seed)
+    products = []
+    for i in range(count):
+        products.append({
+            "id": f"p{i}",
+            "name": " ".join(rng.sample(WORDS, 2)).title(),
+            "brand": rng.choice(["EcoCo", "GreenLeaf", "Terra"]),
+            "tags": rng.sample(WORDS, 2),
+            "description": " ".join(rng.sample(WORDS, 4)),
+            "category": rng.choice(CATEGORIES),
+            # Many prices and ratings sit exactly on a facet edge or filter bound
+            "price": rng.choice(PRICE_BUCKET_EDGES + [499, 999.5, 2499, 7500, 15000]),
+            "rating": rng.choice(RATING_THRESHOLDS + [2.5, 3.2, 4.2, 4.8, 5.0]),
+            "ecoScore": rng.randint(40, 100),
+            "inStock": rng.random() < 0.7,
+            "ecoFeatures": [{"type": t} for t in rng.sample(FEATURES, rng.randint(0, 3))],
+        })
+    return products
+
+
+def product_tokens(product):
+    tags = " ".join(product["tags"])
+    return tokenize(" ".join([product["name"], product["brand"], tags, product["description"]]))
+
+
+def passes(product, query="", category=None, min_price=None, max_price=None, eco_features=None,
+           min_rating=None, in_stock=False, skip=None):
+    """Brute-force filter, optionally ignoring one filter the way a facet does"""
+    if query and skip != "query":
+        terms = product_tokens(product)
+        if not all(any(term.startswith(token) for term in terms) for token in tokenize(query)):
+            return False
+    if category and skip != "category" and product["category"] != category:
+        return False
+    if skip != "price":
+        if min_price is not None and product["price"] < min_price:
+            return False
+        if max_price is not None and product["price"] > max_price:
+            return False
+    if eco_features and skip != "eco_features":
+        if not {f["type"] for f in product["ecoFeatures"]} & set(eco_features):
+            return False
+    if min_rating and skip != "rating" and product["rating"] < min_rating:
+        return False
+    if in_stock and skip != "in_stock" and not product["inStock"]:
+        return False
+    return True
+
+
+QUERIES = [
+    {},
+    {"query": "bamboo"},
+    {"query": "sol la"},
+    {"query": "terra bottle", "in_stock": True},
+    {"query": "nothingmatches"},
+    {"category": "home", "min_price": 1000, "max_price": 5000},
+    {"category": "fashion", "eco_features": ["organic", "solar"], "min_rating": 4.0},
+    {"min_price": 2500, "in_stock": True},
+    {"max_price": 999.5, "min_rating": 4.5},
+    {"query": "br", "category": "electronics", "eco_features": ["fair-trade"], "max_price": 10000},
+    {"category": "missing"},
+]
+
+
+def test_search_matches_brute_force():
+    products = make_products()
+    catalogue = ProductCatalogue(products)
+    for filters in QUERIES:
+        expected = [p["id"] for p in products if passes(p, **filters)]
+        result = catalogue.search(**filters, limit=len(products))
+        assert result["totalCount"] == len(expected), filters
+        assert sorted(p["id"] for p in result["products"]) == sorted(expected), filters
+
+
+def test_sorted_pages():
+    products = make_products()
+    catalogue = ProductCatalogue(products)
+    filters = {"category": "home", "in_stock": True}
+    matching = [p for p in products if passes(p, **filters)]
+    for sort_by, field, descending in [("price-low", "price", False), ("price-high", "price", True),
+                                       ("rating", "rating", True), ("eco-score", "ecoScore", True)]:
+        expected = sorted(matching, key=lambda p: -p[field] if descending else p[field])
+        pages = [catalogue.search(**filters, sort_by=sort_by, page=page, limit=7)
+                 for page in range(1, len(matching) // 7 + 2)]
+        assert [p["id"] for page in pages for p in page["products"]] == [p["id"] for p in expected], sort_by
+        assert pages[0]["hasNext"] and not pages[-1]["hasNext"]
+
+
+def test_relevance_returns_every_match():
+    products = make_products()
+    catalogue = ProductCatalogue(products)
+    expected = {p["id"] for p in products if passes(p, query="bamboo cotton")}
+    pages = [catalogue.search("bamboo cotton", page=page, limit=5) for page in range(1, len(expected) // 5 + 2)]
+    ids = [p["id"] for page in pages for p in page["products"]]
+    assert len(ids) == len(set(ids)) and set(ids) == expected
+
+
+def facet_counts(products, filters):
+    def count(predicate, skip):
+        return sum(1 for p in products if predicate(p) and passes(p, **filters, skip=skip))
+
+    edges = PRICE_BUCKET_EDGES[1:] + [float("inf")]
+    lows = [float("-inf")] + PRICE_BUCKET_EDGES[1:]
+    return {
+        "categories": {c: count(lambda p: p["category"] == c, "category") for c in CATEGORIES},
+        "ecoFeatures": {f: count(lambda p: f in {e["type"] for e in p["ecoFeatures"]}, "eco_features")
+                        for f in FEATURES},
+        "priceRanges": [count(lambda p: low <= p["price"] < high, "price") for low, high in zip(lows, edges)],
+        "ratings": [count(lambda p: p["rating"] >= t, "rating") for t in RATING_THRESHOLDS],
+    }
+
+
+def test_facets_match_brute_force():
+    products = make_products()
+    catalogue = ProductCatalogue(products)
+    for filters in QUERIES:
+        facets = catalogue.search(**filters, facets=True)["facets"]
+        expected = facet_counts(products, filters)
+
+        categories = {c["name"]: c["count"] for c in facets["categories"]}
+        assert categories == {c: n for c, n in expected["categories"].items() if n}, filters
+        features = {f["type"]: f["count"] for f in facets["ecoFeatures"]}
+        assert features == {f: n for f, n in expected["ecoFeatures"].items() if n}, filters
+        assert [f["count"] for f in facets["categories"]] == sorted(categories.values(), reverse=True)
+
+        assert [r["count"] for r in facets["priceRanges"]] == expected["priceRanges"], filters
+        assert [r["min"] for r in facets["priceRanges"]] == PRICE_BUCKET_EDGES
+        assert facets["priceRanges"][-1]["max"] is None
+        assert [r["count"] for r in facets["ratings"]] == expected["ratings"], filters
+
+
+def test_category_summary():
+    products = make_products()
+    summary = ProductCatalogue(products).category_summary()
+    assert [c["name"] for c in summary] == list(dict.fromkeys(p["category"] for p in products))
+    for entry in summary:
+        assert entry["count"] == sum(1 for p in products if p["category"] == entry["name"])
+
+
+if __name__ == "__main__":
+    test_search_matches_brute_force()
+    test_sorted_pages()
+    test_relevance_returns_every_match()
+    test_facets_match_brute_force()
+    test_category_summary()
+    print("product catalogue checks passed")
@@ -0,0 +1,57 @@
+"""
+Response rendering checks: the stdlib fallback must produce the same payload as
+orjson for numpy values and dates
+Run with: python -m pytest test_responses.py  (or python test_responses.py)
+"""
+import sys
+import os
+import json
+from datetime import date, datetime
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+
+import core.responses as responses
+from core.responses import FastJSONResponse
+
+PAYLOAD = {
+    "count": np.int64(3),
+    "mean": np.float32(1.5),
+    "ok": np.bool_(True),
+    "series": np.array([1.25, 2.5]),
+    "grid": np.arange(4, dtype=np.int32).reshape(2, 2),
+    "issued": date(2026, 6, 1),
+    "updated": datetime(2026, 6, 1, 12, 30),
+    "name": "Délhi",
+}
+
+
+def render(orjson_available):
+    original = responses.orjson_available
+    responses.orjson_available = orjson_available
+    try:
+        return FastJSONResponse(content=None).render(PAYLOAD)
+    finally:
+        responses.orjson_available = original
+
+
+def test_fallback_keeps_numpy_types():
+    decoded = json.loads(render(False))
+    assert decoded["count"] == 3 and isinstance(decoded["count"], int)
+    assert decoded["mean"] == 1.5
+    assert decoded["ok"] is True
+    assert decoded["series"] == [1.25, 2.5]
+    assert decoded["grid"] == [[0, 1], [2, 3]]
+    assert decoded["issued"] == "2026-06-01"
+
+
+def test_fallback_matches_orjson():
+    if not responses.orjson_available:
+        return
+    assert json.loads(render(False)) == json.loads(render(True))
+
+
+if __name__ == "__main__":
+    test_fallback_keeps_numpy_types()
+    test_fallback_matches_orjson()
+    print("response checks passed")
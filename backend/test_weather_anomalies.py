@@ -0,0 +1,89 @@
+"""
+Anomaly spell checks: runs of flagged days must start, end and peak where a
+day-by-day scan says they do, including runs touching either end of a row
+Run with: python -m pytest test_weather_anomalies.py  (or python test_weather_anomalies.py)
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+
+from services.weather_anomalies import find_spells
+
+
+def scan_spells(flags, score, min_days=1, lowest=False):
+    """Reference: walk each row day by day"""
+    spells = []
+    for city, row in enumerate(flags):
+        day = 0
+        while day < len(row):
+            if not row[day]:
+                day += 1
+                continue
+            start = day
+            while day < len(row) and row[day]:
+                day += 1
+            if day - start >= min_days:
+                days = score[city, start:day]
+                peak = start + int(np.argmin(days) if lowest else np.argmax(days))
+                spells.append((city, start, day, peak))
+    return spells
+
+
+def as_tuples(spells):
+    return list(zip(*(spells[key].tolist() for key in ("city", "start", "end", "peak"))))
+
+
+def test_runs_at_row_edges():
+    flags = np.array([
+        [1, 1, 0, 0, 1, 1, 1],   # starts on day 0, ends on the last day
+        [0, 0, 0, 0, 0, 0, 0],   # nothing
+        [1, 1, 1, 1, 1, 1, 1],   # the whole row
+        [0, 1, 0, 1, 0, 1, 0],   # single days
+    ], dtype=bool)
+    score = np.arange(flags.size, dtype=float).reshape(flags.shape)
+    spells = find_spells(flags, score)
+    assert as_tuples(spells) == [
+        (0, 0, 2, 1), (0, 4, 7, 6),
+        (2, 0, 7, 6),
+        (3, 1, 2, 1), (3, 3, 4, 3), (3, 5, 6, 5),
+    ]
+
+
+def test_run_ending_a_row_does_not_join_the_next():
+    flags = np.array([[0, 0, 1, 1], [1, 1, 0, 0]], dtype=bool)
+    score = np.array([[0, 0, 5, 1], [9, 2, 0, 0]], dtype=float)
+    assert as_tuples(find_spells(flags, score)) == [(0, 2, 4, 2), (1, 0, 2, 0)]
+
+
+def test_min_days_and_lowest():
+    flags = np.array([[1, 1, 1, 0, 1, 1, 0, 1]], dtype=bool)
+    score = np.array([[3, -2, 4, 0, 1, 1, 0, -9]], dtype=float)
+    assert as_tuples(find_spells(flags, score, min_days=2)) == [(0, 0, 3, 2), (0, 4, 6, 4)]
+    assert as_tuples(find_spells(flags, score, min_days=3, lowest=True)) == [(0, 0, 3, 1)]
+    assert as_tuples(find_spells(flags, score, min_days=4)) == []
+
+
+def test_random_grids_match_scan():
+    rng = np.random.default_rng(0)
+    for trial in range(50):
+        flags = rng.random((rng.integers(1, 6), rng.integers(1, 40))) < rng.uniform(0.1, 0.9)
+        score = rng.normal(size=flags.shape)
+        min_days = int(rng.integers(1, 4))
+        lowest = bool(trial % 2)
+        assert as_tuples(find_spells(flags, score, min_days, lowest)) == scan_spells(flags, score, min_days, lowest)
+
+
+def test_no_flags():
+    spells = find_spells(np.zeros((3, 5), dtype=bool), np.zeros((3, 5)))
+    assert all(len(spells[key]) == 0 for key in ("city", "start", "end", "peak"))
+
+
+if __name__ == "__main__":
+    test_runs_at_row_edges()
+    test_run_ending_a_row_does_not_join_the_next()
+    test_min_days_and_lowest()
+    test_random_grids_match_scan()
+    test_no_flags()
+    print("weather anomaly checks passed")
@@ -0,0 +1,61 @@
+"""
+Weather store checks: processing a store-backed frame for serving must keep its
+numeric and date columns as views of the memory-mapped files, not private copies
+Run with: python -m pytest test_weather_store.py  (or python test_weather_store.py)
+"""
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+os.environ.setdefault("INDIAN_WEATHER_STORE_PATH", os.path.join(tempfile.mkdtemp(), "store"))
+os.environ.setdefault("INDIAN_WEATHER_ANOMALY_PATH", os.path.join(tempfile.mkdtemp(), "anomalies"))
+
+import numpy as np
+
+from services.indian_weather_service import IndianWeatherService
+from services.synthetic_weather import generate_weather
+from services.weather_store import WeatherStore
+
+
+def build_store(service):
+    cities = dict(list(service.indian_cities.items())[:6])
+    return WeatherStore.build(generate_weather(cities, start="2024-01-01", days=400), service.store_path)
+
+
+def mapped_columns(store):
+    return [entry["name"] for entry in store.meta["columns"] if entry["kind"] in ("numeric", "datetime")]
+
+
+def test_processed_columns_stay_mapped():
+    service = IndianWeatherService()
+    store = build_store(service)
+    snapshot = service._process_weather_data(store.to_frame(), store)
+    assert snapshot is not None and snapshot.store is store
+
+    frame = snapshot.weather_data
+    assert "Date" in mapped_columns(store)
+    for name in mapped_columns(store):
+        values = frame[name].to_numpy()
+        assert isinstance(store.columns[name], np.memmap)
+        assert np.shares_memory(values, store.columns[name]), name
+
+    # A city's history is a slice of the same mapped rows
+    entry = next(iter(snapshot.city_index.values()))
+    history = frame.iloc[entry["start"]:entry["end"]]
+    assert np.shares_memory(history["Temperature"].to_numpy(), store.columns["Temperature"])
+    assert snapshot.processed_data["monthly_trends"]
+
+
+def test_text_dates_are_parsed():
+    service = IndianWeatherService()
+    frame = generate_weather(dict(list(service.indian_cities.items())[:2]), start="2024-01-01", days=30)
+    frame["Date"] = frame["Date"].dt.strftime("%Y-%m-%d")
+    snapshot = service._process_weather_data(frame)
+    assert str(snapshot.weather_data["Date"].dtype).startswith("datetime64")
+    assert len(snapshot.city_index) == 2
+
+
+if __name__ == "__main__":
+    test_processed_columns_stay_mapped()
+    test_text_dates_are_parsed()
+    print("weather store checks passed")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Train the climate forecast model from the Indian weather dataset and publish
+it to the model registry (models/registry/climate_forecast/<version>).
+
+Uses the same dataset as IndianWeatherService (Kaggle download, falling back
+to its generated data) unless --csv is given. Running API workers pick up the
+new version within a minute; use --no-activate to publish without switching
+and activate later via POST /api/v1/ml/models/activate.
+
+Usage:
+    python train_forecast_model.py [--csv data.csv] [--n-jobs -1]
+        [--n-estimators 100] [--max-depth 16] [--no-activate] [--format flat_forest]
+"""
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from core.config import settings
+from services.flat_forest import export_forecast_bundle, FLAT_FOREST_FORMAT
+from services.forecast_training import load_indian_weather_frame, train_forecast_bundle
+from services.ml_service import FORECAST_MODEL_NAME
+from services.model_registry import ModelRegistry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train and publish the climate forecast model")
+    parser.add_argument("--csv", help="Daily per-city weather CSV (default: IndianWeatherService dataset)")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Cores used to fit each forest (-1 = all)")
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--max-depth", type=int, default=16)
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction of latest dates held out for evaluation")
+    parser.add_argument("--model-path", default=settings.MODEL_PATH)
+    parser.add_argument("--no-activate", action="store_true", help="Publish without making it the current version")
+    parser.add_argument("--format", choices=[FLAT_FOREST_FORMAT, "sklearn"], default=FLAT_FOREST_FORMAT,
+                        help="flat_forest serves without sklearn; sklearn publishes the fitted estimators")
+    args = parser.parse_args()
+
+    df = load_indian_weather_frame(args.csv)
+    print(f"Dataset: {len(df)} city-days, {df['City'].nunique()} cities, "
+          f"{df['Date'].min():%Y-%m-%d} to {df['Date'].max():%Y-%m-%d}")
+
+    bundle, metadata = train_forecast_bundle(
+        df,
+        n_estimators=args.n_estimators,
+        max_depth=args.max_depth,
+        n_jobs=args.n_jobs,
+        holdout_fraction=args.holdout,
+    )
+    metadata["trained_at"] = datetime.utcnow().isoformat()
+    metadata["format"] = args.format
+    if args.format == FLAT_FOREST_FORMAT:
+        bundle = export_forecast_bundle(bundle)
+
+    registry = ModelRegistry(Path(args.model_path) / "registry")
+    record = registry.publish(FORECAST_MODEL_NAME, bundle, metadata, activate=not args.no_activate)
+
+    print(f"Published {FORECAST_MODEL_NAME} {record['version']} "
+          f"({record['size_bytes'] / 1e6:.1f} MB, trained in {metadata['training_seconds']}s)"
+          f"{'' if args.no_activate else ' and activated'}")
+    print(json.dumps(metadata["evaluation"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the NASA POWER and OpenWeatherMap APIs.
+
+Replays recorded responses from data/upstream_fixtures/ with configurable
+latency and failure injection, so ClimateDataIntegrator can be load-tested
+offline. Point the integrator at it with:
+
+    NASA_POWER_BASE_URL=http://127.0.0.1:8090
+    OPENWEATHER_BASE_URL=http://127.0.0.1:8090
+    OPENWEATHER_API_KEY=simulator
+
+Latency specs (milliseconds):
+    fixed:50            always 50 ms
+    uniform:20,200      uniform between 20 and 200 ms
+    normal:80,20        mean 80, std 20 (clipped at 0)
+    lognormal:80,0.5    median 80 ms, log-space sigma 0.5 (long tail)
+
+Usage:
+    python upstream_simulator.py [--port 8090] [--latency lognormal:80,0.5]
+                                 [--error-rate 0.02] [--timeout-rate 0.01] [--seed 42]
+    python upstream_simulator.py --record --lat 12.9716 --lon 77.5946
+        (fetches live responses, needs OPENWEATHER_API_KEY, and overwrites the fixtures)
+"""
+import argparse
+import asyncio
+import copy
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from aiohttp import ClientSession, web
+
+from services.data_integrator import NASA_POWER_TIMEOUT_SECONDS, OPENWEATHER_TIMEOUT_SECONDS
+
+FIXTURE_DIR = Path(__file__).parent / "data" / "upstream_fixtures"
+
+FIXTURES = {
+    "nasa": "nasa_power_daily.json",
+    "forecast": "owm_forecast.json",
+    "air_pollution": "owm_air_pollution.json",
+    "weather": "owm_weather.json",
+}
+
+# A hung upstream: outlasts every ClimateDataIntegrator timeout, so each route's timeout path fires
+TIMEOUT_DELAY_SECONDS = max(NASA_POWER_TIMEOUT_SECONDS, OPENWEATHER_TIMEOUT_SECONDS) + 5
+
+
+def parse_latency(spec: str):
+    """Turn a latency spec into a sampler returning seconds"""
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v]
+
+    if kind == "fixed":
+        return lambda rng: values[0] / 1000
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1])) / 1000
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1]) / 1000
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def load_fixtures(fixture_dir: Path):
+    fixtures = {}
+    for name, filename in FIXTURES.items():
+        with open(fixture_dir / filename, "r", encoding="utf-8") as f:
+            fixtures[name] = json.load(f)
+    return fixtures
+
+
+class UpstreamSimulator:
+    """Serves recorded upstream payloads, re-keyed to each request's location and dates"""
+
+    def __init__(self, fixtures, latency: str = "fixed:0", error_rate: float = 0.0,
+                 timeout_rate: float = 0.0, seed: int = None):
+        self.fixtures = fixtures
+        self.sample_latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.rng = random.Random(seed)
+        self.stats = Counter()
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/temporal/daily/point", self.nasa_daily_point)
+        app.router.add_get("/data/2.5/forecast", self.openweather("forecast"))
+        app.router.add_get("/data/2.5/air_pollution", self.openweather("air_pollution"))
+        app.router.add_get("/data/2.5/weather", self.openweather("weather"))
+        app.router.add_get("/__stats", self.get_stats)
+        return app
+
+    async def _simulate_network(self, route: str):
+        """Apply latency and injected failures; returns an error response or None"""
+        self.stats[f"{route}.requests"] += 1
+        roll = self.rng.random()
+
+        if roll < self.timeout_rate:
+            self.stats[f"{route}.timeouts"] += 1
+            await asyncio.sleep(TIMEOUT_DELAY_SECONDS)
+            return web.json_response({"message": "simulated upstream hang"}, status=504)
+
+        await asyncio.sleep(self.sample_latency(self.rng))
+
+        if roll < self.timeout_rate + self.error_rate:
+            self.stats[f"{route}.errors"] += 1
+            status = self.rng.choice([429, 500, 502, 503])
+            return web.json_response({"cod": status, "message": "simulated upstream error"}, status=status)
+        return None
+
+    async def nasa_daily_point(self, request: web.Request) -> web.Response:
+        error = await self._simulate_network("nasa")
+        if error is not None:
+            return error
+
+        payload = copy.deepcopy(self.fixtures["nasa"])
+        lat = float(request.query.get("latitude", 0))
+        lon = float(request.query.get("longitude", 0))
+        start = datetime.strptime(request.query["start"], "%Y%m%d")
+        end = datetime.strptime(request.query["end"], "%Y%m%d")
+        days = [(start + timedelta(days=i)).strftime("%Y%m%d") for i in range((end - start).days + 1)]
+
+        # Cycle the recorded values over the requested date range
+        for param, values in payload["properties"]["parameter"].items():
+            recorded = list(values.values())
+            payload["properties"]["parameter"][param] = {
+                day: recorded[i % len(recorded)] for i, day in enumerate(days)
+            }
+        payload["geometry"]["coordinates"][:2] = [lon, lat]
+        payload.setdefault("header", {}).update({"start": days[0], "end": days[-1]})
+        return web.json_response(payload)
+
+    def openweather(self, name: str):
+        async def handler(request: web.Request) -> web.Response:
+            error = await self._simulate_network(name)
+            if error is not None:
+                return error
+
+            payload = copy.deepcopy(self.fixtures[name])
+            lat = float(request.query.get("lat", 0))
+            lon = float(request.query.get("lon", 0))
+
+            # Shift recorded timestamps so the payload looks freshly issued
+            entries = payload.get("list", [])
+            first_dt = entries[0]["dt"] if entries else payload.get("dt")
+            shift = (int(time.time()) // 3600 * 3600 - first_dt) if first_dt else 0
+            for entry in entries:
+                entry["dt"] += shift
+                if "dt_txt" in entry:
+                    entry["dt_txt"] = datetime.utcfromtimestamp(entry["dt"]).strftime("%Y-%m-%d %H:%M:%S")
+            if "dt" in payload:
+                payload["dt"] += shift
+
+            coord = {"lat": lat, "lon": lon}
+            if "coord" in payload:
+                payload["coord"] = coord
+            if "city" in payload:
+                payload["city"]["coord"] = coord
+            return web.json_response(payload)
+
+        return handler
+
+    async def get_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(dict(self.stats))
+
+
+async def record_fixtures(lat: float, lon: float, fixture_dir: Path):
+    """Fetch live upstream responses for one location and save them as fixtures"""
+    api_key = os.getenv("OPENWEATHER_API_KEY")
+    if not api_key:
+        sys.exit("OPENWEATHER_API_KEY is required to record OpenWeatherMap fixtures")
+
+    end = datetime.utcnow() - timedelta(days=3)  # POWER lags a few days behind
+    start = end - timedelta(days=29)
+    requests = {
+        "nasa": ("https://power.larc.nasa.gov/api/temporal/daily/point", {
+            "parameters": "T2M,PRECTOTCORR,WS2M,RH2M", "community": "AG",
+            "longitude": lon, "latitude": lat,
+            "start": start.strftime("%Y%m%d"), "end": end.strftime("%Y%m%d"), "format": "JSON"
+        }),
+        "forecast": ("http://api.openweathermap.org/data/2.5/forecast",
+                     {"lat": lat, "lon": lon, "appid": api_key, "units": "metric"}),
+        "air_pollution": ("http://api.openweathermap.org/data/2.5/air_pollution",
+                          {"lat": lat, "lon": lon, "appid": api_key}),
+        "weather": ("http://api.openweathermap.org/data/2.5/weather",
+                    {"lat": lat, "lon": lon, "appid": api_key, "units": "metric"}),
+    }
+
+    fixture_dir.mkdir(parents=True, exist_ok=True)
+    async with ClientSession() as session:
+        for name, (url, params) in requests.items():
+            async with session.get(url, params=params, timeout=60) as response:
+                response.raise_for_status()
+                data = await response.json()
+            with open(fixture_dir / FIXTURES[name], "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1)
+            print(f"Recorded {name} -> {FIXTURES[name]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded NASA POWER / OpenWeatherMap responses")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", default="lognormal:80,0.5", help="Latency distribution spec")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429/5xx")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Fraction of requests that hang")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURE_DIR)
+    parser.add_argument("--record", action="store_true", help="Record live responses instead of serving")
+    parser.add_argument("--lat", type=float, default=12.9716)
+    parser.add_argument("--lon", type=float, default=77.5946)
+    args = parser.parse_args()
+
+    if args.record:
+        asyncio.run(record_fixtures(args.lat, args.lon, args.fixtures))
+        return
+
+    simulator = UpstreamSimulator(
+        load_fixtures(args.fixtures),
+        latency=args.latency,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        seed=args.seed
+    )
+    print(f"Upstream simulator on http://{args.host}:{args.port} "
+          f"(latency={args.latency}, errors={args.error_rate}, timeouts={args.timeout_rate})")
+    web.run_app(simulator.build_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()